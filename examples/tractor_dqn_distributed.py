@@ -0,0 +1,101 @@
+''' An example of learning a Deep-Q Agent on Tractor with multiple actor processes
+'''
+import functools
+import multiprocessing
+import os
+import torch
+
+import rlcard
+from rlcard.agents import DQNAgentPytorch as DQNAgent
+from rlcard.agents import TractorRuleAgent
+from rlcard.utils import set_global_seed
+from rlcard.utils import Logger
+from rlcard.utils.distributed import ActorLearner
+from rlcard.utils.evaluation import ParallelTournament
+from rlcard.games.tractor.utils import MovingAvg
+
+# The number of actor and evaluation processes, one core is left for the learner
+eval_processes = 2
+actor_num = max(multiprocessing.cpu_count() - eval_processes - 1, 1)
+
+# Set the iterations numbers and how frequently we evaluate the performance
+evaluate_every = 5000
+evaluate_num = 1000
+episode_num = 10000000
+
+# Publish the weights to the actors every X episodes
+update_every = 10
+
+# The paths for saving the logs and learning curves
+save_dir = 'models/tractor_dqn_distributed'
+
+def make_eval_agents(agent_fn):
+    ''' The dqn agents against rule agents
+    '''
+    agent = agent_fn()
+    rule_agent = TractorRuleAgent(action_num=agent.action_num)
+    return [agent, rule_agent, agent, rule_agent]
+
+if __name__ == '__main__':
+    # Set a global seed
+    set_global_seed(0)
+
+    env = rlcard.make('tractor', config={'seed': 0})
+
+    # The agent is built in every process, so it is built from a picklable partial
+    agent_fn = functools.partial(DQNAgent,
+                                 scope='dqn',
+                                 action_num=env.action_num,
+                                 replay_memory_init_size=1000,
+                                 train_every=64,
+                                 state_shape=env.state_shape,
+                                 mlp_layers=[2048, 2048],
+                                 replay_memory_size=100000,
+                                 update_target_estimator_every=500,
+                                 discount_factor=0.99,
+                                 epsilon_start=1,
+                                 epsilon_end=0.1,
+                                 epsilon_decay_steps=400000,
+                                 batch_size=256,
+                                 learning_rate=0.00002,
+                                 device=torch.device('cpu'))
+
+    # 4 dqn agents with a single brain
+    trainer = ActorLearner('tractor', agent_fn, actor_num=actor_num, config={'seed': 0}, update_every=update_every)
+    agent = trainer.agent
+
+    # The evaluation runs in the background while the agent keeps training
+    eval_agents_fn = functools.partial(make_eval_agents, agent_fn)
+    evaluator = ParallelTournament('tractor', eval_agents_fn, processes=eval_processes)
+    evaluation = None
+
+    if not os.path.exists(save_dir):
+        os.makedirs(save_dir)
+    logger = Logger(save_dir)
+    payoff_avg = MovingAvg(100)
+
+    for episode, payoffs in trainer.train(episode_num):
+        payoff_avg.append(payoffs[0])
+
+        if evaluation is not None and evaluation.ready():
+            stats = evaluation.get()
+            logger.log_performance(eval_timestep, stats['win_rate'][0])
+            logger.log('win rate: {}, eval payoff: {} +- {}'.format(
+                round(stats['win_rate'][0], 3), round(stats['mean'][0], 2), round(stats['stderr'][0], 2)))
+            evaluation = None
+
+        # Evaluate the performance. Play with rule agents.
+        if episode % evaluate_every == evaluate_every - 1:
+            if evaluation is None:
+                evaluation = evaluator.evaluate_async(make_eval_agents(lambda: agent), evaluate_num)
+                eval_timestep = trainer.timestep
+            logger.log('payoff: {}'.format(round(payoff_avg.get(), 2)))
+            torch.save(agent.get_state_dict(), os.path.join(save_dir, 'model.pth'))
+
+    evaluator.close()
+
+    # Close files in the logger
+    logger.close_files()
+
+    # Plot the learning curve
+    logger.plot('DQN')
@@ -1,21 +1,7 @@
-import subprocess
 import sys
-from distutils.version import LooseVersion
-
-reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
-
-if 'tensorflow-gpu' in installed_packages or 'tensorflow' in installed_packages:
-    import tensorflow as tf
-    if LooseVersion(tf.__version__) < LooseVersion('1.14.0') \
-            or LooseVersion(tf.__version__) >= LooseVersion('2.0.0'):
-        print('WAINING - RLCard supports Tensorflow >=1.14 and <2.0\nThe detected version is {} \nIf the models can not be loaded, please install Tensorflow via\n$ pip install rlcard[tensorflow]\n'.format(tf.__version__))
-    from rlcard.agents.deep_cfr_agent import DeepCFR
-    from rlcard.agents.dqn_agent import DQNAgent
-    from rlcard.agents.nfsp_agent import NFSPAgent
-if 'torch' in installed_packages:
-    from rlcard.agents.dqn_agent_pytorch import DQNAgent as DQNAgentPytorch
-    from rlcard.agents.nfsp_agent_pytorch import NFSPAgent as NFSPAgentPytorch
+import importlib
+
+from rlcard.utils.backends import is_tensorflow_available, is_torch_available, check_tensorflow_version
 
 from rlcard.agents.cfr_agent import CFRAgent
 from rlcard.agents.limit_holdem_human_agent import HumanAgent as LimitholdemHumanAgent
@@ -25,3 +11,46 @@ from rlcard.agents.blackjack_human_agent import HumanAgent as BlackjackHumanAgen
 from rlcard.agents.random_agent import RandomAgent
 from rlcard.agents.uno_human_agent import HumanAgent as UnoHumanAgent
 from rlcard.agents.tractor_rule_agent import TractorRuleAgent
+
+# The agents that depend on a deep learning backend are imported on first
+# access, so that importing the agents does not import Tensorflow or PyTorch
+_BACKEND_AGENTS = {
+    'DeepCFR': ('tensorflow', 'rlcard.agents.deep_cfr_agent', 'DeepCFR'),
+    'DQNAgent': ('tensorflow', 'rlcard.agents.dqn_agent', 'DQNAgent'),
+    'NFSPAgent': ('tensorflow', 'rlcard.agents.nfsp_agent', 'NFSPAgent'),
+    'DQNAgentPytorch': ('torch', 'rlcard.agents.dqn_agent_pytorch', 'DQNAgent'),
+    'NFSPAgentPytorch': ('torch', 'rlcard.agents.nfsp_agent_pytorch', 'NFSPAgent'),
+}
+
+def _load_agent(name):
+    ''' Import an agent that depends on a deep learning backend
+
+    Args:
+        name (str): The name of the agent in this module
+
+    Returns:
+        (class): The agent class
+    '''
+    backend, mod_name, class_name = _BACKEND_AGENTS[name]
+    available = is_tensorflow_available() if backend == 'tensorflow' else is_torch_available()
+    if not available:
+        raise ImportError('{} requires {}, please install it via\n$ pip install rlcard[{}]'.format(name, backend, backend))
+    if backend == 'tensorflow':
+        check_tensorflow_version()
+    agent = getattr(importlib.import_module(mod_name), class_name)
+    globals()[name] = agent
+    return agent
+
+def __getattr__(name):
+    if name in _BACKEND_AGENTS:
+        return _load_agent(name)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+def __dir__():
+    return sorted(list(globals()) + list(_BACKEND_AGENTS))
+
+# Module attributes are only looked up lazily since Python 3.7
+if sys.version_info < (3, 7):
+    for _name, (_backend, _, _) in _BACKEND_AGENTS.items():
+        if (is_tensorflow_available() if _backend == 'tensorflow' else is_torch_available()):
+            _load_agent(_name)
@@ -24,16 +24,13 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
-import random
 import tqdm
 import numpy as np
 import tensorflow as tf
-from collections import namedtuple
 
 from rlcard.utils.utils import remove_illegal, remove_illegal_without_norm
 from rlcard.agents.tractor_rule_agent import TractorRuleAgent
-
-Transition = namedtuple('Transition', ['state', 'action', 'reward', 'next_state', 'next_legal_actions', 'done'])
+from rlcard.agents.replay_memory import Memory, FrameMemory, PrioritizedMemory, PrioritizedFrameMemory
 
 
 class DQNAgent(object):
@@ -54,7 +51,11 @@ class DQNAgent(object):
                  train_every=1,
                  mlp_layers=None,
                  learning_rate=0.00005,
-                 use_rule_policy=False):
+                 use_rule_policy=False,
+                 dedup_replay_memory=False,
+                 prioritized_replay=False,
+                 prioritized_replay_alpha=0.6,
+                 prioritized_replay_beta=0.4):
 
         '''
         Q-Learning algorithm for off-policy TD control using Function Approximation.
@@ -81,6 +82,14 @@ class DQNAgent(object):
             train_every (int): Train the network every X steps.
             mlp_layers (list): The layer number and the dimension of each layer in MLP
             learning_rate (float): The learning rate of the DQN agent.
+            use_rule_policy (boolean): Generate the training data with `TractorRuleAgent`
+            dedup_replay_memory (boolean): Store every observation only once in the
+              replay memory, i.e., the next state of a transition is shared with the
+              state of the following one. See `FrameMemory`.
+            prioritized_replay (boolean): Sample the transitions proportionally to their
+              TD errors, and weight the loss with importance sampling. See `PrioritizedMemory`.
+            prioritized_replay_alpha (float): How much the priorities are used
+            prioritized_replay_beta (float): How much the importance sampling corrects the bias
         '''
         self.use_raw = False
         self.sess = sess
@@ -93,6 +102,7 @@ class DQNAgent(object):
         self.action_num = action_num
         self.train_every = train_every
         self.use_rule_policy = use_rule_policy
+        self.prioritized_replay = prioritized_replay
 
         # Total timesteps
         self.total_t = 0
@@ -108,7 +118,14 @@ class DQNAgent(object):
         self.target_estimator = Estimator(scope=self.scope+"_target_q", action_num=action_num, learning_rate=learning_rate, state_shape=state_shape, mlp_layers=mlp_layers)
 
         # Create replay memory
-        self.memory = Memory(replay_memory_size, batch_size)
+        if prioritized_replay:
+            memory_class = PrioritizedFrameMemory if dedup_replay_memory else PrioritizedMemory
+            self.memory = memory_class(replay_memory_size, batch_size, action_num,
+                                       alpha=prioritized_replay_alpha, beta=prioritized_replay_beta)
+        elif dedup_replay_memory:
+            self.memory = FrameMemory(replay_memory_size, batch_size, action_num)
+        else:
+            self.memory = Memory(replay_memory_size, batch_size, action_num)
 
     def feed(self, ts):
         ''' Store data in to replay buffer and train the agent. There are two stages.
@@ -163,6 +180,39 @@ class DQNAgent(object):
         best_action = np.argmax(probs)
         return best_action, probs
 
+    def batch_step(self, states):
+        ''' Predict the actions for a batch of states with a single forward pass
+
+        Args:
+            states (list): a list of state dicts, possibly from different environments
+
+        Returns:
+            actions (list): a list of action ids, one for each state
+        '''
+        if self.use_rule_policy:
+            return [TractorRuleAgent.step(state) for state in states]
+        A = self.batch_predict(states)
+        return [np.random.choice(np.arange(len(a)), p=a) for a in A]
+
+    def batch_eval_step(self, states):
+        ''' Predict the actions for a batch of states for evaluation purpose
+
+        Args:
+            states (list): a list of state dicts, possibly from different environments
+
+        Returns:
+            actions (list): a list of action ids, one for each state
+            probs (list): a list of probabilities, one for each state
+        '''
+        obs = np.array([state['obs'] for state in states])
+        q_values = self.q_estimator.predict(self.sess, obs)
+        actions, probs = [], []
+        for q, state in zip(q_values, states):
+            _probs = remove_illegal_without_norm(q, state['legal_actions'])
+            actions.append(np.argmax(_probs))
+            probs.append(_probs)
+        return actions, probs
+
     def predict(self, state):
         ''' Predict the action probabilities
 
@@ -172,22 +222,32 @@ class DQNAgent(object):
         Returns:
             q_values (numpy.array): a 1-d array where each entry represents a Q value
         '''
+        return self.batch_predict([state])[0]
+
+    def batch_predict(self, states):
+        ''' Predict the action probabilities of a batch of states
+
+        Args:
+            states (list): a list of state dicts
+
+        Returns:
+            A (numpy.array): a 2-d array where each row holds the action probabilities of a state
+        '''
         epsilon = self.epsilons[min(self.total_t, self.epsilon_decay_steps-1)]
-        A = np.ones(self.action_num, dtype=float) * epsilon / len(state['legal_actions'])
+        obs = np.array([state['obs'] for state in states])
+        q_values = self.q_estimator.predict(self.sess, obs)
 
-        q_values = self.q_estimator.predict(self.sess, np.expand_dims(state['obs'], 0))[0]
+        A = np.zeros((len(states), self.action_num), dtype=float)
+        for i, state in enumerate(states):
+            legal_actions = state['legal_actions']
+            a = np.ones(self.action_num, dtype=float) * epsilon / len(legal_actions)
+
+            # The first legal action with the highest Q value
+            best_action = legal_actions[np.argmax(q_values[i][legal_actions])]
+            a[best_action] += (1.0 - epsilon)
 
-        best_action = state['legal_actions'][0]
-        best_action_q_value = q_values[best_action]
-        for action in state['legal_actions']:
-            if q_values[action] > best_action_q_value:
-                best_action = action
-                best_action_q_value = q_values[action]
-
-        A[best_action] += (1.0 - epsilon)
-        
-        # TODO: no need to normalize in this function
-        A = remove_illegal(A, state['legal_actions'])
+            # TODO: no need to normalize in this function
+            A[i] = remove_illegal(a, legal_actions)
         return A
 
     def train(self):
@@ -196,21 +256,17 @@ class DQNAgent(object):
         Returns:
             loss (float): The loss of the current batch.
         '''
-        state_batch, action_batch, reward_batch, next_state_batch, next_legal_actions_batch, done_batch = self.memory.sample()
+        weights = None
+        if self.prioritized_replay:
+            state_batch, action_batch, reward_batch, next_state_batch, done_batch, next_legal_actions_batch, \
+                weights, indices = self.memory.sample()
+        else:
+            state_batch, action_batch, reward_batch, next_state_batch, done_batch, next_legal_actions_batch = self.memory.sample()
         # Calculate q values and targets (Double DQN)
         q_values_next = self.q_estimator.predict(self.sess, next_state_batch)
 
-        # TODO: filter legal actions
-        # best_next_actions = np.argmax(q_values_next, axis=1)
-        best_next_actions = []
-        for batch in range(len(next_legal_actions_batch)):
-            next_action = 0
-            max_q = None
-            for action in next_legal_actions_batch[batch]:
-                if (max_q is None or q_values_next[batch][action] > max_q):
-                    next_action = action
-                    max_q = q_values_next[batch][action]
-            best_next_actions.append(next_action)
+        # Only the legal next actions are considered, action 0 if there is none
+        best_next_actions = np.argmax(np.where(next_legal_actions_batch, q_values_next, -np.inf), axis=1)
 
         q_values_next_target = self.target_estimator.predict(self.sess, next_state_batch)
         target_batch = reward_batch + np.invert(done_batch).astype(np.float32) * \
@@ -224,7 +280,10 @@ class DQNAgent(object):
 
         # Perform gradient descent update
         state_batch = np.array(state_batch)
-        loss = self.q_estimator.update(self.sess, state_batch, action_batch, target_batch)
+        loss, td_errors = self.q_estimator.update(self.sess, state_batch, action_batch, target_batch, weights)
+        # The TD errors of the sampled transitions are their new priorities
+        if self.prioritized_replay:
+            self.memory.update_priorities(indices, td_errors)
         # print('\rINFO - Agent {}, step {}, rl-loss: {}'.format(self.scope, self.total_t, loss), end='')
 
         # Update the target estimator
@@ -245,7 +304,7 @@ class DQNAgent(object):
             next_state (numpy.array): the next state after performing the action
             done (boolean): whether the episode is finished
         '''
-        self.memory.save(state, action, reward, next_state, next_legal_actions, done)
+        self.memory.save(state, action, reward, next_state, done, next_legal_actions)
 
     def copy_params_op(self, global_vars):
         ''' Copys the variables of two estimator to others.
@@ -319,9 +378,12 @@ class Estimator():
         gather_indices = tf.range(batch_size) * tf.shape(self.predictions)[1] + self.actions_pl
         self.action_predictions = tf.gather(tf.reshape(self.predictions, [-1]), gather_indices)
 
+        # The importance sampling weights of the prioritized replay, all ones if not fed
+        self.weights_pl = tf.placeholder_with_default(tf.ones_like(self.y_pl), shape=[None], name="weights")
+
         # Calculate the loss
         self.losses = tf.squared_difference(self.y_pl, self.action_predictions)
-        self.loss = tf.reduce_mean(self.losses)
+        self.loss = tf.reduce_mean(self.weights_pl * self.losses)
 
     def predict(self, sess, s):
         ''' Predicts action values.
@@ -337,7 +399,7 @@ class Estimator():
         '''
         return sess.run(self.predictions, { self.X_pl: s, self.is_train:False})
 
-    def update(self, sess, s, a, y):
+    def update(self, sess, s, a, y, weights=None):
         ''' Updates the estimator towards the given targets.
 
         Args:
@@ -345,56 +407,19 @@ class Estimator():
           s (list): State input of shape [batch_size, 4, 160, 160, 3]
           a (list): Chosen actions of shape [batch_size]
           y (list): Targets of shape [batch_size]
+          weights (list): Importance sampling weights of shape [batch_size], all ones if None
 
         Returns:
-          The calculated loss on the batch.
+          The calculated loss on the batch, and the TD errors y - Q(s, a) of shape
+          [batch_size] before the update
         '''
         feed_dict = { self.X_pl: s, self.y_pl: y, self.actions_pl: a, self.is_train: True}
-        _, _, loss = sess.run(
-                [tf.contrib.framework.get_global_step(), self.train_op, self.loss],
+        if weights is not None:
+            feed_dict[self.weights_pl] = weights
+        _, _, loss, action_predictions = sess.run(
+                [tf.contrib.framework.get_global_step(), self.train_op, self.loss, self.action_predictions],
                 feed_dict)
-        return loss
-
-class Memory(object):
-    ''' Memory for saving transitions
-    '''
-
-    def __init__(self, memory_size, batch_size):
-        ''' Initialize
-        Args:
-            memory_size (int): the size of the memroy buffer
-        '''
-        self.memory_size = memory_size
-        self.batch_size = batch_size
-        self.memory = []
-
-    def save(self, state, action, reward, next_state, next_legal_actions, done):
-        ''' Save transition into memory
-
-        Args:
-            state (numpy.array): the current state
-            action (int): the performed action ID
-            reward (float): the reward received
-            next_state (numpy.array): the next state after performing the action
-            done (boolean): whether the episode is finished
-        '''
-        if len(self.memory) == self.memory_size:
-            self.memory.pop(0)
-        transition = Transition(state, action, reward, next_state, next_legal_actions, done)
-        self.memory.append(transition)
-
-    def sample(self):
-        ''' Sample a minibatch from the replay memory
-
-        Returns:
-            state_batch (list): a batch of states
-            action_batch (list): a batch of actions
-            reward_batch (list): a batch of rewards
-            next_state_batch (list): a batch of states
-            done_batch (list): a batch of dones
-        '''
-        samples = random.sample(self.memory, self.batch_size)
-        return map(np.array, zip(*samples))
+        return loss, y - action_predictions
 
 def copy_model_parameters(sess, estimator1, estimator2):
     ''' Copys the model parameters of one estimator to another.
@@ -25,16 +25,13 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
-import random
 import numpy as np
 import torch
 import torch.nn as nn
-from collections import namedtuple
 from copy import deepcopy
 
 from rlcard.utils.utils import remove_illegal
-
-Transition = namedtuple('Transition', ['state', 'action', 'reward', 'next_state', 'done'])
+from rlcard.agents.replay_memory import Memory, FrameMemory, PrioritizedMemory, PrioritizedFrameMemory
 
 
 class DQNAgent(object):
@@ -57,7 +54,11 @@ class DQNAgent(object):
                  train_every=1,
                  mlp_layers=None,
                  learning_rate=0.00005,
-                 device=None):
+                 device=None,
+                 dedup_replay_memory=False,
+                 prioritized_replay=False,
+                 prioritized_replay_alpha=0.6,
+                 prioritized_replay_beta=0.4):
 
         '''
         Q-Learning algorithm for off-policy TD control using Function Approximation.
@@ -83,6 +84,13 @@ class DQNAgent(object):
             mlp_layers (list): The layer number and the dimension of each layer in MLP
             learning_rate (float): The learning rate of the DQN agent.
             device (torch.device): whether to use the cpu or gpu
+            dedup_replay_memory (boolean): Store every observation only once in the
+              replay memory, i.e., the next state of a transition is shared with the
+              state of the following one. See `FrameMemory`.
+            prioritized_replay (boolean): Sample the transitions proportionally to their
+              TD errors, and weight the loss with importance sampling. See `PrioritizedMemory`.
+            prioritized_replay_alpha (float): How much the priorities are used
+            prioritized_replay_beta (float): How much the importance sampling corrects the bias
         '''
         self.use_raw = False
         self.scope = scope
@@ -93,6 +101,7 @@ class DQNAgent(object):
         self.batch_size = batch_size
         self.action_num = action_num
         self.train_every = train_every
+        self.prioritized_replay = prioritized_replay
 
         # Torch device
         if device is None:
@@ -116,7 +125,14 @@ class DQNAgent(object):
             mlp_layers=mlp_layers, device=self.device)
 
         # Create replay memory
-        self.memory = Memory(replay_memory_size, batch_size)
+        if prioritized_replay:
+            memory_class = PrioritizedFrameMemory if dedup_replay_memory else PrioritizedMemory
+            self.memory = memory_class(replay_memory_size, batch_size,
+                                       alpha=prioritized_replay_alpha, beta=prioritized_replay_beta)
+        elif dedup_replay_memory:
+            self.memory = FrameMemory(replay_memory_size, batch_size)
+        else:
+            self.memory = Memory(replay_memory_size, batch_size)
 
     def feed(self, ts):
         ''' Store data in to replay buffer and train the agent. There are two stages.
@@ -162,6 +178,70 @@ class DQNAgent(object):
         best_action = np.argmax(probs)
         return best_action, probs
 
+    def batch_step(self, states):
+        ''' Predict the actions for a batch of states with a single forward pass
+
+        Args:
+            states (list): a list of state dicts, possibly from different environments
+
+        Returns:
+            actions (list): a list of action ids, one for each state
+        '''
+        return self._batch_step(np.array([state['obs'] for state in states]),
+                                [state['legal_actions'] for state in states])
+
+    def batch_eval_step(self, states):
+        ''' Predict the actions for a batch of states for evaluation purpose
+
+        Args:
+            states (list): a list of state dicts, possibly from different environments
+
+        Returns:
+            actions (list): a list of action ids, one for each state
+            probs (list): a list of probabilities, one for each state
+        '''
+        return self._batch_eval_step(np.array([state['obs'] for state in states]),
+                                     [state['legal_actions'] for state in states])
+
+    def batch_step_arrays(self, obs, legal_masks):
+        ''' The same as `batch_step` on stacked arrays, e.g., the shared
+            arrays of `ShmVecEnv`, without building the state dicts
+
+        Args:
+            obs (numpy.array): (batch, state_shape) observations
+            legal_masks (numpy.array): (batch, action_num) boolean masks of the legal actions
+
+        Returns:
+            actions (list): a list of action ids, one for each state
+        '''
+        return self._batch_step(obs, [np.flatnonzero(mask) for mask in legal_masks])
+
+    def batch_eval_step_arrays(self, obs, legal_masks):
+        ''' The same as `batch_eval_step` on stacked arrays, see `batch_step_arrays`
+
+        Returns:
+            actions (list): a list of action ids, one for each state
+            probs (list): a list of probabilities, one for each state
+        '''
+        return self._batch_eval_step(obs, [np.flatnonzero(mask) for mask in legal_masks])
+
+    def _batch_step(self, obs, legal_actions):
+        A = self.batch_predict(obs)
+        actions = []
+        for a, legal in zip(A, legal_actions):
+            a = remove_illegal(a, legal)
+            actions.append(np.random.choice(np.arange(len(a)), p=a))
+        return actions
+
+    def _batch_eval_step(self, obs, legal_actions):
+        q_values = self.q_estimator.predict_nograd(obs)
+        actions, probs = [], []
+        for q, legal in zip(q_values, legal_actions):
+            _probs = remove_illegal(np.exp(q), legal)
+            actions.append(np.argmax(_probs))
+            probs.append(_probs)
+        return actions, probs
+
     def predict(self, state):
         ''' Predict the action probabilities but have them
             disconnected from the computation graph
@@ -172,11 +252,23 @@ class DQNAgent(object):
         Returns:
             q_values (numpy.array): a 1-d array where each entry represents a Q value
         '''
+        return self.batch_predict(np.expand_dims(state, 0))[0]
+
+    def batch_predict(self, states):
+        ''' Predict the action probabilities of a batch of states but have them
+            disconnected from the computation graph
+
+        Args:
+            states (numpy.array): a batch of states, (batch, state_shape)
+
+        Returns:
+            A (numpy.array): a 2-d array where each row holds the action probabilities of a state
+        '''
         epsilon = self.epsilons[min(self.total_t, self.epsilon_decay_steps-1)]
-        A = np.ones(self.action_num, dtype=float) * epsilon / self.action_num
-        q_values = self.q_estimator.predict_nograd(np.expand_dims(state, 0))[0]
-        best_action = np.argmax(q_values)
-        A[best_action] += (1.0 - epsilon)
+        A = np.ones((len(states), self.action_num), dtype=float) * epsilon / self.action_num
+        q_values = self.q_estimator.predict_nograd(states)
+        best_actions = np.argmax(q_values, axis=1)
+        A[np.arange(len(states)), best_actions] += (1.0 - epsilon)
         return A
 
     def train(self):
@@ -185,7 +277,11 @@ class DQNAgent(object):
         Returns:
             loss (float): The loss of the current batch.
         '''
-        state_batch, action_batch, reward_batch, next_state_batch, done_batch = self.memory.sample()
+        weights = None
+        if self.prioritized_replay:
+            state_batch, action_batch, reward_batch, next_state_batch, done_batch, weights, indices = self.memory.sample()
+        else:
+            state_batch, action_batch, reward_batch, next_state_batch, done_batch = self.memory.sample()
 
         # Calculate best next actions using Q-network (Double DQN)
         q_values_next = self.q_estimator.predict_nograd(next_state_batch)
@@ -199,7 +295,10 @@ class DQNAgent(object):
         # Perform gradient descent update
         state_batch = np.array(state_batch)
 
-        loss = self.q_estimator.update(state_batch, action_batch, target_batch)
+        loss, td_errors = self.q_estimator.update(state_batch, action_batch, target_batch, weights)
+        # The TD errors of the sampled transitions are their new priorities
+        if self.prioritized_replay:
+            self.memory.update_priorities(indices, td_errors)
         print('\rINFO - Agent {}, step {}, rl-loss: {}'.format(self.scope, self.total_t, loss), end='')
 
         # Update the target estimator
@@ -302,7 +401,7 @@ class Estimator(object):
             q_as = self.qnet(s).cpu().numpy()
         return q_as
 
-    def update(self, s, a, y):
+    def update(self, s, a, y, weights=None):
         ''' Updates the estimator towards the given targets.
             In this case y is the target-network estimated
             value of the Q-network optimal actions, which
@@ -312,9 +411,12 @@ class Estimator(object):
           s (np.ndarray): (batch, state_shape) state representation
           a (np.ndarray): (batch,) integer sampled actions
           y (np.ndarray): (batch,) value of optimal actions according to Q-target
+          weights (np.ndarray): (batch,) importance sampling weights of the squared errors,
+            the mean squared error if None
 
         Returns:
-          The calculated loss on the batch.
+          The calculated loss on the batch, and the (batch,) TD errors y - Q(s, a)
+          before the update
         '''
         self.optimizer.zero_grad()
 
@@ -331,14 +433,19 @@ class Estimator(object):
         Q = torch.gather(q_as, dim=-1, index=a.unsqueeze(-1)).squeeze(-1)
 
         # update model
-        batch_loss = self.mse_loss(Q, y)
+        if weights is None:
+            batch_loss = self.mse_loss(Q, y)
+        else:
+            weights = torch.from_numpy(weights).float().to(self.device)
+            batch_loss = torch.mean(weights * (Q - y) ** 2)
         batch_loss.backward()
         self.optimizer.step()
         batch_loss = batch_loss.item()
+        td_errors = (y - Q).detach().cpu().numpy()
 
         self.qnet.eval()
 
-        return batch_loss
+        return batch_loss, td_errors
 
 
 class EstimatorNetwork(nn.Module):
@@ -378,47 +485,6 @@ class EstimatorNetwork(nn.Module):
         '''
         return self.fc_layers(s)
 
-class Memory(object):
-    ''' Memory for saving transitions
-    '''
-
-    def __init__(self, memory_size, batch_size):
-        ''' Initialize
-        Args:
-            memory_size (int): the size of the memroy buffer
-        '''
-        self.memory_size = memory_size
-        self.batch_size = batch_size
-        self.memory = []
-
-    def save(self, state, action, reward, next_state, done):
-        ''' Save transition into memory
-
-        Args:
-            state (numpy.array): the current state
-            action (int): the performed action ID
-            reward (float): the reward received
-            next_state (numpy.array): the next state after performing the action
-            done (boolean): whether the episode is finished
-        '''
-        if len(self.memory) == self.memory_size:
-            self.memory.pop(0)
-        transition = Transition(state, action, reward, next_state, done)
-        self.memory.append(transition)
-
-    def sample(self):
-        ''' Sample a minibatch from the replay memory
-
-        Returns:
-            state_batch (list): a batch of states
-            action_batch (list): a batch of actions
-            reward_batch (list): a batch of rewards
-            next_state_batch (list): a batch of states
-            done_batch (list): a batch of dones
-        '''
-        samples = random.sample(self.memory, self.batch_size)
-        return map(np.array, zip(*samples))
-
 def copy_model_parameters(sess, estimator1, estimator2):
     ''' Copys the model parameters of one estimator to another.
 
@@ -236,6 +236,57 @@ class NFSPAgent(object):
             raise ValueError("'evaluate_with' should be either 'average_policy' or 'best_response'.")
         return action, probs
 
+    def batch_step(self, states):
+        ''' Returns the actions to be taken for a batch of states.
+
+        Args:
+            states (list): A list of state dicts, possibly from different environments
+
+        Returns:
+            actions (list): A list of action ids, one for each state
+        '''
+        if self._mode == MODE.best_response:
+            probs_batch = self._rl_agent.batch_predict(states)
+            for state, probs in zip(states, probs_batch):
+                one_hot = np.zeros(len(probs))
+                one_hot[np.argmax(probs)] = 1
+                self._add_transition(state['obs'], one_hot)
+
+        elif self._mode == MODE.average_policy:
+            probs_batch = self._batch_act(np.array([state['obs'] for state in states]))
+
+        elif self._mode == MODE.rule_policy:
+            return [self.step(state) for state in states]
+
+        actions = []
+        for state, probs in zip(states, probs_batch):
+            probs = remove_illegal(probs, state['legal_actions'])
+            actions.append(np.random.choice(len(probs), p=probs))
+        return actions
+
+    def batch_eval_step(self, states):
+        ''' Use the average policy for evaluating a batch of states
+
+        Args:
+            states (list): A list of state dicts, possibly from different environments
+
+        Returns:
+            actions (list): A list of action ids, one for each state
+            probs (list): A list of action probabilities, one for each state
+        '''
+        if self.evaluate_with == 'best_response':
+            return self._rl_agent.batch_eval_step(states)
+        elif self.evaluate_with == 'average_policy':
+            probs_batch = self._batch_act(np.array([state['obs'] for state in states]))
+            actions, probs = [], []
+            for state, _probs in zip(states, probs_batch):
+                _probs = remove_illegal(_probs, state['legal_actions'])
+                actions.append(np.random.choice(len(_probs), p=_probs))
+                probs.append(_probs)
+            return actions, probs
+        else:
+            raise ValueError("'evaluate_with' should be either 'average_policy' or 'best_response'.")
+
     def sample_episode_policy(self, use_rule_policy=False):
         ''' Sample average/best_response policy
         '''
@@ -255,10 +306,20 @@ class NFSPAgent(object):
         Returns:
             action_probs (numpy.array): The predicted action probability.
         '''
-        info_state = np.expand_dims(info_state, axis=0)
+        return self._batch_act(np.expand_dims(info_state, axis=0))[0]
+
+    def _batch_act(self, info_states):
+        ''' Predict action probabilities for a batch of observations
+
+        Args:
+            info_states (numpy.array): A batch of obervations.
+
+        Returns:
+            action_probs (numpy.array): The predicted action probabilities, one row per observation.
+        '''
         action_probs = self._sess.run(
                 self._avg_policy_probs,
-                feed_dict={self._info_state_ph: info_state, self.is_train: False})[0]
+                feed_dict={self._info_state_ph: info_states, self.is_train: False})
 
         return action_probs
 
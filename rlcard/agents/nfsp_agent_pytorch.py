@@ -206,6 +206,82 @@ class NFSPAgent(object):
             raise ValueError("'evaluate_with' should be either 'average_policy' or 'best_response'.")
         return action, probs
 
+    def batch_step(self, states):
+        ''' Returns the actions to be taken for a batch of states.
+
+        Args:
+            states (list): A list of state dicts, possibly from different environments
+
+        Returns:
+            actions (list): A list of action ids, one for each state
+        '''
+        return self._batch_step(np.array([state['obs'] for state in states]),
+                                [state['legal_actions'] for state in states])
+
+    def batch_eval_step(self, states):
+        ''' Use the average policy for evaluating a batch of states
+
+        Args:
+            states (list): A list of state dicts, possibly from different environments
+
+        Returns:
+            actions (list): A list of action ids, one for each state
+            probs (list): A list of action probabilities, one for each state
+        '''
+        return self._batch_eval_step(np.array([state['obs'] for state in states]),
+                                     [state['legal_actions'] for state in states])
+
+    def batch_step_arrays(self, obs, legal_masks):
+        ''' The same as `batch_step` on stacked arrays, e.g., the shared
+            arrays of `ShmVecEnv`, without building the state dicts
+
+        Args:
+            obs (numpy.array): (batch, state_shape) observations
+            legal_masks (numpy.array): (batch, action_num) boolean masks of the legal actions
+
+        Returns:
+            actions (list): A list of action ids, one for each state
+        '''
+        return self._batch_step(obs, [np.flatnonzero(mask) for mask in legal_masks])
+
+    def batch_eval_step_arrays(self, obs, legal_masks):
+        ''' The same as `batch_eval_step` on stacked arrays, see `batch_step_arrays`
+
+        Returns:
+            actions (list): A list of action ids, one for each state
+            probs (list): A list of action probabilities, one for each state
+        '''
+        return self._batch_eval_step(obs, [np.flatnonzero(mask) for mask in legal_masks])
+
+    def _batch_step(self, obs, legal_actions):
+        if self._mode == MODE.best_response:
+            probs_batch = self._rl_agent.batch_predict(obs)
+            for info_state, probs in zip(obs, probs_batch):
+                self._add_transition(info_state, probs)
+
+        elif self._mode == MODE.average_policy:
+            probs_batch = self._batch_act(obs)
+
+        actions = []
+        for legal, probs in zip(legal_actions, probs_batch):
+            probs = remove_illegal(probs, legal)
+            actions.append(np.random.choice(len(probs), p=probs))
+        return actions
+
+    def _batch_eval_step(self, obs, legal_actions):
+        if self.evaluate_with == 'best_response':
+            return self._rl_agent._batch_eval_step(obs, legal_actions)
+        elif self.evaluate_with == 'average_policy':
+            probs_batch = self._batch_act(obs)
+            actions, probs = [], []
+            for legal, _probs in zip(legal_actions, probs_batch):
+                _probs = remove_illegal(_probs, legal)
+                actions.append(np.random.choice(len(_probs), p=_probs))
+                probs.append(_probs)
+            return actions, probs
+        else:
+            raise ValueError("'evaluate_with' should be either 'average_policy' or 'best_response'.")
+
     def sample_episode_policy(self):
         ''' Sample average/best_response policy
         '''
@@ -223,13 +299,23 @@ class NFSPAgent(object):
         Returns:
             action_probs (numpy.array): The predicted action probability.
         '''
-        info_state = np.expand_dims(info_state, axis=0)
-        info_state = torch.from_numpy(info_state).float().to(self.device)
+        return self._batch_act(np.expand_dims(info_state, axis=0))[0]
+
+    def _batch_act(self, info_states):
+        ''' Predict action probabilities for a batch of observations
+            Not connected to computation graph
+        Args:
+            info_states (numpy.array): A batch of obervations.
+
+        Returns:
+            action_probs (numpy.array): The predicted action probabilities, one row per observation.
+        '''
+        info_states = torch.from_numpy(info_states).float().to(self.device)
 
         with torch.no_grad():
-            log_action_probs = self.policy_network(info_state).cpu().numpy()
+            log_action_probs = self.policy_network(info_states).cpu().numpy()
 
-        action_probs = np.exp(log_action_probs)[0]
+        action_probs = np.exp(log_action_probs)
 
         return action_probs
 
@@ -299,8 +385,10 @@ class NFSPAgent(object):
         ''' Load model
 
         Args:
-            checkpoint (dict): the loaded state
+            checkpoint (dict): the loaded state, with the networks of the
+                best response agent as from `get_state_dict`
         '''
+        self._rl_agent.load(checkpoint)
         self.policy_network.load_state_dict(checkpoint[self._scope])
 
 class AveragePolicyNetwork(nn.Module):
@@ -0,0 +1,398 @@
+''' Replay memories shared by the DQN agents
+'''
+
+import random
+import numpy as np
+
+
+class Memory(object):
+    ''' Memory for saving transitions. The transitions are kept in
+        preallocated NumPy arrays used as a circular buffer, so that saving
+        is O(1) and a minibatch is gathered with a single fancy index per field.
+    '''
+
+    def __init__(self, memory_size, batch_size, action_num=None):
+        ''' Initialize
+        Args:
+            memory_size (int): the size of the memroy buffer
+            batch_size (int): the size of the sampled minibatches
+            action_num (int): the number of actions. If given, the legal actions
+              of the next states are also kept, as boolean masks
+        '''
+        self.memory_size = memory_size
+        self.batch_size = batch_size
+        self.action_num = action_num
+
+        # The arrays are allocated at the first transition, when the shape
+        # and the dtype of the states are known
+        self.states = None
+        self.next_states = None
+        self.actions = np.zeros(memory_size, dtype=np.int64)
+        self.rewards = np.zeros(memory_size, dtype=np.float32)
+        self.dones = np.zeros(memory_size, dtype=bool)
+        if action_num is not None:
+            self.next_legal_actions = np.zeros((memory_size, action_num), dtype=bool)
+
+        # The number of transitions saved and the position of the next one
+        self.size = 0
+        self.position = 0
+
+    def __len__(self):
+        return self.size
+
+    def save(self, state, action, reward, next_state, done, next_legal_actions=None):
+        ''' Save transition into memory
+
+        Args:
+            state (numpy.array): the current state
+            action (int): the performed action ID
+            reward (float): the reward received
+            next_state (numpy.array): the next state after performing the action
+            done (boolean): whether the episode is finished
+            next_legal_actions (list): the legal actions of the next state
+
+        Returns:
+            (int): the slot of the transition
+        '''
+        if self.states is None:
+            state = np.asarray(state)
+            self.states = np.zeros((self.memory_size,) + state.shape, dtype=state.dtype)
+            self.next_states = np.zeros((self.memory_size,) + state.shape, dtype=state.dtype)
+
+        index = self.position
+        self.states[index] = state
+        self.next_states[index] = next_state
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.dones[index] = done
+        if self.action_num is not None:
+            self.next_legal_actions[index] = False
+            self.next_legal_actions[index, next_legal_actions] = True
+
+        self.position = (self.position + 1) % self.memory_size
+        self.size = min(self.size + 1, self.memory_size)
+        return index
+
+    def sample(self):
+        ''' Sample a minibatch from the replay memory
+
+        Returns:
+            state_batch (numpy.array): a batch of states
+            action_batch (numpy.array): a batch of actions
+            reward_batch (numpy.array): a batch of rewards
+            next_state_batch (numpy.array): a batch of states
+            done_batch (numpy.array): a batch of dones
+            next_legal_actions_batch (numpy.array): a batch of masks of the
+              next legal actions, only if `action_num` is given
+        '''
+        return self._gather(self._sample_indices())
+
+    def _sample_indices(self):
+        ''' Sample distinct slots uniformly
+        '''
+        return np.array(random.sample(range(self.size), self.batch_size))
+
+    def _gather(self, indices):
+        ''' Gather the fields of the transitions in the slots
+        '''
+        samples = (self.states[indices], self.actions[indices], self.rewards[indices],
+                   self.next_states[indices], self.dones[indices])
+        if self.action_num is not None:
+            samples += (self.next_legal_actions[indices],)
+        return samples
+
+
+class FrameMemory(Memory):
+    ''' Memory that stores every observation only once. Within an episode the
+        next state of a transition is the state of the following transition
+        of the same player, so the transitions are laid out as a stream of
+        frames: the state of the transition in slot i is frames[i] and its
+        next state is frames[i+1].
+
+        The next state of the latest transition is written to the following
+        slot as a pending frame. If the next saved state is that same
+        observation and the episode is not done, the frame is reused.
+        Otherwise (e.g., at the start of a new episode) the pending frame is
+        kept only as the next state of the previous transition, and the slot
+        is never sampled.
+    '''
+
+    def __init__(self, memory_size, batch_size, action_num=None):
+        ''' Initialize
+        Args:
+            memory_size (int): the number of frames in the memory, at least 2
+            batch_size (int): the size of the sampled minibatches
+            action_num (int): the number of actions. If given, the legal actions
+              of the next states are also kept, as boolean masks
+        '''
+        if memory_size < 2:
+            raise ValueError('FrameMemory needs at least 2 frames')
+        super().__init__(memory_size, batch_size, action_num)
+        # Whether the slot holds a transition, or only the next state of the previous one
+        self.valid = np.zeros(memory_size, dtype=bool)
+        # The number of slots that have been written
+        self.filled = 0
+        self._pending = None
+        self._pending_done = True
+
+    def save(self, state, action, reward, next_state, done, next_legal_actions=None):
+        ''' Save transition into memory
+
+        Args:
+            state (numpy.array): the current state
+            action (int): the performed action ID
+            reward (float): the reward received
+            next_state (numpy.array): the next state after performing the action
+            done (boolean): whether the episode is finished
+            next_legal_actions (list): the legal actions of the next state
+
+        Returns:
+            (int): the slot of the transition
+        '''
+        if self.states is None:
+            state = np.asarray(state)
+            self.states = np.zeros((self.memory_size,) + state.shape, dtype=state.dtype)
+
+        if self._pending is None or self._pending_done or state is not self._pending:
+            if self._pending is not None:
+                # Keep the pending frame as the next state of the previous transition
+                self.position = (self.position + 1) % self.memory_size
+            self._write_frame(state)
+
+        index = self.position
+        self.valid[index] = True
+        self.size += 1
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.dones[index] = done
+        if self.action_num is not None:
+            self.next_legal_actions[index] = False
+            self.next_legal_actions[index, next_legal_actions] = True
+
+        self.position = (self.position + 1) % self.memory_size
+        self._write_frame(next_state)
+        self._pending = next_state
+        self._pending_done = done
+        return index
+
+    def _write_frame(self, frame):
+        ''' Write a frame at the current position, which drops the transition
+            that was saved in the slot
+        '''
+        if self.valid[self.position]:
+            self.valid[self.position] = False
+            self.size -= 1
+            self._drop(self.position)
+        self.states[self.position] = frame
+        self.filled = max(self.filled, self.position + 1)
+
+    def _drop(self, index):
+        ''' Called when the transition in the slot is dropped
+        '''
+        pass
+
+    def _gather(self, indices):
+        ''' Gather the fields of the transitions in the slots
+        '''
+        samples = (self.states[indices], self.actions[indices], self.rewards[indices],
+                   self.states[(indices + 1) % self.memory_size], self.dones[indices])
+        if self.action_num is not None:
+            samples += (self.next_legal_actions[indices],)
+        return samples
+
+    def _sample_indices(self):
+        ''' Sample distinct slots that hold transitions. The pending frames are
+            only a small part of the slots, so they are simply rejected
+        '''
+        if self.size < self.batch_size:
+            raise ValueError('Sample larger than the number of transitions')
+        indices = set()
+        while len(indices) < self.batch_size:
+            index = random.randrange(self.filled)
+            if self.valid[index]:
+                indices.add(index)
+        return np.array(list(indices))
+
+
+class SumTree(object):
+    ''' A binary tree whose leaves are the priorities of the slots and each
+        inner node is the sum of its children. Updating priorities and finding
+        the slot of a prefix sum are O(log n), and both work on whole batches.
+        The nodes are kept in one array: the root is node 1 and the children
+        of node i are nodes 2i and 2i+1.
+    '''
+
+    def __init__(self, capacity):
+        ''' Initialize
+        Args:
+            capacity (int): the number of leaves
+        '''
+        self.capacity = capacity
+        # The number of leaves is padded to a power of two
+        self.leaf_start = 1 << max(capacity - 1, 0).bit_length()
+        self.nodes = np.zeros(2 * self.leaf_start)
+
+    @property
+    def total(self):
+        ''' The sum of all the priorities
+        '''
+        return self.nodes[1]
+
+    def get(self, indices):
+        ''' Get the priorities of the leaves
+
+        Args:
+            indices (numpy.array): the indices of the leaves
+
+        Returns:
+            (numpy.array): the priorities
+        '''
+        return self.nodes[self.leaf_start + np.asarray(indices)]
+
+    def update(self, indices, priorities):
+        ''' Set the priorities of the leaves and update the sums above them
+
+        Args:
+            indices (numpy.array): the indices of the leaves
+            priorities (numpy.array): the new priorities
+        '''
+        nodes = self.leaf_start + np.asarray(indices)
+        self.nodes[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+            nodes = np.unique(nodes // 2)
+
+    def find(self, values):
+        ''' Find the leaves where the prefix sums of the priorities reach the values.
+            Leaves with zero priority are never returned
+
+        Args:
+            values (numpy.array): the values, in [0, total)
+
+        Returns:
+            (numpy.array): the indices of the leaves
+        '''
+        values = np.array(values, dtype=float)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self.leaf_start:
+            left = 2 * nodes
+            left_sums = self.nodes[left]
+            go_right = (values >= left_sums) & (self.nodes[left + 1] > 0)
+            values -= left_sums * go_right
+            nodes = left + go_right
+        return nodes - self.leaf_start
+
+
+class PrioritizedMemory(Memory):
+    ''' Memory for prioritized experience replay. The transitions are sampled
+        with probabilities proportional to their priorities to the power of
+        `alpha`, which are kept in a sum tree. New transitions get the largest
+        priority seen so far, and the priorities of the sampled ones are set
+        to their TD errors with `update_priorities`.
+    '''
+
+    def __init__(self, memory_size, batch_size, action_num=None, alpha=0.6, beta=0.4, epsilon=1e-6):
+        ''' Initialize
+        Args:
+            memory_size (int): the size of the memroy buffer
+            batch_size (int): the size of the sampled minibatches
+            action_num (int): the number of actions. If given, the legal actions
+              of the next states are also kept, as boolean masks
+            alpha (float): how much the priorities are used, 0 is uniform sampling
+            beta (float): how much the importance sampling weights correct the
+              bias of the prioritized sampling, 1 is a full correction
+            epsilon (float): added to the TD errors, so that no priority is zero
+        '''
+        super().__init__(memory_size, batch_size, action_num)
+        self.alpha = alpha
+        self.beta = beta
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.tree = SumTree(memory_size)
+
+    def save(self, state, action, reward, next_state, done, next_legal_actions=None):
+        ''' Save transition into memory with the largest priority
+
+        Args:
+            state (numpy.array): the current state
+            action (int): the performed action ID
+            reward (float): the reward received
+            next_state (numpy.array): the next state after performing the action
+            done (boolean): whether the episode is finished
+            next_legal_actions (list): the legal actions of the next state
+
+        Returns:
+            (int): the slot of the transition
+        '''
+        index = super().save(state, action, reward, next_state, done, next_legal_actions)
+        self.tree.update([index], [self.max_priority ** self.alpha])
+        return index
+
+    def _drop(self, index):
+        ''' Called when the transition in the slot is dropped
+        '''
+        self.tree.update([index], [0])
+
+    def sample(self):
+        ''' Sample a minibatch from the replay memory
+
+        Returns:
+            state_batch (numpy.array): a batch of states
+            action_batch (numpy.array): a batch of actions
+            reward_batch (numpy.array): a batch of rewards
+            next_state_batch (numpy.array): a batch of states
+            done_batch (numpy.array): a batch of dones
+            next_legal_actions_batch (numpy.array): a batch of masks of the
+              next legal actions, only if `action_num` is given
+            weights (numpy.array): the importance sampling weights
+            indices (numpy.array): the slots of the transitions, to be passed
+              to `update_priorities`
+        '''
+        indices = self._sample_indices()
+        probs = self.tree.get(indices) / self.tree.total
+        weights = (self.size * probs) ** -self.beta
+        weights /= weights.max()
+        return self._gather(indices) + (weights.astype(np.float32), indices)
+
+    def _sample_indices(self):
+        ''' Sample slots proportionally to their priorities. The range of the
+            total priority is split into even segments, and one slot is drawn
+            from each
+        '''
+        if self.size == 0:
+            raise ValueError('Sample from an empty memory')
+        total = self.tree.total
+        values = (np.arange(self.batch_size) + np.random.rand(self.batch_size)) * (total / self.batch_size)
+        return self.tree.find(np.minimum(values, np.nextafter(total, 0)))
+
+    def update_priorities(self, indices, td_errors):
+        ''' Update the priorities of the sampled transitions
+
+        Args:
+            indices (numpy.array): the slots returned by `sample`
+            td_errors (numpy.array): the TD errors of the transitions
+        '''
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, priorities.max())
+        self.tree.update(indices, priorities ** self.alpha)
+
+
+class PrioritizedFrameMemory(PrioritizedMemory, FrameMemory):
+    ''' Prioritized experience replay on a `FrameMemory`. The pending frames
+        have zero priority, so they are never sampled
+    '''
+
+    def __init__(self, memory_size, batch_size, action_num=None, alpha=0.6, beta=0.4, epsilon=1e-6):
+        ''' Initialize
+        Args:
+            memory_size (int): the number of frames in the memory, at least 2
+            batch_size (int): the size of the sampled minibatches
+            action_num (int): the number of actions. If given, the legal actions
+              of the next states are also kept, as boolean masks
+            alpha (float): how much the priorities are used, 0 is uniform sampling
+            beta (float): how much the importance sampling weights correct the
+              bias of the prioritized sampling, 1 is a full correction
+            epsilon (float): added to the TD errors, so that no priority is zero
+        '''
+        super().__init__(memory_size, batch_size, action_num, alpha, beta, epsilon)
@@ -1,5 +1,6 @@
 import numpy as np
-from rlcard.games.tractor.utils import ACTION_LIST, CARD_RANK_DICT, CARD_RANK_STR, calc_score
+from rlcard.games.tractor.action_table import NUM_CARD_ACTIONS, SCOR_ACTION_START, SCORE_TABLES, TRUMP_SCORE_TABLE_ID
+from rlcard.games.tractor.action_table import ACTION_LEN, ACTION_FIRST, get_trump_id
 
 class TractorRuleAgent(object):
     ''' A random agent. Random agents is for running toy examples on the card games
@@ -25,40 +26,24 @@ class TractorRuleAgent(object):
             action (int): The action predicted (randomly chosen) by the random agent
         '''
         # print(state)
-        first_player_in_round = True
-        has_score = False
-        for k in range(4, 7):
-            for i in range(len(state['obs'][k][0])):
-                if state['obs'][k][0][i] == 0:
-                    first_player_in_round = False
-                    if calc_score([CARD_RANK_STR[i]], state['trump']) > 0:
-                        has_score = True
-                        break
+        # Cards played by the other players in the current round
+        played = (state['obs'][4:7, 0] == 0).any(axis=0)
+        first_player_in_round = not played.any()
+        score_table = SCORE_TABLES[TRUMP_SCORE_TABLE_ID[get_trump_id(state['trump'])]]
+        has_score = (score_table[played] > 0).any()
 
         if first_player_in_round or not has_score:
             return np.random.choice(state['legal_actions'])
             # return state['legal_actions'][0]
 
         else:
-            actions = [ACTION_LIST[x].split(',') for x in state['legal_actions']]
-
-            max_score = -3
-            max_index = 0
-            for i in range(len(actions)):
-                if actions[i][0][0] == 'p':
-                    score = -1
-                elif actions[i][0][0] == 's':
-                    score = -2
-                else:
-                    score = CARD_RANK_DICT[actions[i][0]]
-
-                score += (len(actions[i]) * 100)
-                
-                if score > max_score:
-                    max_score = score
-                    max_index = i
-
-            return state['legal_actions'][max_index]
+            # Prefer the longest and the highest cards, then 'pass_*' over 'scor_*'
+            actions = np.asarray(state['legal_actions'])
+            scores = np.where(actions >= SCOR_ACTION_START, -2,
+                              np.where(actions >= NUM_CARD_ACTIONS, -1, ACTION_FIRST[actions]))
+            scores += ACTION_LEN[actions] * 100
+
+            return state['legal_actions'][np.argmax(scores)]
 
     def eval_step(self, state):
         ''' Predict the action given the current state for evaluation.
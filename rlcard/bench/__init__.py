@@ -0,0 +1,7 @@
+''' Benchmarks of RLCard, run them with
+
+    $ python -m rlcard.bench envs --help
+    $ python -m rlcard.bench agents --help
+'''
+from rlcard.bench.envs import bench_env, bench_envs
+from rlcard.bench.agents import bench_agent, bench_agents
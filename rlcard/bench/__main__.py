@@ -0,0 +1,50 @@
+''' The command line of the benchmarks
+
+    $ python -m rlcard.bench envs --envs tractor doudizhu --modes single vec --output bench_envs.json
+    $ python -m rlcard.bench agents --agents dqn-pytorch cfr --games tractor --batch-sizes 1 32 --output bench_agents.json
+'''
+import argparse
+
+from rlcard.bench.envs import bench_envs, MODES
+from rlcard.bench.agents import bench_agents, AGENTS
+from rlcard.bench.utils import write_json
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m rlcard.bench', description='Benchmarks of RLCard')
+    subparsers = parser.add_subparsers(dest='benchmark')
+
+    envs_parser = subparsers.add_parser('envs', help='Step throughput of the environments with random agents')
+    envs_parser.add_argument('--envs', nargs='+', default=None, help='The environments, all the registered ones by default')
+    envs_parser.add_argument('--modes', nargs='+', default=None, choices=MODES, help='The modes, all by default')
+    envs_parser.add_argument('--env-num', type=int, default=4, help='The number of environments of the vec modes')
+    envs_parser.add_argument('--games', type=int, default=100, help='The number of games of each benchmark')
+    envs_parser.add_argument('--max-seconds', type=float, default=10.0, help='The maximum time of each benchmark')
+    envs_parser.add_argument('--seed', type=int, default=0)
+    envs_parser.add_argument('--output', default='bench_envs.json', help='The JSON file of the results')
+
+    agents_parser = subparsers.add_parser('agents', help='Inference latency and throughput of the agents')
+    agents_parser.add_argument('--agents', nargs='+', default=None, choices=AGENTS, help='The agents, all by default')
+    agents_parser.add_argument('--games', nargs='+', default=['tractor', 'doudizhu'], help='The games of the states')
+    agents_parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1, 8, 32, 128])
+    agents_parser.add_argument('--mlp-layers', nargs='+', type=int, default=[512, 512], help='The hidden layers of the networks')
+    agents_parser.add_argument('--num', type=int, default=200, help='The number of calls of each measurement')
+    agents_parser.add_argument('--max-seconds', type=float, default=2.0, help='The maximum time of each measurement')
+    agents_parser.add_argument('--device', default='cpu', help='The device of the PyTorch agents')
+    agents_parser.add_argument('--threads', type=int, default=None, help='The number of threads of PyTorch')
+    agents_parser.add_argument('--output', default='bench_agents.json', help='The JSON file of the results')
+
+    args = parser.parse_args(argv)
+    if args.benchmark == 'envs':
+        results = bench_envs(args.envs, args.modes, args.env_num, args.games, args.max_seconds, args.seed)
+    elif args.benchmark == 'agents':
+        results = bench_agents(args.agents, args.games, args.batch_sizes, args.mlp_layers, args.num,
+                               args.max_seconds, args.device, args.threads)
+    else:
+        parser.print_help()
+        return
+    write_json(results, args.output)
+    print('Saved the results to {}'.format(args.output))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+''' Inference latency and throughput of the agents
+
+The agents are queried with real states of a game, collected from games of
+random agents, so that the observations and the legal actions have the
+shapes and the sparsity of the game. For each agent and game, it measures
+
+    eval_step: the latency of one state for evaluation
+    step: the latency of one state for training, i.e., with exploration
+    batches: for each batch size, the latency of `batch_eval_step` and the
+        states per second. The agents without `batch_eval_step` are queried
+        state by state, which is marked with 'native': False
+
+The deep agents are built with untrained weights, which does not change the
+time of the forward passes.
+'''
+
+import time
+
+import rlcard
+from rlcard.agents import RandomAgent
+from rlcard.bench.utils import latency_stats, peak_rss_mb, run_isolated
+
+AGENTS = ['dqn', 'nfsp', 'deep-cfr', 'dqn-pytorch', 'nfsp-pytorch', 'cfr']
+
+# The agents that depend on Tensorflow, by their names in rlcard.agents
+TF_AGENTS = {'dqn': 'DQNAgent', 'nfsp': 'NFSPAgent', 'deep-cfr': 'DeepCFR'}
+
+
+def build_agent(name, env, mlp_layers, device='cpu'):
+    ''' Build an untrained agent for a game
+
+    Args:
+        name (string): One of `AGENTS`
+        env (Env): The environment of the game
+        mlp_layers (list): The sizes of the hidden layers of the networks
+        device (string): The device of the PyTorch agents
+
+    Returns:
+        (object): The agent
+    '''
+    import rlcard.agents
+
+    if name == 'cfr':
+        return rlcard.agents.CFRAgent(env)
+    if name in ['dqn-pytorch', 'nfsp-pytorch']:
+        import torch
+
+        if name == 'dqn-pytorch':
+            return rlcard.agents.DQNAgentPytorch(scope='dqn', action_num=env.action_num, state_shape=env.state_shape,
+                                                 mlp_layers=mlp_layers, device=torch.device(device))
+        return rlcard.agents.NFSPAgentPytorch(scope='nfsp', action_num=env.action_num, state_shape=env.state_shape,
+                                              hidden_layers_sizes=mlp_layers, q_mlp_layers=mlp_layers,
+                                              device=torch.device(device))
+    if name not in TF_AGENTS:
+        raise ValueError('Unknown agent {}'.format(name))
+
+    # Raises an ImportError if Tensorflow is not installed
+    agent_class = getattr(rlcard.agents, TF_AGENTS[name])
+    import tensorflow as tf
+
+    graph = tf.Graph()
+    sess = tf.Session(graph=graph)
+    with graph.as_default():
+        if name == 'dqn':
+            agent = agent_class(sess, scope='dqn', action_num=env.action_num, state_shape=env.state_shape,
+                                mlp_layers=mlp_layers)
+        elif name == 'nfsp':
+            agent = agent_class(sess, scope='nfsp', action_num=env.action_num, state_shape=env.state_shape,
+                                hidden_layers_sizes=mlp_layers, q_mlp_layers=mlp_layers)
+        else:
+            agent = agent_class(sess, scope='deep_cfr', env=env, policy_network_layers=mlp_layers,
+                                advantage_network_layers=mlp_layers)
+        sess.run(tf.global_variables_initializer())
+    return agent
+
+def collect_states(env, num):
+    ''' Collect the states of games of random agents
+
+    Args:
+        env (Env): The environment
+        num (int): The number of states
+
+    Returns:
+        (list): The states that have legal actions
+    '''
+    env.set_agents([RandomAgent(env.action_num) for _ in range(env.player_num)])
+    states = []
+    while len(states) < num:
+        trajectories, _ = env.run(is_training=False)
+        states.extend(ts[0] for player_trajectories in trajectories for ts in player_trajectories
+                      if len(ts[0]['legal_actions']) > 0)
+    return states[:num]
+
+def time_calls(func, inputs, num, max_seconds):
+    ''' Time the calls of a function on the inputs in turn, after one warm up call
+
+    Args:
+        func (callable): The function
+        inputs (list): The inputs
+        num (int): The number of calls
+        max_seconds (float): Stop after this time even if fewer calls are made
+
+    Returns:
+        (list): The time of each call in seconds
+    '''
+    func(inputs[0])
+    seconds = []
+    start = time.perf_counter()
+    while len(seconds) < num and time.perf_counter() - start < max_seconds:
+        x = inputs[len(seconds) % len(inputs)]
+        call_start = time.perf_counter()
+        func(x)
+        seconds.append(time.perf_counter() - call_start)
+    return seconds
+
+def bench_agent(name, game='tractor', batch_sizes=(1, 8, 32, 128), mlp_layers=(512, 512),
+                num=200, max_seconds=2.0, device='cpu', threads=None):
+    ''' Measure the inference of an agent on the states of a game
+
+    Args:
+        name (string): One of `AGENTS`
+        game (string): The id of the environment of the game
+        batch_sizes (list): The batch sizes
+        mlp_layers (list): The sizes of the hidden layers of the networks
+        num (int): The number of calls of each measurement
+        max_seconds (float): The maximum time of each measurement
+        device (string): The device of the PyTorch agents
+        threads (int): The number of threads of PyTorch, its default if None
+
+    Returns:
+        (dict): The result
+    '''
+    if threads is not None:
+        import torch
+        torch.set_num_threads(threads)
+
+    env = rlcard.make(game, config={'seed': 0})
+    states = collect_states(env, max(256, max(batch_sizes)))
+    agent = build_agent(name, env, list(mlp_layers), device)
+
+    result = {
+        'agent': name,
+        'game': game,
+        'state_shape': list(env.state_shape),
+        'action_num': env.action_num,
+        'mlp_layers': list(mlp_layers),
+        'eval_step_ms': latency_stats(time_calls(agent.eval_step, states, num, max_seconds)),
+        'step_ms': None,
+        'batches': [],
+    }
+    if hasattr(agent, 'step'):
+        result['step_ms'] = latency_stats(time_calls(agent.step, states, num, max_seconds))
+
+    native = hasattr(agent, 'batch_eval_step')
+    for batch_size in batch_sizes:
+        batches = [states[i:i+batch_size] for i in range(0, len(states) - batch_size + 1, batch_size)]
+        if native:
+            seconds = time_calls(agent.batch_eval_step, batches, num, max_seconds)
+        else:
+            seconds = time_calls(lambda batch: [agent.eval_step(state) for state in batch], batches, num, max_seconds)
+        result['batches'].append({
+            'batch_size': batch_size,
+            'native': native,
+            'latency_ms': latency_stats(seconds),
+            'states_per_sec': batch_size * len(seconds) / sum(seconds),
+        })
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+def bench_agents(names=None, games=('tractor', 'doudizhu'), batch_sizes=(1, 8, 32, 128), mlp_layers=(512, 512),
+                 num=200, max_seconds=2.0, device='cpu', threads=None, isolated=True, verbose=True):
+    ''' Benchmark the agents on the games
+
+    Args:
+        names (list): The agents, all of `AGENTS` if None
+        games (list): The ids of the environments of the games
+        isolated (boolean): Run each benchmark in a new process
+        verbose (boolean): Print the results as they are measured
+        The other arguments are the same as `bench_agent`
+
+    Returns:
+        (list): The results. The agents that fail, e.g., because their
+            backend is not installed, have an 'error'
+    '''
+    names = AGENTS if names is None else names
+    results = []
+    for name in names:
+        for game in games:
+            args = (name, game, tuple(batch_sizes), tuple(mlp_layers), num, max_seconds, device, threads)
+            result = run_isolated(bench_agent, *args) if isolated else bench_agent(*args)
+            result.update({'agent': name, 'game': game})
+            results.append(result)
+            if verbose:
+                print(format_result(result))
+    return results
+
+def format_result(result):
+    ''' Format a result as lines of a table
+
+    Args:
+        result (dict): The result of `bench_agent`
+
+    Returns:
+        (str): The lines
+    '''
+    if 'error' in result:
+        return '{:<14} {:<10} error: {}'.format(result['agent'], result['game'], result['error'].splitlines()[0])
+    lines = ['{:<14} {:<10} eval_step p50 {:>8.3f} ms  p99 {:>8.3f} ms'.format(
+        result['agent'], result['game'], result['eval_step_ms']['p50'], result['eval_step_ms']['p99'])]
+    for batch in result['batches']:
+        lines.append('{:<14} {:<10} batch {:>4}    p50 {:>8.3f} ms  p99 {:>8.3f} ms  {:>10.1f} states/s'.format(
+            '', '', batch['batch_size'], batch['latency_ms']['p50'], batch['latency_ms']['p99'], batch['states_per_sec']))
+    return '\n'.join(lines)
@@ -0,0 +1,191 @@
+''' Step throughput of the environments with random agents
+
+The modes are:
+
+    single: one environment in the process, `Env`
+    vec: `env_num` environments in worker processes, `VecEnv`
+    shm: the same with the states in shared memory, `ShmVecEnv` (Python 3.8+)
+    batched: `env_num` games stepped together in the process, e.g., `TractorVecEnv`
+
+The step latency is the time of `env.step` in the single mode, and the time
+between two queries of the agents in the other modes, i.e., of a step of all
+the running environments.
+'''
+
+import sys
+import time
+import importlib
+
+import rlcard
+from rlcard.agents import RandomAgent
+from rlcard.bench.utils import latency_stats, peak_rss_mb, run_isolated
+
+MODES = ['single', 'vec', 'shm', 'batched']
+
+# The environments that have a batched implementation
+BATCHED_ENVS = {
+    'tractor': 'rlcard.envs.tractor:TractorVecEnv',
+}
+
+
+class TickAgent(RandomAgent):
+    ''' A random agent that records the time between its batched queries
+    '''
+
+    def __init__(self, action_num):
+        super().__init__(action_num)
+        self.ticks = []
+        self.last = None
+
+    def batch_step(self, states):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.ticks.append(now - self.last)
+        actions = [self.step(state) for state in states]
+        self.last = time.perf_counter()
+        return actions
+
+
+def env_ids():
+    ''' Get the ids of the registered environments
+
+    Returns:
+        (list): The ids
+    '''
+    from rlcard.envs.registration import registry
+    return list(registry.env_specs)
+
+def available_modes(env_id):
+    ''' Get the modes that an environment can be run in
+
+    Args:
+        env_id (string): The id of the environment
+
+    Returns:
+        (list): The modes
+    '''
+    modes = ['single', 'vec']
+    if sys.version_info >= (3, 8):
+        modes.append('shm')
+    if env_id in BATCHED_ENVS:
+        modes.append('batched')
+    return modes
+
+def bench_env(env_id, mode='single', env_num=4, games=100, max_seconds=10.0, seed=0):
+    ''' Measure the throughput of an environment with random agents. One
+        warm up game, or batch of games, is not measured
+
+    Args:
+        env_id (string): The id of the environment
+        mode (string): One of `MODES`
+        env_num (int): The number of environments of the vec modes
+        games (int): The number of games to play
+        max_seconds (float): Stop after this time even if fewer games are played
+
+    Returns:
+        (dict): The result with the steps/games per second, the step
+            latency in ms and the peak RSS in MB
+    '''
+    if mode not in available_modes(env_id):
+        raise ValueError('Mode {} is not available for {}'.format(mode, env_id))
+
+    played = 0
+    if mode == 'single':
+        env_num = 1
+        env = rlcard.make(env_id, config={'seed': seed})
+        agent = RandomAgent(env.action_num)
+        latencies = []
+        start = None
+        # The first game is the warm up
+        while played <= games and (start is None or time.perf_counter() - start < max_seconds):
+            if played == 1:
+                latencies = []
+                start = time.perf_counter()
+            state, player_id = env.reset()
+            while not env.is_over():
+                action = agent.step(state)
+                step_start = time.perf_counter()
+                state, player_id = env.step(action)
+                latencies.append(time.perf_counter() - step_start)
+            played += 1
+        played -= 1
+        steps = len(latencies)
+    else:
+        if mode == 'batched':
+            mod_name, class_name = BATCHED_ENVS[env_id].split(':')
+            env = getattr(importlib.import_module(mod_name), class_name)({'env_num': env_num, 'seed': seed})
+        else:
+            env = rlcard.make(env_id, config={'env_num': env_num, 'seed': seed, 'shared_memory': mode == 'shm'})
+        agent = TickAgent(env.action_num)
+        env.set_agents([agent for _ in range(env.player_num)])
+        env.run(is_training=True)
+        agent.ticks = []
+        timestep = env.timestep
+        start = time.perf_counter()
+        while played < games and time.perf_counter() - start < max_seconds:
+            agent.last = None
+            env.run(is_training=True)
+            played += env_num
+        steps = env.timestep - timestep
+        latencies = agent.ticks
+        if hasattr(env, 'close'):
+            env.close()
+    seconds = time.perf_counter() - start
+
+    return {
+        'env': env_id,
+        'mode': mode,
+        'env_num': env_num,
+        'games': played,
+        'steps': steps,
+        'seconds': seconds,
+        'steps_per_sec': steps / seconds,
+        'games_per_sec': played / seconds,
+        'step_latency_ms': latency_stats(latencies),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+def bench_envs(ids=None, modes=None, env_num=4, games=100, max_seconds=10.0, seed=0, isolated=True, verbose=True):
+    ''' Benchmark the environments in all their available modes
+
+    Args:
+        ids (list): The ids of the environments, all the registered ones if None
+        modes (list): The modes, all if None. The modes that an environment
+            does not have are skipped
+        isolated (boolean): Run each benchmark in a new process
+        verbose (boolean): Print the results as they are measured
+        The other arguments are the same as `bench_env`
+
+    Returns:
+        (list): The results
+    '''
+    ids = env_ids() if ids is None else ids
+    modes = MODES if modes is None else modes
+    results = []
+    for env_id in ids:
+        for mode in modes:
+            if mode not in available_modes(env_id):
+                continue
+            args = (env_id, mode, env_num, games, max_seconds, seed)
+            result = run_isolated(bench_env, *args) if isolated else bench_env(*args)
+            result.update({'env': env_id, 'mode': mode})
+            results.append(result)
+            if verbose:
+                print(format_result(result))
+    return results
+
+def format_result(result):
+    ''' Format a result as a line of a table
+
+    Args:
+        result (dict): The result of `bench_env`
+
+    Returns:
+        (str): The line
+    '''
+    if 'error' in result:
+        return '{:<16} {:<8} error: {}'.format(result['env'], result['mode'], result['error'])
+    latency = result['step_latency_ms']
+    return '{:<16} {:<8} {:>10.1f} steps/s {:>8.1f} games/s  p50 {:>8.3f} ms  p99 {:>8.3f} ms  rss {:>7.1f} MB'.format(
+        result['env'], result['mode'], result['steps_per_sec'], result['games_per_sec'],
+        latency['p50'] or 0, latency['p99'] or 0, result['peak_rss_mb']['self'] or 0)
@@ -0,0 +1,113 @@
+''' Helpers shared by the benchmarks
+'''
+
+import os
+import sys
+import json
+import time
+import platform
+import multiprocessing as mp
+import numpy as np
+
+import rlcard
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+
+def latency_stats(seconds):
+    ''' Summarize latencies
+
+    Args:
+        seconds (list): The latencies in seconds
+
+    Returns:
+        (dict): The number of samples, the mean, p50 and p99 in milliseconds
+    '''
+    if len(seconds) == 0:
+        return {'num': 0, 'mean': None, 'p50': None, 'p99': None}
+    ms = np.asarray(seconds) * 1000
+    return {
+        'num': len(ms),
+        'mean': float(ms.mean()),
+        'p50': float(np.percentile(ms, 50)),
+        'p99': float(np.percentile(ms, 99)),
+    }
+
+def peak_rss_mb():
+    ''' Get the peak resident set size of the process and of its finished children
+
+    Returns:
+        (dict): 'self' and 'children' in MB, None if not available
+    '''
+    if resource is None:
+        return {'self': None, 'children': None}
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    unit = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2 ** 20,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2 ** 20,
+    }
+
+def system_info():
+    ''' Get the information of the machine and the versions
+
+    Returns:
+        (dict): The information
+    '''
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'rlcard': rlcard.__version__,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': mp.cpu_count(),
+    }
+
+def run_isolated(func, *args):
+    ''' Run a benchmark in a new process, so that its memory is measured
+        alone and it does not warm up the next one
+
+    Args:
+        func (callable): A module level function that returns a dict
+        args: The arguments of the function
+
+    Returns:
+        (dict): The result of the function, or {'error': message} if it fails
+    '''
+    ctx = mp.get_context('spawn')
+    remote, work_remote = ctx.Pipe()
+    p = ctx.Process(target=_isolated_worker, args=(work_remote, func, args))
+    p.start()
+    work_remote.close()
+    try:
+        result = remote.recv()
+    except EOFError:
+        result = {'error': 'The process exited with code {}'.format(p.exitcode)}
+    p.join()
+    return result
+
+def _isolated_worker(remote, func, args):
+    try:
+        result = func(*args)
+    except Exception as e:
+        result = {'error': '{}: {}'.format(type(e).__name__, e)}
+    remote.send(result)
+    remote.close()
+
+def write_json(results, path):
+    ''' Write the results with the system information
+
+    Args:
+        results (list): The results of the benchmarks
+        path (str): The path of the JSON file
+    '''
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(path, 'w') as file:
+        json.dump({'system': system_info(), 'results': results}, file, indent=2)
@@ -145,6 +145,111 @@ class Round(object):
         raise NotImplementedError
 
 
+class Journal(object):
+    ''' Journal records the field-level mutations of the game objects, so
+    that a step is undone by reverting only what it changed, instead of
+    keeping deep copies of the round, the dealer and the players.
+
+    The games call `checkpoint` before each step, and make the mutations of
+    the step through the journal. `undo` reverts them in the reverse order.
+    If the journal is not enabled, the mutations are made without records.
+
+    Example:
+
+        journal.checkpoint()
+        journal.setattr(round, 'game_pointer', 1)
+        journal.append(public_cards, journal.pop(dealer.deck))
+        journal.undo()
+    '''
+
+    # The operations that revert the mutations
+    _SETATTR, _SETITEM, _POP, _INSERT = range(4)
+
+    def __init__(self, enabled=True):
+        ''' Initialize the journal
+
+        Args:
+            enabled (boolean): Whether to record the mutations, e.g., the
+                `allow_step_back` of the game
+        '''
+        self.enabled = enabled
+        self._log = []
+        self._checkpoints = []
+
+    def __len__(self):
+        ''' Return the number of steps that can be undone
+        '''
+        return len(self._checkpoints)
+
+    def checkpoint(self):
+        ''' Start the records of a step
+        '''
+        if self.enabled:
+            self._checkpoints.append(len(self._log))
+
+    def clear(self):
+        ''' Forget all the records, e.g., the mutations of the initialization
+        '''
+        self._log = []
+        self._checkpoints = []
+
+    def setattr(self, obj, name, value):
+        ''' Set an attribute of an object
+        '''
+        if self.enabled:
+            self._log.append((self._SETATTR, obj, name, getattr(obj, name)))
+        setattr(obj, name, value)
+
+    def setitem(self, container, key, value):
+        ''' Set an existing item of a list or a dict
+        '''
+        if self.enabled:
+            self._log.append((self._SETITEM, container, key, container[key]))
+        container[key] = value
+
+    def append(self, seq, item):
+        ''' Append an item to a list
+        '''
+        if self.enabled:
+            self._log.append((self._POP, seq, None, None))
+        seq.append(item)
+
+    def pop(self, seq, index=-1):
+        ''' Remove and return an item of a list
+
+        Returns:
+            (object): The item
+        '''
+        if index < 0:
+            index += len(seq)
+        item = seq.pop(index)
+        if self.enabled:
+            self._log.append((self._INSERT, seq, index, item))
+        return item
+
+    def undo(self):
+        ''' Revert the mutations since the last checkpoint
+
+        Returns:
+            (bool): True if a step is undone, False if there is no step recorded
+        '''
+        if not self._checkpoints:
+            return False
+        checkpoint = self._checkpoints.pop()
+        log = self._log
+        while len(log) > checkpoint:
+            op, target, key, value = log.pop()
+            if op == self._SETATTR:
+                setattr(target, key, value)
+            elif op == self._SETITEM:
+                target[key] = value
+            elif op == self._POP:
+                target.pop()
+            else:
+                target.insert(key, value)
+        return True
+
+
 class Game(object):
     ''' Game class. This class will interact with outer environment.
     '''
@@ -161,8 +266,17 @@ class Game(object):
 
     def step_back(self):
         ''' Takes one step backward and restore to the last state
+
+        The games that record their steps in a `Journal` as `self.history`
+        undo the last step with it.
+
+        Returns:
+            (bool): True if the game steps back successfully
         '''
-        raise NotImplementedError
+        history = getattr(self, 'history', None)
+        if not isinstance(history, Journal):
+            raise NotImplementedError
+        return history.undo()
 
     def get_player_num(self):
         ''' Retrun the number of players in the game
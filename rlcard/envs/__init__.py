@@ -2,6 +2,7 @@
 '''
 from rlcard.envs.env import Env
 from rlcard.envs.vec_env import VecEnv
+from rlcard.envs.shm_vec_env import ShmVecEnv
 from rlcard.envs.registration import register, make
 
 register(
@@ -59,7 +59,8 @@ class BlackjackEnv(Env):
 
         my_score, _ = get_scores_and_A(my_cards)
         dealer_score, _ = get_scores_and_A(dealer_cards)
-        obs = np.array([my_score, dealer_score])
+        obs = self._new_obs((2,), zero=False)
+        obs[:] = [my_score, dealer_score]
 
         legal_actions = [i for i in range(len(self.actions))]
         extracted_state = {'obs': obs, 'legal_actions': legal_actions}
@@ -1,4 +1,7 @@
+import numpy as np
+
 from rlcard.utils import *
+from rlcard.utils.profiler import Profiler
 
 class Env(object):
     '''
@@ -17,6 +20,9 @@ class Env(object):
                 'env_num' (int) - If env_num>1, the environment wil be run
                   with multiple processes. Note the implementation is
                   in `vec_env.py`.
+                'shared_memory' (boolean) - If env_num>1, pass the states
+                  from the processes through shared memory instead of pipes.
+                  Note the implementation is in `shm_vec_env.py`.
                 'allow_step_back' (boolean) - True if allowing
                  step_back.
                 'allow_raw_data' (boolean) - True if allow
@@ -27,6 +33,19 @@ class Env(object):
                 'active_player' (int) - If 'singe_agent_mode' is True,
                  'active_player' specifies the player that does not use
                   pretrained models.
+                'obs_dtype' (numpy.dtype) - The dtype of state['obs'], e.g.,
+                 np.uint8 or bool for the card games. Each environment keeps
+                 its own default dtype if None.
+                'obs_buffers' (numpy.array) - An optional ring of preallocated
+                 observations with shape [size] + state_shape. The observations
+                 are written into the next array of the ring in turn instead
+                 of being allocated, so the caller of `step` should copy an
+                 observation before it is overwritten after `size` more
+                 states. `run` copies the observations of the trajectories.
+                 The dtype of the ring is the dtype of the observations.
+                'profile' (boolean) - True if recording the wall time and the
+                 number of calls of the phases of the games and the agents,
+                 see `get_profile`. Nothing is recorded if False.
                 There can be some game specific configurations, e.g., the
                 number of players in the game. These fields should start with
                 'game_', e.g., 'game_player_num' which specify the number of
@@ -41,6 +60,14 @@ class Env(object):
         self.record_action = config['record_action']
         if self.record_action:
             self.action_recorder = []
+        self.obs_dtype = config.get('obs_dtype')
+        self.obs_buffers = config.get('obs_buffers')
+        self._obs_buffer_index = 0
+        if self.obs_buffers is not None:
+            if self.obs_dtype is not None and np.dtype(self.obs_dtype) != self.obs_buffers.dtype:
+                raise ValueError('The dtype of obs_buffers {} is not obs_dtype {}'.format(
+                    self.obs_buffers.dtype, np.dtype(self.obs_dtype)))
+            self.obs_dtype = self.obs_buffers.dtype
 
         # Game specific configurations
         # Currently only support blackjack、limit-holdem、no-limit-holdem
@@ -76,6 +103,12 @@ class Env(object):
         # Set random seed, default is None
         self._seed(config['seed'])
 
+        # Time the phases of the game if enabled
+        self.profiler = None
+        if config.get('profile'):
+            self.profiler = Profiler()
+            self.profiler.attach_env(self)
+
 
     def reset(self):
         '''
@@ -164,6 +197,19 @@ class Env(object):
             if agent.use_raw:
                 self.allow_raw_data = True
                 break
+        if self.profiler is not None:
+            for agent in self.agents:
+                self.profiler.attach_agent(agent)
+
+    def get_profile(self):
+        '''
+        Get the wall time and the number of calls of the phases of the games
+        and the agents, if 'profile' is enabled in the config.
+
+        Returns:
+            (Profiler): The profiler, None if not enabled
+        '''
+        return self.profiler
 
     def run(self, is_training=False):
         '''
@@ -188,7 +234,7 @@ class Env(object):
         state, player_id = self.reset()
 
         # Loop to play the game
-        trajectories[player_id].append(state)
+        trajectories[player_id].append(self._keep_state(state))
         while not self.is_over():
             # Agent plays
             if not is_training:
@@ -209,12 +255,12 @@ class Env(object):
 
             # Save state.
             if not self.game.is_over():
-                trajectories[player_id].append(state)
+                trajectories[player_id].append(self._keep_state(state))
 
         # Add a final state to all the players
         for player_id in range(self.player_num):
             state = self.get_state(player_id)
-            trajectories[player_id].append(state)
+            trajectories[player_id].append(self._keep_state(state))
 
         # Payoffs
         payoffs = self.get_payoffs()
@@ -299,6 +345,49 @@ class Env(object):
         '''
         raise NotImplementedError
 
+    def _new_obs(self, shape, dtype=int, zero=True):
+        ''' Get the array to write the observation of a new state into. It is
+            the next array of the 'obs_buffers' ring if provided, otherwise a
+            newly allocated array.
+
+        Args:
+            shape (tuple): The shape of the observation
+            dtype (numpy.dtype): The default dtype of the environment, overridden by 'obs_dtype'
+            zero (boolean): Whether to fill the array with zeros
+
+        Returns:
+            (numpy.array): The observation array
+        '''
+        if self.obs_buffers is not None:
+            obs = self.obs_buffers[self._obs_buffer_index]
+            if obs.shape != tuple(shape):
+                raise ValueError('The shape of obs_buffers {} is not [size] + {}'.format(
+                    self.obs_buffers.shape, list(shape)))
+            self._obs_buffer_index = (self._obs_buffer_index + 1) % len(self.obs_buffers)
+            if zero:
+                obs.fill(0)
+            return obs
+        if self.obs_dtype is not None:
+            dtype = self.obs_dtype
+        return np.zeros(shape, dtype=dtype) if zero else np.empty(shape, dtype=dtype)
+
+    def _keep_state(self, state):
+        ''' Get a state that can be kept, e.g., in the trajectories. If the
+            observation is in the 'obs_buffers' ring, it is copied out of the
+            ring before later states overwrite it.
+
+        Args:
+            state (dict): The state
+
+        Returns:
+            (dict): The state, or a copy with a copied observation
+        '''
+        if self.obs_buffers is None:
+            return state
+        state = dict(state)
+        state['obs'] = state['obs'].copy()
+        return state
+
     def _extract_state(self, state):
         ''' Extract useful information from state for RL. Must be implemented in the child class.
 
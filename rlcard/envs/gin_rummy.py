@@ -38,7 +38,7 @@ class GinRummyEnv(Env):
                              unknown cards (likewise)  # is this needed ??? 200213
         '''
         if self.game.is_over():
-            obs = np.array([self._utils.encode_cards([]) for _ in range(5)])
+            obs = self._new_obs((5, 52))
             extracted_state = {'obs': obs, 'legal_actions': self._get_legal_actions()}
         else:
             discard_pile = self.game.round.dealer.discard_pile
@@ -55,7 +55,8 @@ class GinRummyEnv(Env):
             known_cards_rep = self._utils.encode_cards(known_cards)
             unknown_cards_rep = self._utils.encode_cards(unknown_cards)
             rep = [hand_rep, top_discard_rep, dead_cards_rep, known_cards_rep, unknown_cards_rep]
-            obs = np.array(rep)
+            obs = self._new_obs((5, 52), zero=False)
+            obs[:] = rep
             extracted_state = {'obs': obs, 'legal_actions': self._get_legal_actions()}
         return extracted_state
 
@@ -59,7 +59,7 @@ class LeducholdemEnv(Env):
 
         public_card = state['public_card']
         hand = state['hand']
-        obs = np.zeros(36)
+        obs = self._new_obs((36,), dtype=float)
         obs[self.card2index[hand]] = 1
         if public_card:
             obs[self.card2index[public_card]+3] = 1
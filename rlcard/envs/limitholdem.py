@@ -56,7 +56,7 @@ class LimitholdemEnv(Env):
         raise_nums = state['raise_nums']
         cards = public_cards + hand
         idx = [self.card2index[card] for card in cards]
-        obs = np.zeros(72)
+        obs = self._new_obs((72,), dtype=float)
         obs[idx] = 1
         for i, num in enumerate(raise_nums):
             obs[52 + i * 5 + num] = 1
@@ -35,11 +35,11 @@ class MahjongEnv(Env):
         piles_rep = []
         for p in players_pile.keys():
             piles_rep.append(encode_cards(pile2list(players_pile[p])))
-        piles_rep = np.array(piles_rep)
         table_rep = encode_cards(state['table'])
-        rep = [hand_rep, table_rep]
-        rep.extend(piles_rep)
-        obs = np.array(rep)
+        obs = self._new_obs(self.state_shape, zero=False)
+        obs[0] = hand_rep
+        obs[1] = table_rep
+        obs[2:] = piles_rep
 
         extracted_state = {'obs': obs, 'legal_actions': self._get_legal_actions()}
         if self.allow_raw_data:
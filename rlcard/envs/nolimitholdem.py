@@ -62,7 +62,7 @@ class NolimitholdemEnv(Env):
         all_chips = state['all_chips']
         cards = public_cards + hand
         idx = [self.card2index[card] for card in cards]
-        obs = np.zeros(54)
+        obs = self._new_obs((54,), dtype=float)
         obs[idx] = 1
         obs[52] = float(my_chips)
         obs[53] = float(max(all_chips))
@@ -1,5 +1,5 @@
 import importlib
-from rlcard.envs import VecEnv
+from rlcard.envs import VecEnv, ShmVecEnv
 
 # Default Config
 DEFAULT_CONFIG = {
@@ -10,6 +10,10 @@ DEFAULT_CONFIG = {
         'record_action' : False,
         'seed': None,
         'env_num': 1,
+        'shared_memory': False,
+        'obs_dtype': None,
+        'obs_buffers': None,
+        'profile': False,
         }
 
 class EnvSpec(object):
@@ -24,8 +28,20 @@ class EnvSpec(object):
             entry_point (string): A string the indicates the location of the environment class
         '''
         self.env_id = env_id
-        mod_name, class_name = entry_point.split(':')
-        self._entry_point = getattr(importlib.import_module(mod_name), class_name)
+        # The module is imported at the first `make`, so that importing
+        # rlcard does not load all the games
+        self._mod_name, self._class_name = entry_point.split(':')
+        self._entry_point = None
+
+    def load(self):
+        ''' Import the environment class
+
+        Returns:
+            (class): The environment class
+        '''
+        if self._entry_point is None:
+            self._entry_point = getattr(importlib.import_module(self._mod_name), self._class_name)
+        return self._entry_point
 
     def make(self, config=DEFAULT_CONFIG):
         ''' Instantiates an instance of the environment
@@ -34,7 +50,7 @@ class EnvSpec(object):
             env (Env): An instance of the environemnt
             config (dict): A dictionary of the environment settings
         '''
-        env = self._entry_point(config)
+        env = self.load()(config)
         return env
 
 class EnvRegistry(object):
@@ -98,5 +114,7 @@ def make(env_id, config={}):
         raise ValueError('Active player should be a non-negative integer')
     if _config['env_num'] == 1:
         return registry.make(env_id, _config)
+    elif _config['shared_memory']:
+        return ShmVecEnv(env_id, _config)
     else:
         return VecEnv(env_id, _config)
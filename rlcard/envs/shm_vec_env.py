@@ -0,0 +1,353 @@
+'''
+A vector of environments in worker processes that pass the states through shared memory
+Reference: https://github.com/openai/baselines/blob/master/baselines/common/vec_env/shmem_vec_env.py
+'''
+import multiprocessing as mp
+import numpy as np
+
+from rlcard.utils import reorganize
+from rlcard.utils.profiler import Profiler
+from rlcard.envs.vec_env import batch_actions, run_async, collect_profile, send_commands_to_all, send_command_to_all
+
+# The fields of the states that are kept in shared memory. The other
+# fields, if any, are sent through the pipes
+ARRAY_FIELDS = ('obs', 'legal_actions')
+
+class ShmVecEnv(object):
+    '''
+    The wrapper for a vector of environments, the same as `VecEnv`, where the
+    workers write the observations, the legal action masks, the current
+    players, the dones and the payoffs into shared memory. Only the actions
+    and small acknowledgements go through the pipes. The arrays of the
+    current states are contiguous over the environments:
+
+        obs (num, *state_shape): the observations
+        legal_masks (num, action_num): the legal actions as boolean masks
+        player_ids (num,): the current players
+        dones (num,): whether the games are over
+        payoffs (num, player_num): the payoffs of the finished games
+
+    The final states of all the players of the finished games are in
+    `final_obs` and `final_legal_masks`.
+    '''
+
+    def __init__(self, env_id, config):
+        ''' Initialize the ShmVecEnv class
+
+        Args:
+            env_id (string): The id of the environment, e.g., 'blackjack'
+            config (dict): The same as the config in Env
+        '''
+        # Available since Python 3.8
+        from multiprocessing import shared_memory
+
+        self.num = config['env_num']
+        ctx = mp.get_context('spawn')
+
+        # Get the number of players/actions/state_shape and the dtype of the
+        # observations with a temporary worker
+        remote, work_remote = ctx.Pipe()
+        p = ctx.Process(target=info_worker, args=(work_remote, env_id, config))
+        p.start()
+        self.player_num, self.action_num, self.state_shape, obs_dtype = remote.recv()
+        p.join()
+
+        # Allocate the shared arrays
+        shape = tuple(self.state_shape)
+        self._layout = {
+            'obs': ((self.num,) + shape, obs_dtype),
+            'legal_masks': ((self.num, self.action_num), np.bool_),
+            'player_ids': ((self.num,), np.int64),
+            'dones': ((self.num,), np.bool_),
+            'payoffs': ((self.num, self.player_num), np.float64),
+            'final_obs': ((self.num, self.player_num) + shape, obs_dtype),
+            'final_legal_masks': ((self.num, self.player_num, self.action_num), np.bool_),
+        }
+        self._shms = {}
+        for name, (array_shape, dtype) in self._layout.items():
+            size = max(int(np.prod(array_shape)) * np.dtype(dtype).itemsize, 1)
+            self._shms[name] = shared_memory.SharedMemory(create=True, size=size)
+            setattr(self, name, np.ndarray(array_shape, dtype=dtype, buffer=self._shms[name].buf))
+        shm_names = {name: shm.name for name, shm in self._shms.items()}
+
+        # For multiprocessing
+        self.remotes, self.work_remotes = zip(*[ctx.Pipe() for _ in range(self.num)])
+        self.ps = [ctx.Process(target=shm_worker, args=(work_remote, remote, env_id, config, i, shm_names, self._layout))
+                   for i, (work_remote, remote) in enumerate(zip(self.work_remotes, self.remotes))]
+        for p in self.ps:
+            p.daemon = True  # if the main process crashes, we should not cause things to hang
+            p.start()
+        for remote in self.work_remotes:
+            remote.close()
+        self.closed = False
+
+        # A counter for the timesteps
+        self.timestep = 0
+
+        # The phases of the games are timed in the workers, and those of the agents here
+        self.profiler = Profiler() if config.get('profile') else None
+
+        self._seed(config['seed'])
+
+    def set_agents(self, agents):
+        self.agents = agents
+        if self.profiler is not None:
+            for agent in self.agents:
+                self.profiler.attach_agent(agent)
+
+    def get_profile(self):
+        ''' Get the wall time and the number of calls of the phases of the
+            agents and of the games in the workers, if 'profile' is enabled
+
+        Returns:
+            (Profiler): A profiler with the records of all the processes,
+                None if not enabled
+        '''
+        return collect_profile(self.profiler, self.remotes)
+
+    def reset(self, envs=None):
+        ''' Reset the environments. The states are written to `obs`,
+            `legal_masks` and `player_ids`
+
+        Args:
+            envs (list): The ids of the environments, all if None
+
+        Returns:
+            (list): The fields of the states that are not in shared memory
+        '''
+        envs = range(self.num) if envs is None else envs
+        return send_command_to_all([self.remotes[i] for i in envs], ('reset', None))
+
+    def step(self, actions, envs=None, raw=None):
+        ''' Step the environments. The next states are written to `obs`,
+            `legal_masks`, `player_ids` and `dones`. If a game is over, the
+            final states of all the players are written to `final_obs` and
+            `final_legal_masks`, and the payoffs to `payoffs`
+
+        Args:
+            actions (list): The action of each environment
+            envs (list): The ids of the environments, all if None
+            raw (list): Whether each action is a raw action
+
+        Returns:
+            (list): The fields of the next states that are not in shared
+                memory. For the finished games, a list of those of the final
+                states of all the players
+        '''
+        envs = range(self.num) if envs is None else envs
+        raw = [False for _ in envs] if raw is None else raw
+        commands = [('raw_step' if is_raw else 'step', action) for action, is_raw in zip(actions, raw)]
+        return send_commands_to_all([self.remotes[i] for i in envs], commands)
+
+    def get_state(self, env, extra=None, player_id=None):
+        ''' Build the state dict of an environment from the shared arrays.
+            The observation is copied, as the arrays are reused
+
+        Args:
+            env (int): The id of the environment
+            extra (dict): The fields of the state that are not in shared memory
+            player_id (int): The player of a final state, the current state if None
+
+        Returns:
+            (dict): The state
+        '''
+        if player_id is None:
+            obs, mask = self.obs[env], self.legal_masks[env]
+        else:
+            obs, mask = self.final_obs[env, player_id], self.final_legal_masks[env, player_id]
+        state = {'obs': obs.copy(), 'legal_actions': np.flatnonzero(mask).tolist()}
+        if extra:
+            state.update(extra)
+        return state
+
+    def run(self, is_training=False):
+        ''' Run X complete games, where X is the number of environemnts.
+            The input/output are the same as `VecEnv.run`
+        '''
+        trajectories = [[[] for _ in range(self.player_num)] for _ in range(self.num)]
+        active = list(range(self.num))
+
+        # Reset
+        extras = self.reset()
+        states = [self.get_state(i, extras[i]) for i in active]
+        for i in active:
+            trajectories[i][self.player_ids[i]].append(states[i])
+
+        # Loop until all the environments are over
+        while len(active) > 0:
+            player_ids = self.player_ids[active].tolist()
+            agents = [self.agents[player_id] for player_id in player_ids]
+            # The agents that take arrays are fed the rows of the shared arrays
+            actions = batch_actions(agents, states, is_training, self.obs[active], self.legal_masks[active])
+            extras = self.step(actions, active, [agent.use_raw for agent in agents])
+            self.timestep += len(active)
+
+            # Save the actions and the next states
+            next_active, states = [], []
+            for k, i in enumerate(active):
+                trajectories[i][player_ids[k]].append(actions[k])
+                if self.dones[i]:
+                    # Add a final state to all the players
+                    for j in range(self.player_num):
+                        trajectories[i][j].append(self.get_state(i, extras[k][j], j))
+                else:
+                    state = self.get_state(i, extras[k])
+                    trajectories[i][self.player_ids[i]].append(state)
+                    next_active.append(i)
+                    states.append(state)
+            active = next_active
+
+        # Payoffs
+        payoffs = [self.payoffs[i].copy() for i in range(self.num)]
+        for i in range(self.num):
+            trajectories[i] = reorganize(trajectories[i], payoffs[i])
+
+        _trajectories = [[] for _ in range(self.player_num)]
+        for trs in trajectories:
+            for i in range(self.player_num):
+                _trajectories[i].extend(trs[i])
+        return _trajectories, payoffs
+
+    def run_async(self, num_games=None, is_training=False):
+        ''' Run games with the environments always busy, the same as `VecEnv.run_async`
+        '''
+        return run_async(self, num_games, is_training)
+
+    def _async_reset(self, envs=None):
+        ''' Reset the environments
+
+        Args:
+            envs (list): The ids of the environments, all if None
+
+        Returns:
+            (list): The states
+            (list): The current players
+        '''
+        envs = range(self.num) if envs is None else envs
+        extras = self.reset(envs)
+        return [self.get_state(i, extra) for i, extra in zip(envs, extras)], self.player_ids[list(envs)].tolist()
+
+    def _async_step(self, actions, envs, raw, reset=True):
+        ''' Step the environments, which are reset if the games are over, the
+            same as `VecEnv._async_step`
+        '''
+        commands = [('auto_reset_step', (action, is_raw, reset)) for action, is_raw in zip(actions, raw)]
+        results = []
+        for i, extras in zip(envs, send_commands_to_all([self.remotes[i] for i in envs], commands)):
+            if self.dones[i]:
+                final_extras, extras = extras
+                final_states = [self.get_state(i, final_extras[j], j) for j in range(self.player_num)]
+                if not reset:
+                    results.append((None, None, True, final_states, self.payoffs[i].copy()))
+                    continue
+                results.append((self.get_state(i, extras), int(self.player_ids[i]), True, final_states, self.payoffs[i].copy()))
+            else:
+                results.append((self.get_state(i, extras), int(self.player_ids[i]), False, None, None))
+        return results
+
+    def close(self):
+        ''' Stop the workers and free the shared memory
+        '''
+        if self.closed:
+            return
+        self.closed = True
+        for remote in self.remotes:
+            remote.send(('close', None))
+        for p in self.ps:
+            p.join()
+        for name, shm in self._shms.items():
+            # Drop the views before the buffers are released
+            setattr(self, name, None)
+            shm.close()
+            shm.unlink()
+
+    def __del__(self):
+        if not getattr(self, 'closed', True):
+            self.close()
+
+    def _seed(self, seed=None):
+        seeds = [None for _ in range(self.num)]
+        if seed is not None:
+            commands = [('seed', seed+i*1000) for i in range(self.num)]
+            seeds = send_commands_to_all(self.remotes, commands)
+        return seeds
+
+def info_worker(remote, env_id, config):
+    from rlcard.envs.registration import registry
+    env = registry.make(env_id, config)
+    state, _ = env.reset()
+    remote.send((env.player_num, env.action_num, env.state_shape, np.asarray(state['obs']).dtype))
+    remote.close()
+
+def shm_worker(remote, parent_remote, env_id, config, index, shm_names, layout):
+    from multiprocessing import shared_memory
+    from rlcard.envs.registration import registry
+
+    shms = {name: shared_memory.SharedMemory(name=shm_name) for name, shm_name in shm_names.items()}
+    arrays = {name: np.ndarray(layout[name][0], dtype=layout[name][1], buffer=shms[name].buf)
+              for name in shm_names}
+    obs, legal_masks = arrays['obs'][index], arrays['legal_masks'][index]
+
+    def write_state(state, obs, legal_mask):
+        ''' Write the arrays of the state and return the other fields
+        '''
+        obs[...] = state['obs']
+        legal_mask[...] = False
+        legal_mask[state['legal_actions']] = True
+        return {key: value for key, value in state.items() if key not in ARRAY_FIELDS}
+
+    def step_env(env, action, use_raw):
+        state, player_id = env.step(action, use_raw)
+        done = env.is_over()
+        arrays['player_ids'][index] = player_id
+        arrays['dones'][index] = done
+        if not done:
+            return write_state(state, obs, legal_masks)
+        # Write the final states of all the players and the payoffs
+        extras = [write_state(env.get_state(j), arrays['final_obs'][index, j], arrays['final_legal_masks'][index, j])
+                  for j in range(env.player_num)]
+        arrays['payoffs'][index] = env.get_payoffs()
+        return extras
+
+    env = registry.make(env_id, config)
+    parent_remote.close()
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == 'reset':
+                state, player_id = env.reset()
+                arrays['player_ids'][index] = player_id
+                arrays['dones'][index] = False
+                remote.send(write_state(state, obs, legal_masks))
+            elif cmd == 'raw_step':
+                remote.send(step_env(env, data, True))
+            elif cmd == 'step':
+                remote.send(step_env(env, data, False))
+            elif cmd == 'auto_reset_step':
+                action, use_raw, reset = data
+                extras = step_env(env, action, use_raw)
+                if arrays['dones'][index]:
+                    # The final states stay in `final_obs` and `final_legal_masks`
+                    next_extras = None
+                    if reset:
+                        state, player_id = env.reset()
+                        arrays['player_ids'][index] = player_id
+                        next_extras = write_state(state, obs, legal_masks)
+                    extras = (extras, next_extras)
+                remote.send(extras)
+            elif cmd == 'profile':
+                profiler = env.get_profile()
+                remote.send(({}, {}) if profiler is None else (profiler.times, profiler.counts))
+            elif cmd == 'seed':
+                remote.send(env._seed(data))
+            elif cmd == 'close':
+                remote.close()
+                break
+            else:
+                raise NotImplementedError
+    except KeyboardInterrupt:
+        print('ShmVecEnv worker: got KeyboardInterrupt')
+    finally:
+        del env, obs, legal_masks, arrays
+        for shm in shms.values():
+            shm.close()
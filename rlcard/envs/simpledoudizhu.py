@@ -1,6 +1,7 @@
 import numpy as np
 
 from rlcard.envs import Env
+from rlcard.utils import encode_counts
 
 class SimpleDoudizhuEnv(Env):
     ''' SimpleDoudizhu Environment
@@ -8,11 +9,12 @@ class SimpleDoudizhuEnv(Env):
 
     def __init__(self, config):
         from rlcard.games.simpledoudizhu import Game
-        from rlcard.games.doudizhu.utils import encode_cards
+        from rlcard.games.doudizhu.utils import encode_cards, get_card_counts
         from rlcard.games.doudizhu.utils import cards2str
         from rlcard.games.doudizhu.utils import SPECIFIC_MAP, CARD_RANK_STR
         from rlcard.games.simpledoudizhu.utils import ACTION_LIST, ACTION_SPACE
         self._encode_cards = encode_cards
+        self._get_card_counts = get_card_counts
         self._cards2str = cards2str
         self._SPECIFIC_MAP = SPECIFIC_MAP
         self._CARD_RANK_STR = CARD_RANK_STR
@@ -37,16 +39,14 @@ class SimpleDoudizhuEnv(Env):
                              the recent three actions
                              the union of all played cards
         '''
-        obs = np.zeros((6, 5, 15), dtype=int)
-        for index in range(6):
-            obs[index][0] = np.ones(15, dtype=int)
-        self._encode_cards(obs[0], state['current_hand'])
-        self._encode_cards(obs[1], state['others_hand'])
+        obs = self._new_obs((6, 5, 15), zero=False)
+        recent_actions = [None, None, None]
         for i, action in enumerate(state['trace'][-3:]):
             if action[1] != 'pass':
-                self._encode_cards(obs[4-i], action[1])
-        if state['played_cards'] is not None:
-            self._encode_cards(obs[5], state['played_cards'])
+                recent_actions[2-i] = action[1]
+        counts = self._get_card_counts([state['current_hand'], state['others_hand']]
+                                       + recent_actions + [state['played_cards']])
+        encode_counts(counts, 5, out=obs)
 
         extracted_state = {'obs': obs, 'legal_actions': self._get_legal_actions()}
         if self.allow_raw_data:
@@ -2,10 +2,11 @@ import numpy as np
 import functools
 
 from rlcard.envs import Env
-from rlcard.utils import reorganize
+from rlcard.envs.vec_env import batch_actions
+from rlcard.utils import reorganize, seeding, encode_counts
 from rlcard.games.tractor.utils import reorganize_with_payoff_trace
-from rlcard.games.tractor import Game
-from rlcard.games.tractor.utils import encode_cards, ACTION_LIST, ACTION_SPACE, NUM_DICT
+from rlcard.games.tractor import Game, VecGame
+from rlcard.games.tractor.utils import get_card_counts, ACTION_LIST, NUM_DICT
 
 
 class TractorEnv(Env):
@@ -48,7 +49,7 @@ class TractorEnv(Env):
         r = 0
 
         # Loop to play the game
-        trajectories[player_id].append(state)
+        trajectories[player_id].append(self._keep_state(state))
         while not self.is_over():
             # Agent plays
             if not is_training:
@@ -75,12 +76,12 @@ class TractorEnv(Env):
             player_id = next_player_id
             # Save state.
             if not self.game.is_over():
-                trajectories[player_id].append(state)
+                trajectories[player_id].append(self._keep_state(state))
 
         # Add a final state to all the players
         for player_id in range(self.player_num):
             state = self.get_state(player_id)
-            trajectories[player_id].append(state)
+            trajectories[player_id].append(self._keep_state(state))
 
         # Payoffs
         # Get payoffs after each round
@@ -106,27 +107,19 @@ class TractorEnv(Env):
                     # up-player possible hand
                     # down-player possible hand
         '''
-        obs = np.zeros((9, 3, 72), dtype=int)
-        
-        # for index in range(5):
-        for index in range(8):
-            obs[index][0] = np.ones(72, dtype=int)
-        encode_cards(obs[0], state['current_hand'])
-        
-        # "guess" play - real scenario
-        encode_cards(obs[1], state['guessed_others_hand'][0])
-        encode_cards(obs[2], state['guessed_others_hand'][1])
-        encode_cards(obs[3], state['guessed_others_hand'][2])
-
-        # separatedly provide current round cards from each player
-        for i in range(3):
-            if state['offseted_current_round'][i] != None:
-                encode_cards(obs[i+4], state['offseted_current_round'][i])
+        obs = self._new_obs((9, 3, 72), zero=False)
 
-        # remaining cards, possible banker cards
-        encode_cards(obs[7], state['remaining_cards'])
+        # current hand, "guess" play - real scenario, separatedly provide
+        # current round cards from each player and remaining cards, possible banker cards
+        # The guessed hands are kept as card counts by the round
+        counts = np.empty((8, 72), dtype=np.uint8)
+        counts[[0, 4, 5, 6]] = get_card_counts([state['current_hand']] + state['offseted_current_round'])
+        counts[1:4] = state['guessed_others_counts']
+        counts[7] = state['remaining_counts']
+        encode_counts(counts, 3, out=obs[:8])
 
         # other features
+        obs[8] = 0
         obs[8][0][NUM_DICT[self.game.round.trump[0]]] = 1
 
         extracted_state = {'obs': obs, 'legal_actions': self._get_legal_actions(), 'trump': self.game.round.trump}
@@ -160,14 +153,18 @@ class TractorEnv(Env):
         ''' Decode Action id to the action in the game.
 
         Args:
-            action_id (int): The id of the action
+            action_id (int or TractorFactoredAction): The id of the action, or
+                a factored action of a lead that is not in `ACTION_SPACE`,
+                e.g., a throw
 
         Returns:
-            (string): The action that will be passed to the game engine.
+            (int or TractorFactoredAction): The action that will be passed to
+                the game engine. The game works on action ids and factored
+                actions directly.
 
         Note: Must be implemented in the child class.
         '''
-        return ACTION_LIST[action_id].split(',')
+        return action_id
 
     def _get_legal_actions(self):
         ''' Get all legal actions for current state.
@@ -177,13 +174,10 @@ class TractorEnv(Env):
 
         Note: Must be implemented in the child class.
         '''
-        legal_action_id = []
-        legal_actions = self.game.state['actions']
-        if legal_actions:
-            for action in legal_actions:
-                action_str = ','.join(action)
-                legal_action_id.append(ACTION_SPACE[action_str])
-        return legal_action_id
+        action_mask = self.game.state['action_mask']
+        if action_mask is None:
+            return []
+        return np.flatnonzero(action_mask).tolist()
 
     def get_perfect_information(self):
         ''' Get the perfect information of the current state
@@ -201,9 +195,104 @@ class TractorEnv(Env):
         state['legal_actions'] = self.game.state['actions']
         return state
 
-    def reset_predefine_state(self, predefined_hands):
+    def reset_predefine_state(self, predefined_hands, predefined_trump=None):
         '''
-        Reset environment in with pre-defined player hands
+        Reset environment in with pre-defined player hands, and the trump if given
         '''
-        state, player_id = self.game.init_game(predefined_hands)
-        return self._extract_state(state)
\ No newline at end of file
+        state, player_id = self.game.init_game(predefined_hands, predefined_trump)
+        if self.record_action:
+            self.action_recorder = []
+        return self._extract_state(state)
+
+
+class TractorVecEnv(object):
+    ''' Run a batch of Tractor games in lockstep in a single process with
+        `TractorVecGame`. The interfaces of `run` are the same as `VecEnv`, and
+        the agents are queried with the batched `batch_step`/`batch_eval_step`
+        if they implement them.
+    '''
+
+    def __init__(self, config):
+        ''' Initialize the TractorVecEnv class
+
+        Args:
+            config (dict): The same as the config in Env. 'env_num' is the number of games,
+                and 'obs_dtype' is the dtype of the observations
+        '''
+        self.name = 'tractor'
+        self.num = config['env_num']
+        self.np_random, _ = seeding.np_random(config.get('seed'))
+        self.game = VecGame(self.num, self.np_random)
+        self.player_num = self.game.get_player_num()
+        self.action_num = self.game.get_action_num()
+        self.state_shape = [9, 3, 72]
+        self.obs_dtype = config.get('obs_dtype') or int
+
+        # A counter for the timesteps
+        self.timestep = 0
+
+    def set_agents(self, agents):
+        self.agents = agents
+
+    def run(self, is_training=False):
+        ''' Run X complete games, where X is the number of games.
+            The transitions for each player are stacked over the games
+        '''
+        trajectories = [[[] for _ in range(self.player_num)] for _ in range(self.num)]
+        self.game.init_game()
+
+        while not self.game.is_over().all():
+            games = np.flatnonzero(~self.game.is_over())
+            player_ids = self.game.current_player[games]
+            states = self._extract_states(games, player_ids, self.game.get_legal_actions(games))
+            for i, game_id in enumerate(games):
+                trajectories[game_id][player_ids[i]].append(states[i])
+
+            # Agent plays
+            actions = batch_actions([self.agents[player_id] for player_id in player_ids], states, is_training)
+            all_actions = np.zeros(self.num, dtype=int)
+            all_actions[games] = actions
+            for i, game_id in enumerate(games):
+                trajectories[game_id][player_ids[i]].append(actions[i])
+
+            # Environment steps
+            self.game.step(all_actions)
+            self.timestep += len(games)
+
+            # Add a final state to all the players of the finished games
+            finished = games[self.game.is_over()[games]]
+            for player_id in range(self.player_num if len(finished) > 0 else 0):
+                final_states = self._extract_states(finished, np.full(len(finished), player_id))
+                for i, game_id in enumerate(finished):
+                    trajectories[game_id][player_id].append(final_states[i])
+
+        payoffs = list(self.game.get_payoffs())
+        for i in range(self.num):
+            trajectories[i] = reorganize_with_payoff_trace(trajectories[i], self.game.get_score_trace(i), payoffs[i])
+
+        _trajectories = [[] for _ in range(self.player_num)]
+        for trs in trajectories:
+            for i in range(self.player_num):
+                _trajectories[i].extend(trs[i])
+        return _trajectories, payoffs
+
+    def _extract_states(self, games, player_ids, legal_actions=None):
+        ''' Build the state dicts of the players, the same as `TractorEnv._extract_state`
+
+        Args:
+            games (numpy.array): The ids of the games
+            player_ids (numpy.array): The id of the player in each game
+            legal_actions (numpy.array): The legal action masks, no legal actions if None
+
+        Returns:
+            (list): A list of state dicts
+        '''
+        obs = self.game.get_obs(games, player_ids, dtype=self.obs_dtype)
+        trumps = self.game.get_trumps(games)
+        states = []
+        for i in range(len(games)):
+            state = {'obs': obs[i], 'trump': trumps[i]}
+            state['legal_actions'] = [] if legal_actions is None else np.flatnonzero(legal_actions[i]).tolist()
+            states.append(state)
+        return states
+
@@ -5,6 +5,7 @@ Reference: https://github.com/openai/baselines/blob/master/baselines/common/vec_
 import multiprocessing as mp
 
 from rlcard.utils import reorganize
+from rlcard.utils.profiler import Profiler
 
 class VecEnv(object):
     '''
@@ -32,10 +33,14 @@ class VecEnv(object):
             p.start()
         for remote in self.work_remotes:
             remote.close()
+        self.closed = False
 
         # A counter for the timesteps
         self.timestep = 0
 
+        # The phases of the games are timed in the workers, and those of the agents here
+        self.profiler = Profiler() if config.get('profile') else None
+
         # Get the number of players/actions/state_shape in this game
         self.remotes[0].send(('info', None))
         self.player_num, self.action_num, self.state_shape = self.remotes[0].recv()
@@ -44,6 +49,19 @@ class VecEnv(object):
 
     def set_agents(self, agents):
         self.agents = agents
+        if self.profiler is not None:
+            for agent in self.agents:
+                self.profiler.attach_agent(agent)
+
+    def get_profile(self):
+        ''' Get the wall time and the number of calls of the phases of the
+            agents and of the games in the workers, if 'profile' is enabled
+
+        Returns:
+            (Profiler): A profiler with the records of all the processes,
+                None if not enabled
+        '''
+        return collect_profile(self.profiler, self.remotes)
 
     def run(self, is_training=False):
         ''' Run X complete games, where X is the number of environemnts.
@@ -67,18 +85,13 @@ class VecEnv(object):
 
         # Loop until all the environments are over
         while active_num > 0:
-            # Agent playes
-            # TODO: Currently we naively feed one obs to the agent. This can be improved via batch
+            # Agent playes. The pending states of all the environments are grouped
+            # by agent so that each agent is queried once per tick
+            actions = batch_actions([self.agents[player_id] for player_id in player_ids], states, is_training)
             commands = []
-            actions = []
             for i in range(active_num):
                 opt = 'raw_step' if self.agents[player_ids[i]].use_raw else 'step'
-                if not is_training:
-                    action, _ = self.agents[player_ids[i]].eval_step(states[i])
-                else:
-                    action = self.agents[player_ids[i]].step(states[i])
-                commands.append((opt, action))
-                actions.append(action)
+                commands.append((opt, actions[i]))
 
             # Environment steps
             next_states, next_player_ids, dones = [], [], []
@@ -133,6 +146,63 @@ class VecEnv(object):
                 trajectories[i].extend(trs[i])
         return trajectories, payoffs
 
+    def run_async(self, num_games=None, is_training=False):
+        ''' Run games with the environments always busy. Each environment is
+            reset as soon as its game is over, and the trajectories of each
+            game are yielded when it finishes, instead of after the slowest game
+
+        Args:
+            num_games (int): The number of games, endless if None
+            is_training (boolean): True if for training purpose
+
+        Returns:
+            (generator): (trajectories, payoffs) of each game in the order
+                they finish, as those of `Env.run`
+        '''
+        return run_async(self, num_games, is_training)
+
+    def _async_reset(self, envs=None):
+        ''' Reset the environments
+
+        Args:
+            envs (list): The ids of the environments, all if None
+
+        Returns:
+            (list): The states
+            (list): The current players
+        '''
+        envs = range(self.num) if envs is None else envs
+        states, player_ids = zip(*send_command_to_all([self.remotes[i] for i in envs], ('reset', None)))
+        return list(states), list(player_ids)
+
+    def _async_step(self, actions, envs, raw, reset=True):
+        ''' Step the environments, which are reset if the games are over
+
+        Args:
+            actions (list): The action of each environment
+            envs (list): The ids of the environments
+            raw (list): Whether each action is a raw action
+            reset (boolean): Whether the environments of the finished games are reset
+
+        Returns:
+            (list): A list of (state, player_id, done, final_states, payoffs),
+                where the state is the initial state of the next game if done,
+                None if the environment is not reset
+        '''
+        commands = [('auto_reset_step', (action, is_raw, reset)) for action, is_raw in zip(actions, raw)]
+        return send_commands_to_all([self.remotes[i] for i in envs], commands)
+
+    def close(self):
+        ''' Stop the workers
+        '''
+        if self.closed:
+            return
+        self.closed = True
+        for remote in self.remotes:
+            remote.send(('close', None))
+        for p in self.ps:
+            p.join()
+
     def _seed(self, seed=None):
         seeds = [None for _ in range(self.num)]
         if seed is not None:
@@ -140,6 +210,127 @@ class VecEnv(object):
             seeds = send_commands_to_all(self.remotes, commands)
         return seeds
 
+def run_async(env, num_games=None, is_training=False):
+    ''' Run games on a vector of environments that reset themselves, see
+        `VecEnv.run_async`. The environment should implement `_async_reset`
+        and `_async_step`
+
+    Args:
+        env (VecEnv or ShmVecEnv): The vector of environments
+        num_games (int): The number of games, endless if None
+        is_training (boolean): True if for training purpose
+
+    Returns:
+        (generator): (trajectories, payoffs) of each game in the order they finish
+    '''
+    states, player_ids = env._async_reset()
+    active = list(range(env.num if num_games is None else min(env.num, num_games)))
+    started = len(active)
+    trajectories = [[[] for _ in range(env.player_num)] for _ in range(env.num)]
+    for i in active:
+        trajectories[i][player_ids[i]].append(states[i])
+
+    while len(active) > 0:
+        agents = [env.agents[player_ids[i]] for i in active]
+        actions = batch_actions(agents, [states[i] for i in active], is_training)
+        # The finished games are reset in the step only if all of them may be
+        # needed, so that no game is dealt without being played
+        reset = num_games is None or num_games - started >= len(active)
+        results = env._async_step(actions, active, [agent.use_raw for agent in agents], reset)
+        env.timestep += len(active)
+
+        next_active = []
+        for k, i in enumerate(active):
+            state, player_id, done, final_states, payoffs = results[k]
+            trajectories[i][player_ids[i]].append(actions[k])
+            if done:
+                # Add a final state to all the players
+                for j in range(env.player_num):
+                    trajectories[i][j].append(final_states[j])
+                yield reorganize(trajectories[i], payoffs), payoffs
+                trajectories[i] = [[] for _ in range(env.player_num)]
+                # Keep the environment if more games are needed
+                if num_games is not None and started >= num_games:
+                    continue
+                started += 1
+                if not reset:
+                    (state,), (player_id,) = env._async_reset([i])
+            states[i], player_ids[i] = state, player_id
+            trajectories[i][player_id].append(state)
+            next_active.append(i)
+        active = next_active
+
+def batch_actions(agents, states, is_training=False, obs=None, legal_masks=None):
+    ''' Query the agents for the actions of a batch of states. States that
+        are handled by the same agent object are fed to the agent in one call
+        of `batch_step`/`batch_eval_step` if the agent implements it, and one
+        by one otherwise. If the stacked observations and legal action masks
+        are given, the agents that implement `batch_step_arrays`/
+        `batch_eval_step_arrays` are fed the arrays instead of the states.
+
+    Args:
+        agents (list): The agent that acts on each state
+        states (list): A list of states
+        is_training (boolean): True if for training purpose
+        obs (numpy.array): The observations of the states stacked, optional
+        legal_masks (numpy.array): The legal actions of the states as boolean masks, optional
+
+    Returns:
+        (list): A list of actions, one for each state
+    '''
+    groups = {}
+    for i, agent in enumerate(agents):
+        groups.setdefault(id(agent), []).append(i)
+
+    actions = [None for _ in range(len(states))]
+    for indices in groups.values():
+        agent = agents[indices[0]]
+        method = 'batch_step_arrays' if is_training else 'batch_eval_step_arrays'
+        if obs is not None and hasattr(agent, method):
+            if len(indices) < len(agents):
+                _actions = getattr(agent, method)(obs[indices], legal_masks[indices])
+            else:
+                _actions = getattr(agent, method)(obs, legal_masks)
+            if not is_training:
+                _actions, _ = _actions
+            for i, action in zip(indices, _actions):
+                actions[i] = action
+            continue
+        _states = [states[i] for i in indices]
+        if not is_training:
+            if hasattr(agent, 'batch_eval_step'):
+                _actions, _ = agent.batch_eval_step(_states)
+            else:
+                _actions = [agent.eval_step(state)[0] for state in _states]
+        else:
+            if hasattr(agent, 'batch_step'):
+                _actions = agent.batch_step(_states)
+            else:
+                _actions = [agent.step(state) for state in _states]
+        for i, action in zip(indices, _actions):
+            actions[i] = action
+    return actions
+
+def collect_profile(profiler, remotes):
+    ''' Merge the records of the profiler of the main process with those of
+        the workers
+
+    Args:
+        profiler (Profiler): The profiler of the agents, None if not enabled
+        remotes (list): The pipes to the workers
+
+    Returns:
+        (Profiler): A profiler with the records of all the processes, None if
+            `profiler` is None
+    '''
+    if profiler is None:
+        return None
+    profile = Profiler()
+    profile.merge(profiler.times, profiler.counts)
+    for times, counts in send_command_to_all(remotes, ('profile', None)):
+        profile.merge(times, counts)
+    return profile
+
 def send_commands_to_all(remotes, commands):
     results = []
     for i, remote in enumerate(remotes):
@@ -169,10 +360,22 @@ def worker(remote, parent_remote, env_id, config):
             cmd, data = remote.recv()
             if cmd == 'reset':
                 remote.send(env.reset())
-            elif cmd == 'step_raw':
+            elif cmd == 'raw_step':
                 remote.send(step_env(env, data, True))
             elif cmd == 'step':
                 remote.send(step_env(env, data, False))
+            elif cmd == 'auto_reset_step':
+                action, use_raw, reset = data
+                state, player_id, done = step_env(env, action, use_raw)
+                final_states, payoffs = None, None
+                if done:
+                    final_states = [env.get_state(j) for j in range(env.player_num)]
+                    payoffs = env.get_payoffs()
+                    state, player_id = env.reset() if reset else (None, None)
+                remote.send((state, player_id, done, final_states, payoffs))
+            elif cmd == 'profile':
+                profiler = env.get_profile()
+                remote.send(({}, {}) if profiler is None else (profiler.times, profiler.counts))
             elif cmd == 'seed':
                 remote.send(env._seed(data))
             elif cmd == 'get_state':
@@ -1,12 +1,17 @@
+from rlcard.core import Journal
 from rlcard.utils import init_standard_deck
 import numpy as np
 
 class BlackjackDealer(object):
 
-    def __init__(self, np_random):
+    def __init__(self, np_random, journal=None):
         ''' Initialize a Blackjack dealer class
+
+        Args:
+            journal (Journal): The journal of the game, no records if None
         '''
         self.np_random = np_random
+        self.journal = journal if journal is not None else Journal(enabled=False)
         self.deck = init_standard_deck()
         self.shuffle()
         self.hand = []
@@ -26,5 +31,5 @@ class BlackjackDealer(object):
         Args:
             player_id (int): the target player's id
         '''
-        card = self.deck.pop()
-        player.hand.append(card)
+        card = self.journal.pop(self.deck)
+        self.journal.append(player.hand, card)
@@ -1,11 +1,11 @@
-from copy import deepcopy
 import numpy as np
 
+from rlcard.core import Game, Journal
 from rlcard.games.blackjack import Dealer
 from rlcard.games.blackjack import Player
 from rlcard.games.blackjack import Judger
 
-class BlackjackGame(object):
+class BlackjackGame(Game):
 
     def __init__(self, allow_step_back=False):
         ''' Initialize the class Blackjack Game
@@ -25,7 +25,10 @@ class BlackjackGame(object):
             state (dict): the first state of the game
             player_id (int): current player's id
         '''
-        self.dealer = Dealer(self.np_random)
+        # Save the hisory for stepping back to the last state.
+        self.history = Journal(self.allow_step_back)
+
+        self.dealer = Dealer(self.np_random, journal=self.history)
 
         self.players = []
         for i in range(self.player_num):
@@ -47,9 +50,11 @@ class BlackjackGame(object):
         for i in range(self.player_num):
             self.winner['player' + str(i)] = 0
 
-        self.history = []
         self.game_pointer = 0
 
+        # The initialization is not undone
+        self.history.clear()
+
         return self.get_state(self.game_pointer), self.game_pointer
 
     def step(self, action):
@@ -62,43 +67,39 @@ class BlackjackGame(object):
             dict: next player's state
             int: next plater's id
         '''
-        if self.allow_step_back:
-            p = deepcopy(self.players[self.game_pointer])
-            d = deepcopy(self.dealer)
-            w = deepcopy(self.winner)
-            self.history.append((d, p, w))
+        # First record the mutations of the step
+        history = self.history
+        history.checkpoint()
 
         next_state = {}
         # Play hit
         if action != "stand":
             self.dealer.deal_card(self.players[self.game_pointer])
-            self.players[self.game_pointer].status, self.players[self.game_pointer].score = self.judger.judge_round(
-                self.players[self.game_pointer])
+            self._judge_round(self.players[self.game_pointer])
             if self.players[self.game_pointer].status == 'bust':
                 # game over, set up the winner, print out dealer's hand # If bust, pass the game pointer
                 if self.game_pointer >= self.player_num - 1:
                     while self.judger.judge_score(self.dealer.hand) < 17:
                         self.dealer.deal_card(self.dealer)
-                    self.dealer.status, self.dealer.score = self.judger.judge_round(self.dealer)
+                    self._judge_round(self.dealer)
                     for i in range(self.player_num):
                         self.judger.judge_game(self, i) 
-                    self.game_pointer = 0
+                    history.setattr(self, 'game_pointer', 0)
                 else:
-                    self.game_pointer += 1
+                    history.setattr(self, 'game_pointer', self.game_pointer + 1)
 
                 
         elif action == "stand": # If stand, first try to pass the pointer, if it's the last player, dealer deal for himself, then judge game for everyone using a loop
-            self.players[self.game_pointer].status, self.players[self.game_pointer].score = self.judger.judge_round(
-                self.players[self.game_pointer])
+            self._judge_round(self.players[self.game_pointer])
             if self.game_pointer >= self.player_num - 1:
                 while self.judger.judge_score(self.dealer.hand) < 17:
                     self.dealer.deal_card(self.dealer)
-                self.dealer.status, self.dealer.score = self.judger.judge_round(self.dealer)
+                self._judge_round(self.dealer)
                 for i in range(self.player_num):
                     self.judger.judge_game(self, i) 
-                self.game_pointer = 0
+                history.setattr(self, 'game_pointer', 0)
             else:
-                self.game_pointer += 1
+                history.setattr(self, 'game_pointer', self.game_pointer + 1)
 
 
             
@@ -121,17 +122,15 @@ class BlackjackGame(object):
 
         return next_state, self.game_pointer
 
-    def step_back(self):
-        ''' Return to the previous state of the game
+    def _judge_round(self, player):
+        ''' Update the status and the score of a player, or of the dealer
 
-        Returns:
-            Status (bool): check if the step back is success or not
+        Args:
+            player (object): The player or the dealer
         '''
-        #while len(self.history) > 0:
-        if len(self.history) > 0:
-            self.dealer, self.players[self.game_pointer], self.winner = self.history.pop()
-            return True
-        return False
+        status, score = self.judger.judge_round(player)
+        self.history.setattr(player, 'status', status)
+        self.history.setattr(player, 'score', score)
 
     def get_player_num(self):
         ''' Return the number of players in blackjack
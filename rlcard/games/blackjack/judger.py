@@ -40,16 +40,18 @@ class BlackjackJudger(object):
                 '''
 
         if game.players[game_pointer].status == 'bust':
-            game.winner['player' + str(game_pointer)] = -1
+            winner = -1
         elif game.dealer.status == 'bust':
-            game.winner['player' + str(game_pointer)] = 2
+            winner = 2
         else:
             if game.players[game_pointer].score > game.dealer.score:
-                game.winner['player' + str(game_pointer)] = 2
+                winner = 2
             elif game.players[game_pointer].score < game.dealer.score:
-                game.winner['player' + str(game_pointer)] = -1
+                winner = -1
             else:
-                game.winner['player' + str(game_pointer)] = 1
+                winner = 1
+        # Recorded in the journal of the game for step_back
+        game.history.setitem(game.winner, 'player' + str(game_pointer), winner)
 
     def judge_score(self, cards):
         ''' Judge the score of a given cards set
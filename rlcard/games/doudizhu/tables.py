@@ -0,0 +1,326 @@
+''' Precompiled Doudizhu card type tables
+
+The tables in `jsondata` (card_type.json, specific_map.json and
+type_card.json) are compiled once into NumPy arrays in `bindata` with
+
+    $ python -m rlcard.games.doudizhu.tables
+
+The arrays are loaded memory mapped, so the processes using Doudizhu share
+the same pages instead of each parsing the JSON into its own dicts.
+
+A hand is coded as the integer sum(count[rank] * 5 ** rank) over
+`CARD_RANK_STR`, and 'pass' is the empty hand 0. The hands are sorted by
+their codes and looked up with a binary search. The arrays are:
+
+    hand_keys (N,): the codes of the hands
+    hand_strs (N,): the hands as bytes, e.g., b'33344'
+    hand_counts (N, 15): the number of cards of each rank in the hands
+    type_offsets (N+1,): the card types of hand i are type_ids and
+        type_weights[type_offsets[i]:type_offsets[i+1]], as in card_type.json
+    specific_offsets (N+1,): the abstract actions of hand i are
+        specific_actions[specific_offsets[i]:specific_offsets[i+1]], as in specific_map.json
+    type_names (T,): the names of the card types
+    group_offsets (T+1,): the hands of card type t are grouped by weight into
+        groups group_offsets[t] to group_offsets[t+1], as in type_card.json
+    group_weights (G,): the weight of each group
+    group_hand_offsets (G+1,): the hands of group g are
+        group_hands[group_hand_offsets[g]:group_hand_offsets[g+1]]
+'''
+
+import os
+import json
+import functools
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+import numpy as np
+
+import rlcard
+
+ROOT_PATH = rlcard.__path__[0]
+JSON_PATH = os.path.join(ROOT_PATH, 'games/doudizhu/jsondata')
+TABLE_PATH = os.path.join(ROOT_PATH, 'games/doudizhu/bindata')
+
+CARD_RANK_STR = '3456789TJQKA2BR'
+RANK_KEY = {rank: 5 ** i for i, rank in enumerate(CARD_RANK_STR)}
+
+# The number of recent lookups cached in each process
+CACHE_SIZE = 4096
+
+TABLE_NAMES = ['hand_keys', 'hand_strs', 'hand_counts', 'type_offsets', 'type_ids',
+               'type_weights', 'specific_offsets', 'specific_actions', 'type_names',
+               'group_offsets', 'group_weights', 'group_hand_offsets', 'group_hands']
+
+with open(os.path.join(JSON_PATH, 'action_space.json'), 'r') as file:
+    ACTION_SPACE = json.load(file, object_pairs_hook=OrderedDict)
+ACTION_LIST = list(ACTION_SPACE.keys())
+
+
+def hand_key(cards):
+    ''' Get the code of a hand
+
+    Args:
+        cards (str): str of cards, or 'pass'
+
+    Returns:
+        (int): the code of the hand
+    '''
+    if cards == 'pass':
+        return 0
+    key = 0
+    for card in cards:
+        key += RANK_KEY[card]
+    return key
+
+def compile_tables(json_path=JSON_PATH):
+    ''' Compile the JSON tables into arrays
+
+    Args:
+        json_path (str): the directory of the JSON tables
+
+    Returns:
+        (dict): the arrays by name
+    '''
+    def load(name):
+        with open(os.path.join(json_path, name), 'r') as file:
+            return json.load(file, object_pairs_hook=OrderedDict)
+    card_type = load('card_type.json')
+    specific_map = load('specific_map.json')
+    type_card = load('type_card.json')
+    action_space = load('action_space.json')
+
+    hands = sorted(specific_map, key=hand_key)
+    if set(hands) != set(card_type) | {'pass'}:
+        raise ValueError('The hands of card_type.json and specific_map.json differ')
+    hand_index = {hand: i for i, hand in enumerate(hands)}
+    hand_counts = np.zeros((len(hands), len(CARD_RANK_STR)), dtype=np.uint8)
+    for i, hand in enumerate(hands[1:], 1):
+        for card in hand:
+            hand_counts[i, CARD_RANK_STR.index(card)] += 1
+        if ''.join(rank * count for rank, count in zip(CARD_RANK_STR, hand_counts[i])) != hand:
+            raise ValueError('The cards of {} are not sorted by rank'.format(hand))
+
+    type_names = list(type_card)
+    for types in card_type.values():
+        type_names.extend(name for name, _ in types if name not in type_names)
+    type_index = {name: i for i, name in enumerate(type_names)}
+
+    types = [card_type.get(hand, []) for hand in hands]
+    specifics = [specific_map[hand] for hand in hands]
+    groups = [(type_index[name], int(weight), cards)
+              for name, weights in type_card.items() for weight, cards in weights.items()]
+    return {
+        'hand_keys': np.array([hand_key(hand) for hand in hands], dtype=np.int64),
+        'hand_strs': np.array([hand.encode() for hand in hands]),
+        'hand_counts': hand_counts,
+        'type_offsets': np.cumsum([0] + [len(t) for t in types]).astype(np.int32),
+        'type_ids': np.array([type_index[name] for t in types for name, _ in t], dtype=np.uint8),
+        'type_weights': np.array([int(weight) for t in types for _, weight in t], dtype=np.int16),
+        'specific_offsets': np.cumsum([0] + [len(s) for s in specifics]).astype(np.int32),
+        'specific_actions': np.array([action_space[a] for s in specifics for a in s], dtype=np.int16),
+        'type_names': np.array(type_names),
+        'group_offsets': np.cumsum([0] + [len(type_card.get(name, ())) for name in type_names]).astype(np.int32),
+        'group_weights': np.array([weight for _, weight, _ in groups], dtype=np.int16),
+        'group_hand_offsets': np.cumsum([0] + [len(cards) for _, _, cards in groups]).astype(np.int32),
+        'group_hands': np.array([hand_index[hand] for _, _, cards in groups for hand in cards], dtype=np.int32),
+    }
+
+def save_tables(tables, table_path=TABLE_PATH):
+    ''' Save the compiled arrays, one .npy file for each
+
+    Args:
+        tables (dict): the arrays by name
+        table_path (str): the directory of the arrays
+    '''
+    os.makedirs(table_path, exist_ok=True)
+    for name in TABLE_NAMES:
+        np.save(os.path.join(table_path, name + '.npy'), tables[name])
+
+def load_tables(table_path=TABLE_PATH):
+    ''' Load the compiled arrays memory mapped. They are compiled from the
+        JSON tables in memory if they are not built
+
+    Args:
+        table_path (str): the directory of the arrays
+
+    Returns:
+        (DoudizhuTables): the tables
+    '''
+    try:
+        tables = {name: np.load(os.path.join(table_path, name + '.npy'), mmap_mode='r')
+                  for name in TABLE_NAMES}
+    except FileNotFoundError:
+        tables = compile_tables()
+    return DoudizhuTables(tables)
+
+
+class DoudizhuTables(object):
+    ''' Lookups over the compiled arrays
+    '''
+
+    def __init__(self, tables):
+        ''' Initialize
+
+        Args:
+            tables (dict): the arrays by name
+        '''
+        # Plain views of the memory maps, as indexing np.memmap is slow
+        for name in TABLE_NAMES:
+            setattr(self, name, np.asarray(tables[name]))
+        self.type_name_list = [str(name) for name in self.type_names]
+        self.type_name_index = {name: i for i, name in enumerate(self.type_name_list)}
+        # The groups are few, so they are kept as lists
+        self._group_offsets = self.group_offsets.tolist()
+        self._group_weights = self.group_weights.tolist()
+        self._group_hand_offsets = self.group_hand_offsets.tolist()
+        # A game only looks up a small part of the hands, so the recent ones are cached
+        self.find = functools.lru_cache(maxsize=CACHE_SIZE)(self.find)
+        self.hands_of_type = functools.lru_cache(maxsize=CACHE_SIZE)(self.hands_of_type)
+
+    def find(self, cards):
+        ''' Find the index of a hand
+
+        Args:
+            cards (str): str of cards sorted by rank, or 'pass'
+
+        Returns:
+            (int): the index of the hand, -1 if it is not a valid hand
+        '''
+        key = hand_key(cards)
+        index = int(np.searchsorted(self.hand_keys, key))
+        # The code only depends on the counts, so the order is checked with the str
+        if index < len(self.hand_keys) and self.hand_keys[index] == key \
+                and self.hand_strs[index] == cards.encode():
+            return index
+        return -1
+
+    def hand_str(self, index):
+        ''' Get the str of the hand at an index
+        '''
+        return self.hand_strs[index].decode()
+
+    def hands_of_type(self, card_type, min_weight=None):
+        ''' Get the hands of a card type, in the order of type_card.json
+
+        Args:
+            card_type (str): the name of the card type
+            min_weight (int): only the hands with a larger weight are kept if given
+
+        Returns:
+            (numpy.array): the indexes of the hands
+        '''
+        type_id = self.type_name_index[card_type]
+        hands = [self.group_hands[self._group_hand_offsets[g]:self._group_hand_offsets[g+1]]
+                 for g in range(self._group_offsets[type_id], self._group_offsets[type_id+1])
+                 if min_weight is None or self._group_weights[g] > min_weight]
+        return np.concatenate(hands) if hands else np.zeros(0, dtype=self.group_hands.dtype)
+
+
+class CardTypeMap(Mapping):
+    ''' The map of card_type.json, from a hand to its list of [type, weight]
+    '''
+
+    def __init__(self, tables):
+        self._tables = tables
+        self._get = functools.lru_cache(maxsize=CACHE_SIZE)(self._get)
+
+    def __getitem__(self, cards):
+        return self._get(cards)
+
+    def _get(self, cards):
+        index = self._tables.find(cards)
+        start, end = self._tables.type_offsets[index:index+2] if index > 0 else (0, 0)
+        if start == end:
+            raise KeyError(cards)
+        return [[self._tables.type_name_list[type_id], str(weight)] for type_id, weight
+                in zip(self._tables.type_ids[start:end].tolist(), self._tables.type_weights[start:end].tolist())]
+
+    def __contains__(self, cards):
+        index = self._tables.find(cards)
+        return index > 0 and self._tables.type_offsets[index] != self._tables.type_offsets[index+1]
+
+    def __iter__(self):
+        counts = np.diff(self._tables.type_offsets)
+        return (self._tables.hand_str(index) for index in np.flatnonzero(counts))
+
+    def __len__(self):
+        return int(np.count_nonzero(np.diff(self._tables.type_offsets)))
+
+
+class HandList(Sequence):
+    ''' The list of the hands that have a card type
+    '''
+
+    def __init__(self, tables):
+        self._tables = tables
+        self._indexes = np.flatnonzero(np.diff(tables.type_offsets))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._tables.hand_str(i) for i in self._indexes[index]]
+        return self._tables.hand_str(self._indexes[index])
+
+    def __contains__(self, cards):
+        return isinstance(cards, str) and cards in CardTypeMap(self._tables)
+
+    def __len__(self):
+        return len(self._indexes)
+
+
+class SpecificMap(Mapping):
+    ''' The map of specific_map.json, from a hand to its list of abstract actions
+    '''
+
+    def __init__(self, tables):
+        self._tables = tables
+        self._get = functools.lru_cache(maxsize=CACHE_SIZE)(self._get)
+
+    def __getitem__(self, cards):
+        return self._get(cards)
+
+    def _get(self, cards):
+        index = self._tables.find(cards)
+        if index < 0:
+            raise KeyError(cards)
+        start, end = self._tables.specific_offsets[index:index+2]
+        return [ACTION_LIST[action] for action in self._tables.specific_actions[start:end].tolist()]
+
+    def __contains__(self, cards):
+        return self._tables.find(cards) >= 0
+
+    def __iter__(self):
+        return (self._tables.hand_str(index) for index in range(len(self._tables.hand_keys)))
+
+    def __len__(self):
+        return len(self._tables.hand_keys)
+
+
+class TypeCardMap(Mapping):
+    ''' The map of type_card.json, from a card type to the map from weights
+        to the list of hands
+    '''
+
+    def __init__(self, tables):
+        self._tables = tables
+
+    def __getitem__(self, card_type):
+        if card_type not in self._tables.type_name_index:
+            raise KeyError(card_type)
+        tables = self._tables
+        type_id = tables.type_name_index[card_type]
+        weights = OrderedDict()
+        for group in range(tables.group_offsets[type_id], tables.group_offsets[type_id+1]):
+            start, end = tables.group_hand_offsets[group:group+2]
+            weights[str(tables.group_weights[group])] = [tables.hand_str(i) for i in tables.group_hands[start:end].tolist()]
+        return weights
+
+    def __iter__(self):
+        tables = self._tables
+        return (name for i, name in enumerate(tables.type_name_list)
+                if tables.group_offsets[i] != tables.group_offsets[i+1])
+
+    def __len__(self):
+        return int(np.count_nonzero(np.diff(self._tables.group_offsets)))
+
+
+if __name__ == '__main__':
+    save_tables(compile_tables())
@@ -1,34 +1,27 @@
 ''' Doudizhu utils
 '''
 
-import os
-import json
-from collections import OrderedDict
 import threading
 import collections
+from collections import OrderedDict
+import numpy as np
 
-import rlcard
+from rlcard.utils.utils import encode_counts
+from rlcard.games.doudizhu.tables import load_tables, CardTypeMap, HandList, SpecificMap, TypeCardMap
+# a map of abstract action to its index and a list of abstract action
+from rlcard.games.doudizhu.tables import ACTION_SPACE, ACTION_LIST
 
-# Read required docs
-ROOT_PATH = rlcard.__path__[0]
+# The precompiled card type tables, memory mapped
+TABLES = load_tables()
 
 # a map of action to abstract action
-with open(os.path.join(ROOT_PATH, 'games/doudizhu/jsondata/specific_map.json'), 'r') as file:
-    SPECIFIC_MAP = json.load(file, object_pairs_hook=OrderedDict)
-
-# a map of abstract action to its index and a list of abstract action
-with open(os.path.join(ROOT_PATH, 'games/doudizhu/jsondata/action_space.json'), 'r') as file:
-    ACTION_SPACE = json.load(file, object_pairs_hook=OrderedDict)
-ACTION_LIST = list(ACTION_SPACE.keys())
+SPECIFIC_MAP = SpecificMap(TABLES)
 
 # a map of card to its type. Also return both dict and list to accelerate
-with open(os.path.join(ROOT_PATH, 'games/doudizhu/jsondata/card_type.json'), 'r') as file:
-    data = json.load(file, object_pairs_hook=OrderedDict)
-    CARD_TYPE = (data, list(data), set(data))
+CARD_TYPE = (CardTypeMap(TABLES), HandList(TABLES), CardTypeMap(TABLES).keys())
 
 # a map of type to its cards
-with open(os.path.join(ROOT_PATH, 'games/doudizhu/jsondata/type_card.json'), 'r') as file:
-    TYPE_CARD = json.load(file, object_pairs_hook=OrderedDict)
+TYPE_CARD = TypeCardMap(TABLES)
 
 # rank list of solo character of cards
 CARD_RANK_STR = ['3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K',
@@ -214,34 +207,28 @@ def contains_cards(candidate, target):
         return False
     return True
 
+def get_card_counts(cards_list):
+    ''' Count the cards of each entry over `CARD_RANK_STR`
+
+    Args:
+        cards_list (list): list of str of cards, None is treated as no cards
+
+    Returns:
+        (numpy.array): A (len(cards_list), 15) array of card counts
+    '''
+    ranks = [CARD_RANK_STR_INDEX[card] + index * 15
+             for index, cards in enumerate(cards_list) if cards for card in cards]
+    return np.bincount(ranks, minlength=len(cards_list) * 15).reshape(len(cards_list), 15)
+
 def encode_cards(plane, cards):
     ''' Encode cards and represerve it into plane.
 
     Args:
+        plane (numpy.array): 5*15 array, plane[k][rank] is set to 1 if there are k cards of the rank
         cards (list or str): list or str of cards, every entry is a
     character of solo representation of card
     '''
-    if not cards:
-        return None
-    layer = 1
-    if len(cards) == 1:
-        rank = CARD_RANK_STR.index(cards[0])
-        plane[layer][rank] = 1
-        plane[0][rank] = 0
-    else:
-        for index, card in enumerate(cards):
-            if index == 0:
-                continue
-            if card == cards[index-1]:
-                layer += 1
-            else:
-                rank = CARD_RANK_STR.index(cards[index-1])
-                plane[layer][rank] = 1
-                layer = 1
-                plane[0][rank] = 0
-        rank = CARD_RANK_STR.index(cards[-1])
-        plane[layer][rank] = 1
-        plane[0][rank] = 0
+    encode_counts(get_card_counts([cards])[0], 5, out=plane)
 
 
 def get_gt_cards(player, greater_player):
@@ -272,15 +259,12 @@ def get_gt_cards(player, greater_player):
     type_dict['rocket'] = -1
     if 'bomb' not in type_dict:
         type_dict['bomb'] = -1
-    for card_type, weight in type_dict.items():
-        candidate = TYPE_CARD[card_type]
-        for can_weight, cards_list in candidate.items():
-            if int(can_weight) > int(weight):
-                for cards in cards_list:
-                    # TODO: improve efficiency
-                    if cards not in gt_cards and contains_cards(current_hand, cards):
-                        # if self.contains_cards(current_hand, cards):
-                        gt_cards.append(cards)
+
+    # The candidates of all the types in order, and those in the hand are kept once
+    candidates = np.concatenate([TABLES.hands_of_type(card_type, int(weight))
+                                 for card_type, weight in type_dict.items()])
+    candidates = candidates[(TABLES.hand_counts[candidates] <= get_card_counts([current_hand])[0]).all(axis=1)]
+    gt_cards.extend(cards.decode() for cards in OrderedDict.fromkeys(TABLES.hand_strs[candidates].tolist()))
     return gt_cards
 
 
@@ -1,11 +1,21 @@
+from rlcard.core import Journal
 from rlcard.utils.utils import init_standard_deck
 
 class LimitholdemDealer(object):
 
-    def __init__(self, np_random):
+    # The journal of the mutations for step_back
+    journal = Journal(enabled=False)
+
+    def __init__(self, np_random, journal=None):
         ''' Initialize a limitholdem dealer class
+
+        Args:
+            np_random (numpy.random.RandomState): The random state
+            journal (Journal): The journal of the game, no records if None
         '''
         self.np_random = np_random
+        if journal is not None:
+            self.journal = journal
         self.deck = init_standard_deck()
         self.shuffle()
         self.pot = 0
@@ -21,4 +31,4 @@ class LimitholdemDealer(object):
         Returns:
             (Card): The drawn card from the deck
         '''
-        return self.deck.pop()
+        return self.journal.pop(self.deck)
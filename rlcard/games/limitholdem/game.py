@@ -1,12 +1,12 @@
-from copy import deepcopy, copy
 import numpy as np
 
+from rlcard.core import Game, Journal
 from rlcard.games.limitholdem import Dealer
 from rlcard.games.limitholdem import Player, PlayerStatus
 from rlcard.games.limitholdem import Judger
 from rlcard.games.limitholdem import Round
 
-class LimitholdemGame(object):
+class LimitholdemGame(Game):
 
     def __init__(self, allow_step_back=False, num_players=2):
         ''' Initialize the class limitholdem Game
@@ -46,8 +46,11 @@ class LimitholdemGame(object):
                 (dict): The first state of the game
                 (int): Current player's id
         '''
+        # Save the hisory for stepping back to the last state.
+        self.history = Journal(self.allow_step_back)
+
         # Initilize a dealer that can deal cards
-        self.dealer = Dealer(self.np_random)
+        self.dealer = Dealer(self.np_random, journal=self.history)
 
         # Initilize two players to play the game
         self.players = [Player(i, self.np_random) for i in range(self.num_players)]
@@ -76,21 +79,22 @@ class LimitholdemGame(object):
         self.round = Round(raise_amount=self.raise_amount,
                            allowed_raise_num=self.allowed_raise_num,
                            num_players=self.num_players,
-                           np_random=self.np_random)
+                           np_random=self.np_random,
+                           journal=self.history)
 
         self.round.start_new_round(game_pointer=self.game_pointer, raised=[p.in_chips for p in self.players])
 
         # Count the round. There are 4 rounds in each game.
         self.round_counter = 0
 
-        # Save the hisory for stepping back to the last state.
-        self.history = []
-
-        state = self.get_state(self.game_pointer)
-
         # Save betting history
         self.history_raise_nums = [0 for _ in range(4)]
 
+        # The initialization is not undone
+        self.history.clear()
+
+        state = self.get_state(self.game_pointer)
+
         return state, self.game_pointer
 
     def step(self, action):
@@ -105,57 +109,39 @@ class LimitholdemGame(object):
                 (dict): next player's state
                 (int): next plater's id
         '''
-        if self.allow_step_back:
-            # First snapshot the current state
-            r = deepcopy(self.round)
-            b = self.game_pointer
-            r_c = self.round_counter
-            d = deepcopy(self.dealer)
-            p = deepcopy(self.public_cards)
-            ps = deepcopy(self.players)
-            rn = copy(self.history_raise_nums)
-            self.history.append((r, b, r_c, d, p, ps, rn))
+        # First record the mutations of the step
+        history = self.history
+        history.checkpoint()
 
         # Then we proceed to the next round
-        self.game_pointer = self.round.proceed_round(self.players, action)
+        history.setattr(self, 'game_pointer', self.round.proceed_round(self.players, action))
 
         # Save the current raise num to history
-        self.history_raise_nums[self.round_counter] = self.round.have_raised
+        history.setitem(self.history_raise_nums, self.round_counter, self.round.have_raised)
 
         # If a round is over, we deal more public cards
         if self.round.is_over():
             # For the first round, we deal 3 cards
             if self.round_counter == 0:
-                self.public_cards.append(self.dealer.deal_card())
-                self.public_cards.append(self.dealer.deal_card())
-                self.public_cards.append(self.dealer.deal_card())
+                history.append(self.public_cards, self.dealer.deal_card())
+                history.append(self.public_cards, self.dealer.deal_card())
+                history.append(self.public_cards, self.dealer.deal_card())
 
             # For the following rounds, we deal only 1 card
             elif self.round_counter <= 2:
-                self.public_cards.append(self.dealer.deal_card())
+                history.append(self.public_cards, self.dealer.deal_card())
 
             # Double the raise amount for the last two rounds
             if self.round_counter == 1:
-                self.round.raise_amount = 2 * self.raise_amount
+                history.setattr(self.round, 'raise_amount', 2 * self.raise_amount)
 
-            self.round_counter += 1
+            history.setattr(self, 'round_counter', self.round_counter + 1)
             self.round.start_new_round(self.game_pointer)
 
         state = self.get_state(self.game_pointer)
 
         return state, self.game_pointer
 
-    def step_back(self):
-        ''' Return to the previous state of the game
-
-        Returns:
-            (bool): True if the game steps back successfully
-        '''
-        if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, self.players, self.history_raises_nums = self.history.pop()
-            return True
-        return False
-
     def get_player_num(self):
         ''' Return the number of players in Limit Texas Hold'em
 
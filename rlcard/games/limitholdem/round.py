@@ -2,20 +2,28 @@
 ''' Implement Limit Texas Hold'em Round class
 '''
 
+from rlcard.core import Journal
+
 
 class LimitholdemRound(object):
     ''' Round can call other Classes' functions to keep the game running
     '''
 
-    def __init__(self, raise_amount, allowed_raise_num, num_players, np_random):
+    # The journal of the mutations for step_back
+    journal = Journal(enabled=False)
+
+    def __init__(self, raise_amount, allowed_raise_num, num_players, np_random, journal=None):
         ''' Initilize the round class
 
         Args:
             raise_amount (int): the raise amount for each raise
             allowed_raise_num (int): The number of allowed raise num
             num_players (int): The number of players
+            journal (Journal): The journal of the game, no records if None
         '''
         self.np_random = np_random
+        if journal is not None:
+            self.journal = journal
         self.game_pointer = None
         self.raise_amount = raise_amount
         self.allowed_raise_num = allowed_raise_num
@@ -32,6 +40,8 @@ class LimitholdemRound(object):
         # Raised amount for each player
         self.raised = [0 for _ in range(self.num_players)]
 
+        self.player_folded = False
+
     def start_new_round (self, game_pointer, raised=None):
         ''' Start a new bidding round
 
@@ -40,13 +50,14 @@ class LimitholdemRound(object):
 
         Note: For the first round of the game, we need to setup the big/small blind
         '''
-        self.game_pointer = game_pointer
-        self.have_raised = 0
-        self.not_raise_num = 0
+        journal = self.journal
+        journal.setattr(self, 'game_pointer', game_pointer)
+        journal.setattr(self, 'have_raised', 0)
+        journal.setattr(self, 'not_raise_num', 0)
         if raised:
-            self.raised = raised
+            journal.setattr(self, 'raised', raised)
         else:
-            self.raised = [0 for _ in range(self.num_players)]
+            journal.setattr(self, 'raised', [0 for _ in range(self.num_players)])
 
     def proceed_round(self, players, action):
         ''' Call other Classes's functions to keep one round running
@@ -61,32 +72,35 @@ class LimitholdemRound(object):
         if action not in self.get_legal_actions():
             raise Exception('{} is not legal action. Legal actions: {}'.format(action, self.get_legal_actions()))
 
+        journal = self.journal
+        player = players[self.game_pointer]
         if action == 'call':
             diff = max(self.raised) - self.raised[self.game_pointer]
-            self.raised[self.game_pointer] = max(self.raised)
-            players[self.game_pointer].in_chips += diff
-            self.not_raise_num += 1
+            journal.setitem(self.raised, self.game_pointer, max(self.raised))
+            journal.setattr(player, 'in_chips', player.in_chips + diff)
+            journal.setattr(self, 'not_raise_num', self.not_raise_num + 1)
 
         elif action == 'raise':
             diff = max(self.raised) - self.raised[self.game_pointer] + self.raise_amount
-            self.raised[self.game_pointer] = max(self.raised) + self.raise_amount
-            players[self.game_pointer].in_chips += diff
-            self.have_raised += 1
-            self.not_raise_num = 1
+            journal.setitem(self.raised, self.game_pointer, max(self.raised) + self.raise_amount)
+            journal.setattr(player, 'in_chips', player.in_chips + diff)
+            journal.setattr(self, 'have_raised', self.have_raised + 1)
+            journal.setattr(self, 'not_raise_num', 1)
 
         elif action == 'fold':
-            players[self.game_pointer].status = 'folded'
-            self.player_folded = True
+            journal.setattr(player, 'status', 'folded')
+            journal.setattr(self, 'player_folded', True)
 
         elif action == 'check':
-            self.not_raise_num += 1
+            journal.setattr(self, 'not_raise_num', self.not_raise_num + 1)
 
-        self.game_pointer = (self.game_pointer + 1) % self.num_players
+        game_pointer = (self.game_pointer + 1) % self.num_players
 
         # Skip the folded players
-        while players[self.game_pointer].status == 'folded':
-             self.game_pointer = (self.game_pointer + 1) % self.num_players
+        while players[game_pointer].status == 'folded':
+             game_pointer = (game_pointer + 1) % self.num_players
 
+        journal.setattr(self, 'game_pointer', game_pointer)
         return self.game_pointer
 
     def get_legal_actions(self):
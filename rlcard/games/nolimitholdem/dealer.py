@@ -2,7 +2,7 @@ from rlcard.games.limitholdem import Dealer
 
 class NolimitholdemDealer(Dealer):
 
-    def __init__(self, np_random):
+    def __init__(self, np_random, journal=None):
         ''' Initialize a nolimitholdem dealer class
         '''
-        super(NolimitholdemDealer, self).__init__(np_random)
+        super(NolimitholdemDealer, self).__init__(np_random, journal)
@@ -1,7 +1,7 @@
 from enum import Enum
 
 import numpy as np
-from copy import deepcopy
+from rlcard.core import Journal
 from rlcard.games.limitholdem import Game
 from rlcard.games.limitholdem import PlayerStatus
 
@@ -62,11 +62,14 @@ class NolimitholdemGame(Game):
         if self.dealer_id is None:
             self.dealer_id = self.np_random.randint(0, self.num_players)
 
+        # Save the hisory for stepping back to the last state.
+        self.history = Journal(self.allow_step_back)
+
         # Initilize a dealer that can deal cards
-        self.dealer = Dealer(self.np_random)
+        self.dealer = Dealer(self.np_random, journal=self.history)
 
         # Initilize players to play the game
-        self.players = [Player(i, self.init_chips[i], self.np_random) for i in range(self.num_players)]
+        self.players = [Player(i, self.init_chips[i], self.np_random, journal=self.history) for i in range(self.num_players)]
 
         # Initialize a judger class which will decide who wins in the end
         self.judger = Judger(self.np_random)
@@ -90,15 +93,15 @@ class NolimitholdemGame(Game):
 
         # Initilize a bidding round, in the first round, the big blind and the small blind needs to
         # be passed to the round for processing.
-        self.round = Round(self.num_players, self.big_blind, dealer=self.dealer, np_random=self.np_random)
+        self.round = Round(self.num_players, self.big_blind, dealer=self.dealer, np_random=self.np_random, journal=self.history)
 
         self.round.start_new_round(game_pointer=self.game_pointer, raised=[p.in_chips for p in self.players])
 
         # Count the round. There are 4 rounds in each game.
         self.round_counter = 0
 
-        # Save the hisory for stepping back to the last state.
-        self.history = []
+        # The initialization is not undone
+        self.history.clear()
 
         state = self.get_state(self.game_pointer)
 
@@ -130,18 +133,12 @@ class NolimitholdemGame(Game):
             print(self.get_state(self.game_pointer))
             raise Exception('Action not allowed')
 
-        if self.allow_step_back:
-            # First snapshot the current state
-            r = deepcopy(self.round)
-            b = self.game_pointer
-            r_c = self.round_counter
-            d = deepcopy(self.dealer)
-            p = deepcopy(self.public_cards)
-            ps = deepcopy(self.players)
-            self.history.append((r, b, r_c, d, p, ps))
+        # First record the mutations of the step
+        history = self.history
+        history.checkpoint()
 
         # Then we proceed to the next round
-        self.game_pointer = self.round.proceed_round(self.players, action)
+        game_pointer = self.round.proceed_round(self.players, action)
 
         players_in_bypass = [1 if player.status in (PlayerStatus.FOLDED, PlayerStatus.ALLIN) else 0 for player in self.players]
         if self.num_players - sum(players_in_bypass) == 1:
@@ -153,33 +150,38 @@ class NolimitholdemGame(Game):
         # If a round is over, we deal more public cards
         if self.round.is_over():
             # Game pointer goes to the first player not in bypass after the dealer, if there is one
-            self.game_pointer = (self.dealer_id + 1) % self.num_players
+            game_pointer = (self.dealer_id + 1) % self.num_players
             if sum(players_in_bypass) < self.num_players:
-                while players_in_bypass[self.game_pointer]:
-                    self.game_pointer = (self.game_pointer + 1) % self.num_players
+                while players_in_bypass[game_pointer]:
+                    game_pointer = (game_pointer + 1) % self.num_players
 
+            round_counter = self.round_counter
             # For the first round, we deal 3 cards
-            if self.round_counter == 0:
-                self.stage = Stage.FLOP
-                self.public_cards.append(self.dealer.deal_card())
-                self.public_cards.append(self.dealer.deal_card())
-                self.public_cards.append(self.dealer.deal_card())
+            if round_counter == 0:
+                history.setattr(self, 'stage', Stage.FLOP)
+                history.append(self.public_cards, self.dealer.deal_card())
+                history.append(self.public_cards, self.dealer.deal_card())
+                history.append(self.public_cards, self.dealer.deal_card())
                 if len(self.players) == np.sum(players_in_bypass):
-                    self.round_counter += 1
+                    round_counter += 1
             # For the following rounds, we deal only 1 card
-            if self.round_counter == 1:
-                self.stage = Stage.TURN
-                self.public_cards.append(self.dealer.deal_card())
+            if round_counter == 1:
+                history.setattr(self, 'stage', Stage.TURN)
+                history.append(self.public_cards, self.dealer.deal_card())
                 if len(self.players) == np.sum(players_in_bypass):
-                    self.round_counter += 1
-            if self.round_counter == 2:
-                self.stage = Stage.RIVER
-                self.public_cards.append(self.dealer.deal_card())
+                    round_counter += 1
+            if round_counter == 2:
+                history.setattr(self, 'stage', Stage.RIVER)
+                history.append(self.public_cards, self.dealer.deal_card())
                 if len(self.players) == np.sum(players_in_bypass):
-                    self.round_counter += 1
+                    round_counter += 1
+
+            history.setattr(self, 'round_counter', round_counter + 1)
+            self.round.start_new_round(game_pointer)
 
-            self.round_counter += 1
-            self.round.start_new_round(self.game_pointer)
+        history.setattr(self, 'game_pointer', game_pointer)
+        # The pot follows the chips of the players
+        history.setattr(self.dealer, 'pot', np.sum([player.in_chips for player in self.players]))
 
         state = self.get_state(self.game_pointer)
 
@@ -205,17 +207,6 @@ class NolimitholdemGame(Game):
         state['stage'] = self.stage
         return state
 
-    def step_back(self):
-        ''' Return to the previous state of the game
-
-        Returns:
-            (bool): True if the game steps back successfully
-        '''
-        if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, self.players = self.history.pop()
-            return True
-        return False
-
     def get_player_num(self):
         ''' Return the number of players in No Limit Texas Hold'em
 
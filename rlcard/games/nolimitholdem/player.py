@@ -1,19 +1,22 @@
+from rlcard.core import Journal
 from rlcard.games.limitholdem import Player
 
 
 class NolimitholdemPlayer(Player):
 
-    def __init__(self, player_id, init_chips, np_random):
+    def __init__(self, player_id, init_chips, np_random, journal=None):
         ''' Initilize a player.
 
         Args:
             player_id (int): The id of the player
             init_chips (int): The number of chips the player has initially
+            journal (Journal): The journal of the game, no records if None
         '''
         super(NolimitholdemPlayer, self).__init__(player_id, np_random)
         self.remained_chips = init_chips
+        self.journal = journal if journal is not None else Journal(enabled=False)
 
     def bet(self, chips):
         quantity = chips if chips <= self.remained_chips else self.remained_chips
-        self.in_chips += quantity
-        self.remained_chips -= quantity
+        self.journal.setattr(self, 'in_chips', self.in_chips + quantity)
+        self.journal.setattr(self, 'remained_chips', self.remained_chips - quantity)
@@ -3,6 +3,7 @@
 '''
 from enum import Enum
 
+from rlcard.core import Journal
 from rlcard.games.limitholdem import PlayerStatus
 
 
@@ -24,14 +25,16 @@ class NolimitholdemRound():
     ''' Round can call other Classes' functions to keep the game running
     '''
 
-    def __init__(self, num_players, init_raise_amount, dealer, np_random):
+    def __init__(self, num_players, init_raise_amount, dealer, np_random, journal=None):
         ''' Initilize the round class
 
         Args:
             num_players (int): The number of players
             init_raise_amount (int): The min raise amount when every round starts
+            journal (Journal): The journal of the game, no records if None
         '''
         self.np_random = np_random
+        self.journal = journal if journal is not None else Journal(enabled=False)
         self.game_pointer = None
         self.num_players = num_players
         self.init_raise_amount = init_raise_amount
@@ -56,12 +59,13 @@ class NolimitholdemRound():
 
         Note: For the first round of the game, we need to setup the big/small blind
         '''
-        self.game_pointer = game_pointer
-        self.not_raise_num = 0
+        journal = self.journal
+        journal.setattr(self, 'game_pointer', game_pointer)
+        journal.setattr(self, 'not_raise_num', 0)
         if raised:
-            self.raised = raised
+            journal.setattr(self, 'raised', raised)
         else:
-            self.raised = [0 for _ in range(self.num_players)]
+            journal.setattr(self, 'raised', [0 for _ in range(self.num_players)])
 
     def proceed_round(self, players, action):
         ''' Call other Classes's functions to keep one round running
@@ -73,56 +77,60 @@ class NolimitholdemRound():
         Returns:
             (int): The game_pointer that indicates the next player
         '''
+        journal = self.journal
         player = players[self.game_pointer]
+        not_raise_num = self.not_raise_num
 
         if action == Action.CALL:
             diff = max(self.raised) - self.raised[self.game_pointer]
-            self.raised[self.game_pointer] = max(self.raised)
+            journal.setitem(self.raised, self.game_pointer, max(self.raised))
             player.bet(chips=diff)
-            self.not_raise_num += 1
+            not_raise_num += 1
 
         elif action == Action.ALL_IN:
             all_in_quantity = player.remained_chips
-            self.raised[self.game_pointer] = all_in_quantity + self.raised[self.game_pointer]
+            journal.setitem(self.raised, self.game_pointer, all_in_quantity + self.raised[self.game_pointer])
             player.bet(chips=all_in_quantity)
 
-            self.not_raise_num = 1
+            not_raise_num = 1
 
         elif action == Action.RAISE_POT:
-            self.raised[self.game_pointer] += self.dealer.pot
+            journal.setitem(self.raised, self.game_pointer, self.raised[self.game_pointer] + self.dealer.pot)
             player.bet(chips=self.dealer.pot)
-            self.not_raise_num = 1
+            not_raise_num = 1
 
         elif action == Action.RAISE_HALF_POT:
             quantity = int(self.dealer.pot / 2)
-            self.raised[self.game_pointer] += quantity
+            journal.setitem(self.raised, self.game_pointer, self.raised[self.game_pointer] + quantity)
             player.bet(chips=quantity)
-            self.not_raise_num = 1
+            not_raise_num = 1
 
         elif action == Action.FOLD:
-            player.status = PlayerStatus.FOLDED
+            journal.setattr(player, 'status', PlayerStatus.FOLDED)
 
         elif action == Action.CHECK:
-            self.not_raise_num += 1
+            not_raise_num += 1
 
         if player.remained_chips < 0:
             raise Exception("Player in negative stake")
 
         if player.remained_chips == 0 and player.status != PlayerStatus.FOLDED:
-            player.status = PlayerStatus.ALLIN
+            journal.setattr(player, 'status', PlayerStatus.ALLIN)
 
-        self.game_pointer = (self.game_pointer + 1) % self.num_players
+        game_pointer = (self.game_pointer + 1) % self.num_players
 
         if player.status == PlayerStatus.ALLIN:
-            self.not_playing_num += 1
-            self.not_raise_num -= 1  # Because already counted in not_playing_num
+            journal.setattr(self, 'not_playing_num', self.not_playing_num + 1)
+            not_raise_num -= 1  # Because already counted in not_playing_num
         if player.status == PlayerStatus.FOLDED:
-            self.not_playing_num += 1
+            journal.setattr(self, 'not_playing_num', self.not_playing_num + 1)
+        journal.setattr(self, 'not_raise_num', not_raise_num)
 
         # Skip the folded players
-        while players[self.game_pointer].status == PlayerStatus.FOLDED:
-            self.game_pointer = (self.game_pointer + 1) % self.num_players
+        while players[game_pointer].status == PlayerStatus.FOLDED:
+            game_pointer = (game_pointer + 1) % self.num_players
 
+        journal.setattr(self, 'game_pointer', game_pointer)
         return self.game_pointer
 
     def get_nolimit_legal_actions(self, players):
@@ -3,3 +3,4 @@ from rlcard.games.tractor.judger import TractorJudger as Judger
 from rlcard.games.tractor.player import TractorPlayer as Player
 from rlcard.games.tractor.round import TractorRound as Round
 from rlcard.games.tractor.game import TractorGame as Game
+from rlcard.games.tractor.vec_game import TractorVecGame as VecGame
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+''' Precomputed tables of the Tractor action space. Every action id of
+`ACTION_LIST` is mapped to its cards as rank indexes of `CARD_RANK_STR`,
+its card count delta, suit, length and score, so that the game, the
+environment and the agents can work on action ids without building and
+splitting the action strings.
+'''
+
+import numpy as np
+
+from rlcard.games.tractor.utils import CARD_RANK_STR, CARD_RANK_DICT, TRUMP_CANDIDATE_STR
+from rlcard.games.tractor.utils import CARD_SCORE, CARD_SCORE_5, CARD_SCORE_TK
+from rlcard.games.tractor.utils import ACTION_LIST, ACTION_SPACE, SUIT_RANK, get_suit
+
+NUM_RANKS = len(CARD_RANK_STR)
+NUM_ACTIONS = len(ACTION_LIST)
+NUM_CARD_ACTIONS = ACTION_SPACE['pass_S']
+PASS_ACTION_START = ACTION_SPACE['pass_S']
+SCOR_ACTION_START = ACTION_SPACE['scor_S']
+
+# Suit of each rank index, the trump suit is 4
+RANK_SUIT = np.array([get_suit(card) for card in CARD_RANK_STR])
+
+# Score of each rank index, for the normal trumps and the trump numbers '5', 'T' and 'K'
+SCORE_TABLES = np.array([[score_dict.get(card, 0) for card in CARD_RANK_STR]
+                         for score_dict in [CARD_SCORE, CARD_SCORE_5, CARD_SCORE_TK]])
+
+def _score_table_id(trump):
+    if trump[0] == '5':
+        return 1
+    if trump[0] == 'T' or trump[0] == 'K':
+        return 2
+    return 0
+
+def _is_valid_tractor(first, second, trump):
+    ''' Whether the pairs of `first` and `second` form a tractor under the
+        trump, following `TractorJudger.playable_cards_from_hand`
+    '''
+    first_card, second_card = CARD_RANK_STR[first], CARD_RANK_STR[second]
+    trump_numbers = ['NS', 'NH', 'NC', 'ND']
+    if first_card[1] == second_card[1]:
+        if second == first + 1:
+            return True
+        if second == first + 2 and CARD_RANK_STR[first+1][0] == trump[0]:
+            return True
+    if first_card in trump_numbers and second_card == 'NJ':
+        return True
+    if first_card == 'AJ' and second_card in trump_numbers:
+        return True
+    if trump[1] == 'J' and first_card in trump_numbers and second_card == 'BJ':
+        return True
+    return False
+
+# Index of the score table of each trump in `TRUMP_CANDIDATE_STR`
+TRUMP_SCORE_TABLE_ID = np.array([_score_table_id(trump) for trump in TRUMP_CANDIDATE_STR])
+
+# Per action: the cards as strings and as rank indexes. The cards of
+# 'pass_*' and 'scor_*' are chosen by the game, so their rank tuples are empty.
+ACTION_CARD_STRS = [action.split(',') for action in ACTION_LIST]
+ACTION_CARDS = [tuple(CARD_RANK_DICT[card] for card in cards) if action_id < NUM_CARD_ACTIONS else ()
+                for action_id, cards in enumerate(ACTION_CARD_STRS)]
+
+# Per action: length, suit, rank index of the first card, the card count
+# delta and the score under each score table.
+# For 'pass_*' and 'scor_*' the suit is the preferred second suit.
+ACTION_LEN = np.zeros(NUM_ACTIONS, dtype=int)
+ACTION_SUIT = np.zeros(NUM_ACTIONS, dtype=int)
+ACTION_FIRST = np.zeros(NUM_ACTIONS, dtype=int)
+ACTION_DELTA = np.zeros((NUM_ACTIONS, NUM_RANKS), dtype=np.uint8)
+# Card actions are legal if hand[ACTION_RANKS[:, i]] >= ACTION_NEEDS[:, i] for i in (0, 1)
+ACTION_RANKS = np.zeros((NUM_CARD_ACTIONS, 2), dtype=int)
+ACTION_NEEDS = np.zeros((NUM_CARD_ACTIONS, 2), dtype=np.uint8)
+# Whether the card action is a legal combination under each trump
+ACTION_VALID = np.ones((len(TRUMP_CANDIDATE_STR), NUM_CARD_ACTIONS), dtype=bool)
+
+for _action_id, _cards in enumerate(ACTION_CARDS):
+    if _action_id >= NUM_CARD_ACTIONS:
+        ACTION_SUIT[_action_id] = SUIT_RANK[ACTION_LIST[_action_id][5]]
+        continue
+    ACTION_LEN[_action_id] = len(_cards)
+    ACTION_SUIT[_action_id] = RANK_SUIT[_cards[0]]
+    ACTION_FIRST[_action_id] = _cards[0]
+    for _rank in _cards:
+        ACTION_DELTA[_action_id][_rank] += 1
+    ACTION_RANKS[_action_id] = [_cards[0], _cards[-1]]
+    ACTION_NEEDS[_action_id] = [ACTION_DELTA[_action_id][_cards[0]], ACTION_DELTA[_action_id][_cards[-1]]]
+    if len(_cards) == 4:
+        for _trump_id, _trump in enumerate(TRUMP_CANDIDATE_STR):
+            ACTION_VALID[_trump_id][_action_id] = _is_valid_tractor(_cards[0], _cards[-1], _trump)
+
+ACTION_SCORE = SCORE_TABLES @ ACTION_DELTA.T.astype(int)
+
+# TRACTOR_NEXT[trump_id][first][second] is whether a pair of `second` can
+# follow a pair of `first` in a tractor. Only the next two ranks and the
+# trump numbers and jokers can follow.
+TRACTOR_NEXT = np.zeros((len(TRUMP_CANDIDATE_STR), NUM_RANKS, NUM_RANKS), dtype=bool)
+_TRUMP_RANKS = [CARD_RANK_DICT[card] for card in ['NS', 'NH', 'NC', 'ND', 'NJ', 'BJ']]
+for _trump_id, _trump in enumerate(TRUMP_CANDIDATE_STR):
+    for _first in range(NUM_RANKS):
+        for _second in set([_first + 1, _first + 2] + _TRUMP_RANKS):
+            if _first < _second < NUM_RANKS and _is_valid_tractor(_first, _second, _trump):
+                TRACTOR_NEXT[_trump_id][_first][_second] = True
+
+def get_action_id(cards):
+    ''' Get the action id of a list of cards or a 'pass_*'/'scor_*' action
+
+    Args:
+        cards (list): list of string of cards, e.g., ['3H', '3H']
+
+    Returns:
+        (int): The action id
+    '''
+    return ACTION_SPACE[','.join(cards)]
+
+def get_trump_id(trump):
+    ''' Get the index of the trump in `TRUMP_CANDIDATE_STR`
+    '''
+    return TRUMP_CANDIDATE_STR.index(trump)
+
+def playable_mask(hands, trumps):
+    ''' Get the card actions that can be formed from the hands
+
+    Args:
+        hands (numpy.array): (..., 72) card counts
+        trumps (numpy.array): The trump ids, with the leading shape of `hands`
+
+    Returns:
+        (numpy.array): A (..., 273) boolean mask over the card actions
+    '''
+    hands = np.asarray(hands)
+    return (hands[..., ACTION_RANKS[:, 0]] >= ACTION_NEEDS[:, 0]) \
+        & (hands[..., ACTION_RANKS[:, 1]] >= ACTION_NEEDS[:, 1]) \
+        & ACTION_VALID[trumps]
+
+def get_pass_cards(hand, num, is_get_score, pair_first, suit_sequence, trump_id):
+    ''' Pick the cards of a 'pass_*' or 'scor_*' action. The units of the
+        hand, i.e., a pair for every rank held twice and a single otherwise,
+        are ordered with the keys of `sort_units` in one lexsort, and the
+        first `num` cards are played. The order is the same as
+        `get_pass_cards_sequence`.
+
+    Args:
+        hand (numpy.array): (72,) card counts of the hand
+        num (int): The number of cards to play
+        is_get_score (boolean): Whether the score cards are played first, i.e., 'scor_*'
+        pair_first (boolean): Whether the pairs of the first suit are played before its singles
+        suit_sequence (list): The 5 suits in the order of preference
+        trump_id (int): The index of the trump in `TRUMP_CANDIDATE_STR`
+
+    Returns:
+        (numpy.array): The rank indexes of the played cards
+    '''
+    hand = np.asarray(hand, dtype=int)
+    scores = SCORE_TABLES[TRUMP_SCORE_TABLE_ID[trump_id]]
+    suit_pos = np.empty(5, dtype=int)
+    suit_pos[suit_sequence] = np.arange(5)
+
+    # From the last key to the first: the empty ranks at the end, the suit,
+    # the pairs of the first suit, the score cards, singles before pairs,
+    # the score and the rank, which is kept by the stable sort
+    keys = (
+        -scores if is_get_score else scores,
+        hand,
+        (scores > 0) != is_get_score,
+        -hand * (pair_first & (RANK_SUIT == suit_sequence[0])),
+        suit_pos[RANK_SUIT],
+        hand == 0,
+    )
+    order = np.lexsort(keys)
+    return np.repeat(order, hand[order])[:num]
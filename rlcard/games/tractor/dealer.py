@@ -2,6 +2,7 @@
 ''' Implement Tractor Dealer class
 '''
 import functools
+from collections import Counter
 
 from rlcard.games.tractor.utils import tractor_sort_card, CARD_STR
 
@@ -59,6 +60,9 @@ class TractorDealer(object):
 
         Args:
             players (list): list of TractorPlayer objects
+            predefined_hands (list): the hands of the 4 players, e.g., the
+                `initial_hand` of the players of a previous game with the same
+                trump. The 8 banker cards are the rest of the deck
 
         Returns:
             int: banker's player_id
@@ -68,10 +72,18 @@ class TractorDealer(object):
             self.shuffle()
             self.deal_cards(players)
         else:
-            for player_id in range(4):
-                current_hand = predefined_hands[player_id]
-                current_hand.sort(key=functools.cmp_to_key(tractor_sort_card))
-                players[player_id].current_hand = current_hand
+            hands = [sorted(hand, key=functools.cmp_to_key(tractor_sort_card)) for hand in predefined_hands]
+            banker_cards = Counter(self.deck)
+            for hand in hands:
+                banker_cards.subtract(hand)
+            if len(hands) != 4 or any(count < 0 for count in banker_cards.values()):
+                raise ValueError('The predefined hands are not from the deck')
+            # Keep the deck in the order of the hands, so that the last
+            # 8 cards are the banker cards as for a shuffled deck
+            self.deck = [card for hand in hands for card in hand] + list(banker_cards.elements())
+            for player, hand in zip(players, hands):
+                player.current_hand = hand
+                player.initial_hand = hand.copy()
 
         # Assume player[0] is always the banker
         # TODO: if later on multiple agents are trained, randomization needs to be added here
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+''' Factored actions of Tractor. The leads that are not in `ACTION_SPACE`,
+i.e., throws (several units of one suit played at once) and tractors of
+more than two pairs, would explode the action space if they were enumerated
+as strings. A factored action is instead the card counts over
+`CARD_RANK_STR` plus a type, and its legality is checked with a few vector
+operations on the card counts of the other three hands. A player who has no
+card of the suit of such a lead may beat it with trumps of the same shape.
+'''
+
+import numpy as np
+
+from rlcard.games.tractor.utils import CARD_RANK_STR, CARD_RANK_DICT, ACTION_SPACE
+from rlcard.games.tractor.action_table import NUM_RANKS, NUM_CARD_ACTIONS, ACTION_LEN, RANK_SUIT, TRACTOR_NEXT, get_trump_id
+
+ACTION_TYPES = ['single', 'pair', 'tractor', 'throw']
+# The type of each card action of `ACTION_SPACE`, by its length
+ACTION_TYPE = [{1: 'single', 2: 'pair', 4: 'tractor'}[length] for length in ACTION_LEN[:NUM_CARD_ACTIONS]]
+
+class TractorFactoredAction(object):
+    ''' A lead of any cards of one suit, given as card counts and a type
+    '''
+
+    def __init__(self, counts, action_type):
+        ''' Initialize the action
+
+        Args:
+            counts (numpy.array): (72,) card counts over `CARD_RANK_STR`
+            action_type (str): One of `ACTION_TYPES`
+        '''
+        self.counts = np.asarray(counts, dtype=np.uint8)
+        self.type = action_type
+
+    @classmethod
+    def from_cards(cls, cards, trump):
+        ''' Build the action of a list of cards
+
+        Args:
+            cards (list): list of string of cards, e.g., ['AS', 'KS', 'KS']
+            trump (str): The trump of the game
+
+        Returns:
+            (TractorFactoredAction): The action, its type is None if the cards
+                are not of one suit
+        '''
+        counts = np.zeros(NUM_RANKS, dtype=np.uint8)
+        for card in cards:
+            counts[CARD_RANK_DICT[card]] += 1
+        return cls(counts, get_lead_type(counts, get_trump_id(trump)))
+
+    @property
+    def cards(self):
+        ''' The cards as a list of string sorted by rank
+        '''
+        return [CARD_RANK_STR[rank] for rank in np.repeat(np.arange(NUM_RANKS), self.counts)]
+
+    @property
+    def suit(self):
+        ''' The suit of the first card
+        '''
+        return RANK_SUIT[np.argmax(self.counts > 0)]
+
+    def get_action_id(self):
+        ''' Get the id of the action in `ACTION_SPACE`
+
+        Returns:
+            (int): The action id, None if the action is not in `ACTION_SPACE`
+        '''
+        if self.type == 'throw':
+            return None
+        return ACTION_SPACE.get(','.join(self.cards))
+
+    def __len__(self):
+        return int(self.counts.sum())
+
+    def __repr__(self):
+        return '{}({})'.format(self.type, ','.join(self.cards))
+
+def get_units(counts, trump_id):
+    ''' Split the cards into units. The pairs are chained into tractors
+        greedily from the lowest rank, and the other cards are singles
+
+    Args:
+        counts (numpy.array): (72,) card counts
+        trump_id (int): The index of the trump in `TRUMP_CANDIDATE_STR`
+
+    Returns:
+        (list): The units as tuples of the first rank, the width, i.e., 1 for
+            singles and 2 for pairs, and the number of consecutive ranks
+    '''
+    units = []
+    used = np.zeros(NUM_RANKS, dtype=bool)
+    pairs = counts >= 2
+    for rank in np.flatnonzero(pairs):
+        if used[rank]:
+            continue
+        length = 1
+        used[rank] = True
+        last = rank
+        while True:
+            following = np.flatnonzero(TRACTOR_NEXT[trump_id][last] & pairs & ~used)
+            if len(following) == 0:
+                break
+            last = following[0]
+            used[last] = True
+            length += 1
+        units.append((rank, 2, length))
+    units.extend((rank, 1, 1) for rank in np.flatnonzero(counts == 1))
+    return units
+
+def get_lead_type(counts, trump_id):
+    ''' Get the type of a lead
+
+    Args:
+        counts (numpy.array): (72,) card counts
+        trump_id (int): The index of the trump in `TRUMP_CANDIDATE_STR`
+
+    Returns:
+        (str): One of `ACTION_TYPES`, None if the cards are not of one suit
+    '''
+    counts = np.asarray(counts)
+    suits = RANK_SUIT[counts > 0]
+    if len(suits) == 0 or (suits != suits[0]).any():
+        return None
+    units = get_units(counts, trump_id)
+    if len(units) > 1:
+        return 'throw'
+    _, width, length = units[0]
+    if width == 1:
+        return 'single'
+    return 'pair' if length == 1 else 'tractor'
+
+def get_tractor_starts(pairs, length, trump_id):
+    ''' Get the ranks that start a tractor of a given number of pairs
+
+    Args:
+        pairs (numpy.array): (..., 72) whether each rank is held as a pair
+        length (int): The number of pairs of the tractors
+        trump_id (int): The index of the trump in `TRUMP_CANDIDATE_STR`
+
+    Returns:
+        (numpy.array): (..., 72) boolean mask of the first ranks
+    '''
+    starts = pairs
+    following = TRACTOR_NEXT[trump_id].T.astype(np.uint8)
+    for _ in range(length - 1):
+        starts = pairs & (starts.astype(np.uint8) @ following > 0)
+    return starts
+
+def is_legal_lead(action, hand, others, trump_id):
+    ''' Check whether a factored action can be led. The cards must be held
+        and of one suit, and for a throw no unit may be beaten by a unit of
+        the same shape and suit in the hands of the other players
+
+    Args:
+        action (TractorFactoredAction): The action
+        hand (numpy.array): (72,) card counts of the hand of the player
+        others (numpy.array): (3, 72) card counts of the hands of the other players
+        trump_id (int): The index of the trump in `TRUMP_CANDIDATE_STR`
+
+    Returns:
+        (boolean): Whether the action is legal
+    '''
+    counts = action.counts
+    if action.type is None or not counts.any() or (counts > hand).any():
+        return False
+    if action.type != 'throw':
+        return True
+
+    higher_ranks = np.arange(NUM_RANKS)
+    in_suit = RANK_SUIT == action.suit
+    for rank, width, length in get_units(counts, trump_id):
+        higher = in_suit & (higher_ranks > rank)
+        if width == 1:
+            beaten = (others[:, higher] > 0).any()
+        else:
+            beaten = get_tractor_starts(others >= 2, length, trump_id)[:, higher].any()
+        if beaten:
+            return False
+    return True
+
+def get_shape(units):
+    ''' Get the shape of units, i.e., the sorted (width, length) of each unit
+    '''
+    return sorted((width, length) for _, width, length in units)
+
+def get_top_rank(units):
+    ''' Get the highest first rank among the largest units, which decides
+        which of two plays of the same shape is greater
+    '''
+    size = max(width * length for _, width, length in units)
+    return max(rank for rank, width, length in units if width * length == size)
+
+def get_unit_size(counts, trump_id):
+    ''' Get the number of cards of the largest unit of a play
+
+    Args:
+        counts (numpy.array): (72,) card counts
+        trump_id (int): The index of the trump in `TRUMP_CANDIDATE_STR`
+
+    Returns:
+        (int): The number of cards, e.g., 2 for a pair
+    '''
+    return max(width * length for _, width, length in get_units(counts, trump_id))
+
+def is_trumping(counts, lead_counts, greater_counts, trump_id):
+    ''' Check whether the cards played after a throw or a tractor of more
+        than two pairs beat the greater play by trumping. They must all be
+        trumps of the shape of the lead, and if the greater play is also
+        trumps, their largest unit must be higher
+
+    Args:
+        counts (numpy.array): (72,) card counts of the played cards
+        lead_counts (numpy.array): (72,) card counts of the lead, which is not of trumps
+        greater_counts (numpy.array): (72,) card counts of the greater play
+        trump_id (int): The index of the trump in `TRUMP_CANDIDATE_STR`
+
+    Returns:
+        (boolean): Whether the played cards are greater
+    '''
+    if (RANK_SUIT[counts > 0] != 4).any() or RANK_SUIT[np.argmax(lead_counts > 0)] == 4:
+        return False
+    units = get_units(counts, trump_id)
+    if get_shape(units) != get_shape(get_units(lead_counts, trump_id)):
+        return False
+    if RANK_SUIT[np.argmax(greater_counts > 0)] != 4:
+        return True
+    return get_top_rank(units) > get_top_rank(get_units(greater_counts, trump_id))
@@ -7,7 +7,10 @@ import functools
 from heapq import merge
 
 from rlcard.games.tractor import Player, Round, Judger
-from rlcard.games.tractor.utils import tractor_sort_card, CARD_SCORE, ACTION_SPACE
+from rlcard.games.tractor.utils import tractor_sort_card, CARD_SCORE
+from rlcard.games.tractor.utils import ACTION_SPACE
+from rlcard.games.tractor.action_table import NUM_ACTIONS, ACTION_CARD_STRS
+from rlcard.games.tractor.factored_action import TractorFactoredAction
 
 class TractorGame(object):
     ''' Game class. This class will interact with outer environment.
@@ -18,8 +21,12 @@ class TractorGame(object):
         self.np_random = np.random.RandomState()
         self.num_players = 4
 
-    def init_game(self, predefined_hands=None):
+    def init_game(self, predefined_hands=None, predefined_trump=None):
         ''' Initialize all characters in the game and start round 1
+
+        Args:
+            predefined_hands (list): the hands of the 4 players, dealt randomly if None
+            predefined_trump (str): the trump, chosen randomly if None
         '''
         # initialize public variables
         self.winner_id = None
@@ -30,8 +37,8 @@ class TractorGame(object):
                         for num in range(self.num_players)]
 
         # initialize round to deal cards
-        self.round = Round(self.np_random)
-        self.round.initiate(self.players, predefined_hands)
+        self.round = Round(self.np_random, self.allow_step_back)
+        self.round.initiate(self.players, predefined_hands, predefined_trump)
 
         # initialize judger
         self.judger = Judger(self.players, self.round.trump, self.np_random)
@@ -41,20 +48,35 @@ class TractorGame(object):
 
         # get state of first player
         player_id = self.round.current_player.player_id
-        player = self.players[player_id]
-        others_hands = self._get_others_current_hand(player)
-        actions = self.judger.playable_cards[player_id]
-        state = player.get_state(self.round.public, others_hands, actions)
+        state = self.get_state(player_id)
         self.state = state
 
         return state, player_id
 
     def step(self, action):
-        # perform action
+        ''' Perform one action of the current player
+
+        Args:
+            action (int, list or TractorFactoredAction): The action id in
+                `ACTION_SPACE`, the raw action as a list of string of cards, or
+                a factored action. The leads that are not in `ACTION_SPACE`,
+                i.e., throws and tractors of more than two pairs, are given
+                as a list of cards or a factored action
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (dict): The next state
+                (int): The ID of the next player
+        '''
         player = self.players[self.round.current_player.player_id]
+        if not isinstance(action, (int, np.integer)):
+            action = self._decode_lead(player, action)
+
+        # perform action
         next_id, end_of_game = self.round.proceed_round(player, action, self.judger)
         self.round.current_player = self.players[next_id]
-        self.judger.calc_playable_cards(player)
+        self.judger.remove_cards(player, player.played_cards)
 
         if end_of_game:
             self.winner_id = []
@@ -80,16 +102,54 @@ class TractorGame(object):
         others_hands = self._get_others_current_hand(player)
         if self.is_over():
             actions = None
+            action_mask = None
         else:
-            actions = player.available_actions(self.round.first_player, self.judger)
+            action_mask = self.judger.get_legal_actions(player, self.round.first_player)
+            actions = [ACTION_CARD_STRS[action] for action in np.flatnonzero(action_mask)]
         state = player.get_state(self.round.public, others_hands, actions)
+        state['action_mask'] = action_mask
 
         return state
 
     def step_back(self):
-        ''' Takes one step backward and restore to the last state
+        ''' Takes one step backward and restore to the last state. The round,
+        the player and the judger undo only what the last action changed
+
+        Returns:
+            (bool): True if the game steps back successfully
+        '''
+        if not self.round.undo_log:
+            return False
+
+        # winner_id will be always None no matter step_back from any case
+        self.winner_id = None
+
+        player_id, cards = self.round.step_back(self.players)
+        player = self.players[player_id]
+        player.play_back()
+        self.judger.add_cards(player, cards)
+
+        self.state = self.get_state(player_id)
+        return True
+
+    def _decode_lead(self, player, action):
+        ''' Get the action id of a raw or factored action, or the factored
+        action if it is a lead that is not in `ACTION_SPACE`
+
+        Raises:
+            ValueError: If the factored action is not a legal lead
         '''
-        raise NotImplementedError
+        if not isinstance(action, TractorFactoredAction):
+            action_id = ACTION_SPACE.get(','.join(action))
+            if action_id is not None:
+                return action_id
+            action = TractorFactoredAction.from_cards(action, self.round.trump)
+        action_id = action.get_action_id()
+        if action_id is not None:
+            return action_id
+        if player != self.round.first_player or not self.judger.is_legal_lead(player, action):
+            raise ValueError('Illegal lead {}'.format(action))
+        return action
 
     def get_player_num(self):
         ''' Retrun the number of players in the game
@@ -99,7 +159,7 @@ class TractorGame(object):
     def get_action_num(self):
         ''' Return the number of possible actions in the game
         '''
-        return len(ACTION_SPACE.keys())
+        return NUM_ACTIONS
 
     def get_player_id(self):
         ''' Return the current player that will take actions soon
@@ -4,7 +4,17 @@
 import collections
 import numpy as np
 
-from rlcard.games.tractor.utils import CARD_RANK_STR
+from rlcard.games.tractor.utils import CARD_RANK_STR, CARD_RANK_DICT, TRUMP_CANDIDATE_STR, get_suit
+from rlcard.games.tractor.action_table import NUM_RANKS, NUM_ACTIONS, NUM_CARD_ACTIONS, ACTION_LEN, ACTION_SUIT
+from rlcard.games.tractor.action_table import ACTION_CARD_STRS, ACTION_RANKS, ACTION_NEEDS, ACTION_VALID, playable_mask
+from rlcard.games.tractor.factored_action import is_legal_lead
+
+# The card actions that contain each rank index
+RANK_ACTIONS = [np.flatnonzero((ACTION_RANKS == rank).any(axis=1)) for rank in range(NUM_RANKS)]
+# The card actions of each suit and length
+SUIT_LEN_ACTIONS = [[np.flatnonzero((ACTION_SUIT[:NUM_CARD_ACTIONS] == suit) & (ACTION_LEN[:NUM_CARD_ACTIONS] == length))
+                     for length in range(5)] for suit in range(5)]
+SUIT_ACTIONS = [np.flatnonzero(ACTION_SUIT[:NUM_CARD_ACTIONS] == suit) for suit in range(5)]
 
 class TractorJudger(object):
     ''' Judger decides whether the round/game ends and return the winner of the round/game
@@ -12,15 +22,18 @@ class TractorJudger(object):
 
     def __init__(self, players, trump, np_random):
         ''' Initialize the Judger class for Tractor
+
+        The hand of each player is kept as a 72-slot count vector over
+        `CARD_RANK_STR`, and the playable cards as a boolean mask over the
+        card actions of `ACTION_SPACE`.
         '''
         self.np_random = np_random
         self.trump = trump
-        self.playable_cards = [[] for _ in range(4)]
-        self._recorded_removed_playable_cards = [[] for _ in range(4)]
+        self.trump_id = TRUMP_CANDIDATE_STR.index(trump)
+        self.hand_counts = np.zeros((4, NUM_RANKS), dtype=np.uint8)
+        self.playable_masks = np.zeros((4, NUM_CARD_ACTIONS), dtype=bool)
         for player in players:
-            player_id = player.player_id
-            current_hand = player.current_hand
-            self.playable_cards[player_id] = self.playable_cards_from_hand(current_hand, self.trump)
+            self.calc_playable_cards(player)
 
     def calc_playable_cards(self, player):
         ''' Recalculate all legal cards the player can play according to his
@@ -30,28 +43,126 @@ class TractorJudger(object):
             player (TractorPlayer object): object of TractorPlayer
 
         Returns:
-            list: list of string of playable cards
+            numpy.array: boolean mask of playable card actions
+        '''
+        player_id = player.player_id
+        self.hand_counts[player_id] = 0
+        for card in player.current_hand:
+            self.hand_counts[player_id][CARD_RANK_DICT[card]] += 1
+
+        self.playable_masks[player_id] = playable_mask(self.hand_counts[player_id], self.trump_id)
+        return self.playable_masks[player_id]
+
+    def remove_cards(self, player, cards):
+        ''' Update the playable cards after cards leave the player's hand.
+        Only the card actions that contain the removed cards are updated.
+
+        Args:
+            player (TractorPlayer object): object of TractorPlayer
+            cards (list): list of string of removed cards
+
+        Returns:
+            numpy.array: boolean mask of playable card actions
+        '''
+        player_id = player.player_id
+        counts = self.hand_counts[player_id]
+        ranks = [CARD_RANK_DICT[card] for card in cards]
+        for rank in ranks:
+            counts[rank] -= 1
+        return self._update_playable_cards(player_id, ranks)
+
+    def add_cards(self, player, cards):
+        ''' Update the playable cards after cards return to the player's hand,
+        e.g., when the game steps back. The inverse of `remove_cards`
+
+        Args:
+            player (TractorPlayer object): object of TractorPlayer
+            cards (list): list of string of returned cards
+
+        Returns:
+            numpy.array: boolean mask of playable card actions
         '''
         player_id = player.player_id
-        current_hand = player.current_hand
+        counts = self.hand_counts[player_id]
+        ranks = [CARD_RANK_DICT[card] for card in cards]
+        for rank in ranks:
+            counts[rank] += 1
+        return self._update_playable_cards(player_id, ranks)
 
-        self.playable_cards[player_id] = self.playable_cards_from_hand(current_hand, self.trump)
-        return self.playable_cards[player_id]
+    def _update_playable_cards(self, player_id, ranks):
+        ''' Update the card actions that contain the changed ranks
+        '''
+        counts = self.hand_counts[player_id]
+        actions = RANK_ACTIONS[ranks[0]] if len(set(ranks)) == 1 \
+            else np.unique(np.concatenate([RANK_ACTIONS[rank] for rank in ranks]))
+        self.playable_masks[player_id][actions] = (counts[ACTION_RANKS[actions, 0]] >= ACTION_NEEDS[actions, 0]) \
+            & (counts[ACTION_RANKS[actions, 1]] >= ACTION_NEEDS[actions, 1]) \
+            & ACTION_VALID[self.trump_id][actions]
+        return self.playable_masks[player_id]
 
     def get_playable_cards(self, player):
         ''' Provide all legal cards the player can play according to his
         current hand.
 
         Args:
-            player (DoudizhuPlayer object): object of DoudizhuPlayer
-            init_flag (boolean): For the first time, set it True to accelerate
-              the preocess.
+            player (TractorPlayer object): object of TractorPlayer
 
         Returns:
-            list: list of string of playable cards
+            list: list of list of string of playable cards
         '''
-        return self.playable_cards[player.player_id]
-        
+        return [ACTION_CARD_STRS[action] for action in np.flatnonzero(self.playable_masks[player.player_id])]
+
+    def get_legal_actions(self, player, first_player):
+        ''' Provide the legal actions of the player in the current round,
+        following `get_valid_cards`
+
+        Args:
+            player (TractorPlayer object): object of TractorPlayer
+            first_player (TractorPlayer object): The first player of the current round
+
+        Returns:
+            numpy.array: boolean mask over `ACTION_SPACE`
+        '''
+        playable = self.playable_masks[player.player_id]
+        legal_actions = np.zeros(NUM_ACTIONS, dtype=bool)
+        if first_player == player:
+            legal_actions[:NUM_CARD_ACTIONS] = playable
+            return legal_actions
+
+        target_hand = first_player.played_cards
+        if first_player.played_type == 'throw' or len(target_hand) > 4:
+            # Throws and longer tractors are followed by the cards picked by 'pass_*' and 'scor_*',
+            # which beat them if they are trumps of the same shape, see `TractorPlayer.play`
+            legal_actions[NUM_CARD_ACTIONS:] = True
+            return legal_actions
+        target_suit = get_suit(target_hand[0])
+        actions = SUIT_LEN_ACTIONS[target_suit][len(target_hand)]
+        matched = actions[playable[actions]]
+        if len(matched) > 0:
+            legal_actions[matched] = True
+            return legal_actions
+
+        # Trump cards can beat only if there are no cards of the target suit
+        if target_suit != 4 and not playable[SUIT_ACTIONS[target_suit]].any():
+            actions = SUIT_LEN_ACTIONS[4][len(target_hand)]
+            legal_actions[actions[playable[actions]]] = True
+        legal_actions[NUM_CARD_ACTIONS:] = True
+        return legal_actions
+
+    def is_legal_lead(self, player, action):
+        ''' Check whether the player can lead a factored action, see
+        `factored_action.is_legal_lead`
+
+        Args:
+            player (TractorPlayer object): object of TractorPlayer
+            action (TractorFactoredAction): The action
+
+        Returns:
+            boolean: Whether the action is legal
+        '''
+        others = self.hand_counts[[(player.player_id + offset) % 4 for offset in (1, 2, 3)]]
+        return is_legal_lead(action, self.hand_counts[player.player_id], others, self.trump_id)
+
     @staticmethod
     def playable_cards_from_hand(current_hand, trump):
         ''' Get playable cards from hand
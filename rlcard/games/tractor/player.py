@@ -3,9 +3,12 @@
 '''
 import functools
 import random
+import numpy as np
 from rlcard.games.tractor import Dealer, Judger
-from rlcard.games.tractor.utils import get_valid_cards, tractor_sort_card, get_suit, get_pass_cards_sequence
-from rlcard.games.tractor.utils import SUIT_RANK
+from rlcard.games.tractor.utils import CARD_RANK_STR, CARD_RANK_DICT, get_suit, get_card_counts
+from rlcard.games.tractor.action_table import NUM_CARD_ACTIONS, SCOR_ACTION_START, RANK_SUIT
+from rlcard.games.tractor.action_table import ACTION_SUIT, ACTION_FIRST, ACTION_CARD_STRS, get_pass_cards
+from rlcard.games.tractor.factored_action import TractorFactoredAction, ACTION_TYPE, is_trumping
 
 class TractorPlayer(object):
     ''' Player stores cards in the player's hand, and can determine the actions can be made according to the rules
@@ -20,10 +23,13 @@ class TractorPlayer(object):
         self.current_hand = []
         self.role = ''
         self.played_cards = None
+        # The type of the played cards in `ACTION_TYPES`, None for 'pass_*' and 'scor_*'
+        self.played_type = None
 
         # Record cards removed from self._current_hand for each play()
         # and restore cards back to self._current_hand when play_back()
         self._recorded_played_cards = []
+        self._recorded_played_types = []
 
     def get_state(self, public, others_hands, actions):
         state = {}
@@ -34,8 +40,8 @@ class TractorPlayer(object):
         state['current_player_id'] = public['current_player_id']
         state['first_player_id'] = public['first_player_id']
         state['greater_player_id'] = public['greater_player_id']
-        state['guessed_others_hand'] = self.guess_othershand(public['suit_avail'], public['remaining_cards'], public['banker_id'], public['banker_cards'])
-        state['remaining_cards'] = self.guess_banker(public['remaining_cards'], public['banker_id'], public['banker_cards'])
+        state['guessed_others_counts'] = public['belief_counts'][self.player_id].copy()
+        state['remaining_counts'] = self.guess_banker(public['unknown_counts'], public['banker_id'], public['banker_counts'])
         state['score'] = public['score']
         state['actions'] = actions
 
@@ -45,21 +51,17 @@ class TractorPlayer(object):
         ''' Get the actions can be made based on the rules
 
         Returns:
-            list: a list of available orders
+            list: a list of available action ids
         '''
-        actions = []
-        playable_cards = judger.get_playable_cards(self)
-        if first_player == self:
-            actions = playable_cards
-        else:
-            actions = get_valid_cards(first_player, playable_cards)
-        return actions
+        legal_actions = judger.get_legal_actions(self, first_player)
+        return np.flatnonzero(legal_actions).tolist()
 
     def play(self, action, first_player=None, greater_player=None, judger=None, trump=None):
         ''' Perfrom action
 
         Args:
-            action (list of card string): specific action
+            action (int or TractorFactoredAction): specific action id in `ACTION_SPACE`,
+                or a factored action of a lead that is not in `ACTION_SPACE`
             greater_player (Tractor object): The player who played current biggest cards.
 
         Returns:
@@ -67,10 +69,17 @@ class TractorPlayer(object):
             string: cards played
         '''
         removed_cards = []
+        if isinstance(action, TractorFactoredAction):
+            # Only leads are factored, so the player is the greater player
+            for play_card in action.cards:
+                self.current_hand.remove(play_card)
+                removed_cards.append(play_card)
+            self._record_play(removed_cards, action.type)
+            return (self, self.played_cards)
         # pass or scor
-        if (action[0][0] == 'p' or action[0][0] == 's'):
-            is_get_score = False if action[0][0] == 'p' else True
-            second_suit = SUIT_RANK[action[0][5]]
+        if action >= NUM_CARD_ACTIONS:
+            is_get_score = action >= SCOR_ACTION_START
+            second_suit = ACTION_SUIT[action]
             suit_candidate = [0,1,2,3,4]
 
             target_hand = first_player.played_cards
@@ -86,41 +95,70 @@ class TractorPlayer(object):
             random.shuffle(suit_candidate)
             suit_sequence.extend(suit_candidate)
 
-            if len(target_hand) == 1 or len(target_hand) == 2 or len(target_hand) == 4:
-                # Single
-                # Current player MUST NOT have any card with the same suit according to how actions are picked
-                # Pair
-                # Current player MUST NOT have any pairs with the same suit
-                # Tractor
-                # Current player MUST NOT have any tractors with the same suit
-                playable_cards = judger.get_playable_cards(self)
-                sorted_card_list = get_pass_cards_sequence(self.current_hand, playable_cards, is_get_score, len(target_hand) >= 2, suit_sequence, trump)
-                for i in range(len(target_hand)):
-                    removed_cards.append(sorted_card_list[i])
-                    self.current_hand.remove(sorted_card_list[i])
-            else:
-                raise NotImplementedError
-
-            self._recorded_played_cards.append(removed_cards)
-            self.played_cards = removed_cards
+            is_factored_lead = first_player.played_type == 'throw' or len(target_hand) > 4
+            if is_factored_lead and not judger.hand_counts[self.player_id][RANK_SUIT == target_suit].any():
+                # Without the target suit, the pairs of the chosen suit are played first
+                suit_sequence = suit_sequence[1:] + suit_sequence[:1]
+
+            # Single
+            # Current player MUST NOT have any card with the same suit according to how actions are picked
+            # Pair
+            # Current player MUST NOT have any pairs with the same suit
+            # Tractor
+            # Current player MUST NOT have any tractors with the same suit
+            # Throw or longer tractor
+            # The cards of the target suit are played first, then the other suits,
+            # so a player without the target suit can beat it with trumps
+            ranks = get_pass_cards(judger.hand_counts[self.player_id], len(target_hand), is_get_score,
+                                   len(target_hand) >= 2, suit_sequence, judger.trump_id)
+            for rank in ranks:
+                removed_cards.append(CARD_RANK_STR[rank])
+                self.current_hand.remove(CARD_RANK_STR[rank])
+
+            if is_factored_lead:
+                counts, lead_counts, greater_counts = get_card_counts([removed_cards, target_hand,
+                                                                       greater_player.played_cards])
+                if is_trumping(counts, lead_counts, greater_counts, judger.trump_id):
+                    greater_player = self
+            self._record_play(removed_cards, None)
             return (greater_player, self.played_cards)
         else:
             # action matches greater_player card type
-            for play_card in action:
-                for _, remain_card in enumerate(self.current_hand):
-                    if play_card == remain_card:
-                        removed_cards.append(self.current_hand[_])
-                        self.current_hand.remove(self.current_hand[_])
-                        break
-            self._recorded_played_cards.append(removed_cards)
-            self.played_cards = removed_cards
-
-            greater_player_cards = greater_player.played_cards
-            if (greater_player == None or tractor_sort_card(action[0], greater_player_cards[0])) > 0:
+            for play_card in ACTION_CARD_STRS[action]:
+                self.current_hand.remove(play_card)
+                removed_cards.append(play_card)
+            self._record_play(removed_cards, ACTION_TYPE[action])
+
+            if greater_player == None or ACTION_FIRST[action] > CARD_RANK_DICT[greater_player.played_cards[0]]:
                 return (self, self.played_cards)
             else:
                 return (greater_player, self.played_cards)
     
+    def play_back(self):
+        ''' Restore the cards of the last play() back to self.current_hand,
+        which stays sorted by rank
+
+        Returns:
+            list: the restored cards
+        '''
+        removed_cards = self._recorded_played_cards.pop()
+        for card in removed_cards:
+            rank = CARD_RANK_DICT[card]
+            index = 0
+            while index < len(self.current_hand) and CARD_RANK_DICT[self.current_hand[index]] <= rank:
+                index += 1
+            self.current_hand.insert(index, card)
+        self._recorded_played_types.pop()
+        self.played_cards = self._recorded_played_cards[-1] if self._recorded_played_cards else None
+        self.played_type = self._recorded_played_types[-1] if self._recorded_played_types else None
+        return removed_cards
+
+    def _record_play(self, cards, played_type):
+        self._recorded_played_cards.append(cards)
+        self._recorded_played_types.append(played_type)
+        self.played_cards = cards
+        self.played_type = played_type
+
     def get_offseted_current_round(self, current_round):
         offseted_current_round = [None, None, None]
         player_down = (self.player_id + 1) % 4
@@ -131,33 +169,18 @@ class TractorPlayer(object):
         offseted_current_round[2] = current_round[player_up]
         return offseted_current_round
 
-    def guess_othershand(self, suit_avail, remaining_cards, banker_id, banker_cards):
-        othershand = []
+    def guess_banker(self, unknown_counts, banker_id, banker_counts):
+        ''' Get the card counts of the possible banker cards
 
-        cards = remaining_cards.copy()
-        for card in self.current_hand:
-            cards.remove(card)
-
-        if self.player_id == banker_id:
-            for card in banker_cards:
-                cards.remove(card)
-
-        player_ids =  [(self.player_id + 1) % 4, (self.player_id + 2) % 4, (self.player_id + 3) % 4]
-        for player_id in player_ids:
-            available_cards = []
-            for card in cards:
-                if suit_avail[player_id][get_suit(card)]:
-                    available_cards.append(card)
-            # available_cards.sort(key=functools.cmp_to_key(tractor_sort_card))
-            othershand.append(available_cards)
-
-        return othershand
+        Args:
+            unknown_counts (numpy.array): (4, 72) card counts that each player has not seen
+            banker_id (int): The id of the banker
+            banker_counts (numpy.array): The card counts of the banker cards
 
-    def guess_banker(self, remaining_cards, banker_id, banker_cards):
+        Returns:
+            (numpy.array): The banker cards if the player is the banker,
+                otherwise all the cards that the player has not seen
+        '''
         if self.player_id == banker_id:
-            return banker_cards
-        else:
-            cards = remaining_cards.copy()
-            for card in self.current_hand:
-                cards.remove(card)
-            return cards
\ No newline at end of file
+            return banker_counts.copy()
+        return unknown_counts[self.player_id].copy()
@@ -8,18 +8,33 @@ import random
 
 from rlcard.games.tractor import Dealer
 from rlcard.games.tractor.utils import TRUMP_CANDIDATE_STR
-from rlcard.games.tractor.utils import is_same_suit, calc_score, get_suit
+from rlcard.games.tractor.utils import is_same_suit, calc_score, get_suit, get_card_counts
+from rlcard.games.tractor.action_table import RANK_SUIT
+from rlcard.games.tractor.factored_action import get_unit_size
+
+# The other players of each player, in the order of `TractorPlayer.get_offseted_current_round`
+OTHER_IDS = np.array([[(player_id + offset) % 4 for offset in (1, 2, 3)] for player_id in range(4)])
+# The index of a player in the beliefs of each player of its `OTHER_IDS`
+SELF_SLOTS = np.array([2, 1, 0])
 
 class TractorRound(object):
     ''' Round stores the id the ongoing round and can call other Classes' functions to keep the game running
     '''
 
-    def __init__(self, np_random):
+    def __init__(self, np_random, allow_step_back=False):
         ''' When the game starts, round id should be 1
+
+        Args:
+            np_random (numpy.random.RandomState): The random state
+            allow_step_back (boolean): Whether to record the undo log of step_back
         '''
         self.np_random = np_random
+        self.allow_step_back = allow_step_back
         self.trace = []
 
+        # The changes of each proceed_round(), undone by step_back()
+        self.undo_log = []
+
         self.greater_player = None
         self.first_player = None
         self.current_player = None
@@ -49,10 +64,20 @@ class TractorRound(object):
         self.first_player = self.current_player
         self.greater_player = self.current_player
 
-        self.suit_avail = [[True, True, True, True, True], [True, True, True, True, True], [True, True, True, True, True], [True, True, True, True, True]]
+        self.suit_avail = np.ones((4, 5), dtype=bool)
         self.remaining_cards = []
         self.remaining_cards.extend(self.dealer.deck)
 
+        # The beliefs as card counts, updated by every proceed_round():
+        # unknown_counts[i] are the cards that player i has not seen, and
+        # belief_counts[i][j] are the ones of them that player OTHER_IDS[i][j]
+        # may hold, i.e., not of the suits that this player has missed
+        self.remaining_counts = get_card_counts([self.remaining_cards])[0].astype(np.uint8)
+        self.banker_counts = get_card_counts([self.dealer.deck[100:108]])[0].astype(np.uint8)
+        self.unknown_counts = self.remaining_counts - get_card_counts([player.current_hand for player in players]).astype(np.uint8)
+        self.unknown_counts[banker_id] -= self.banker_counts
+        self.belief_counts = np.repeat(self.unknown_counts[:, None], 3, axis=1)
+
         self.public = {'trump': self.trump,
                        'banker_id': self.banker_id,
                        'banker_cards': self.dealer.deck[100:108],
@@ -64,7 +89,10 @@ class TractorRound(object):
                        'first_player_id': self.first_player.player_id,
                        'greater_player_id': self.greater_player.player_id,
                        'suit_avail': self.suit_avail,
-                       'remaining_cards': self.remaining_cards}
+                       'remaining_cards': self.remaining_cards,
+                       'banker_counts': self.banker_counts,
+                       'unknown_counts': self.unknown_counts,
+                       'belief_counts': self.belief_counts}
 
     def proceed_round(self, player, action, judger):
         ''' Call other Classes's functions to keep one round running
@@ -77,6 +105,10 @@ class TractorRound(object):
             int: player id who plays next
             bool: if game is over
         '''
+        first_player_id = self.first_player.player_id
+        greater_player_id = self.greater_player.player_id
+        played_player_in_round = self.played_player_in_round
+
         # play cards
         (self.greater_player, played_cards) = player.play(action, self.first_player, self.greater_player, judger, self.trump)
 
@@ -84,19 +116,30 @@ class TractorRound(object):
         self.current_round[player.player_id] = played_cards
 
         # update the overall remaining cards list
+        removed_indexes = []
         for card in played_cards:
-            self.remaining_cards.remove(
-                card)
+            index = self.remaining_cards.index(card)
+            del self.remaining_cards[index]
+            removed_indexes.append(index)
+        played_counts = get_card_counts([played_cards])[0].astype(np.uint8)
+        self._add_played_counts(player.player_id, played_counts, -1)
 
         # update missing suit info of the current player
+        flipped_suit = None
         if (self.played_player_in_round != 0):
             if not is_same_suit(self.current_round[self.first_player.player_id][0], played_cards[-1]):
                 missing_suit = get_suit(self.current_round[self.first_player.player_id][0])
-                self.suit_avail[player.player_id][missing_suit] = False
+                if self.suit_avail[player.player_id][missing_suit]:
+                    flipped_suit = missing_suit
+                    self.suit_avail[player.player_id][missing_suit] = False
+                    # The others know that the player holds no card of the suit
+                    observers = OTHER_IDS[player.player_id]
+                    self.belief_counts[observers, SELF_SLOTS] *= RANK_SUIT != missing_suit
 
         self.played_player_in_round += 1
 
         end_of_game = False
+        ended_round = None
         if self.played_player_in_round < 4:
             # current round isn't ended
             next_id = (player.player_id + 1) % 4
@@ -111,7 +154,10 @@ class TractorRound(object):
                 end_of_game = True
                 # calculate score from banker
                 banker_score = calc_score(self.dealer.deck[100:108], self.trump)
-                banker_score = banker_score * (2 ** len(self.greater_player.played_cards))
+                # The banker cards count 2, 4 or 16 times by the largest unit of
+                # the last trick, a single, a pair or a tractor of any length
+                unit_size = get_unit_size(get_card_counts([self.greater_player.played_cards])[0], judger.trump_id)
+                banker_score = banker_score * (2 ** min(unit_size, 4))
                 score = score + banker_score
 
             self.score[self.greater_player.player_id % 2] += score
@@ -124,14 +170,80 @@ class TractorRound(object):
 
             # reset round status with next player
             next_id = self.greater_player.player_id
+            ended_round = list(self.current_round)
             self.reset(self.greater_player)
 
+        if self.allow_step_back:
+            self.undo_log.append((player.player_id, removed_indexes, played_counts, flipped_suit, first_player_id,
+                                  greater_player_id, played_player_in_round, ended_round))
+
         self.public['current_player_id'] = next_id
         self.public['first_player_id'] = self.first_player.player_id
         self.public['greater_player_id'] = self.greater_player.player_id
         
         return next_id, end_of_game
 
+    def step_back(self, players):
+        ''' Reverse the last proceed_round(). Only the changes recorded in
+        the undo log are reverted, so the cost is in the number of cards played
+
+        Args:
+            players (list): list of TractorPlayer objects
+
+        Returns:
+            int: the id of the player of the last action
+            list: the cards played by the last action
+        '''
+        (player_id, removed_indexes, played_counts, flipped_suit, first_player_id,
+         greater_player_id, played_player_in_round, ended_round) = self.undo_log.pop()
+        _, played_cards = self.trace.pop()
+
+        if ended_round is not None:
+            for i in range(4):
+                self.current_round[i] = ended_round[i]
+            for team, score in enumerate(self.score_trace.pop()):
+                self.score[team] -= score
+        self.current_round[player_id] = None
+        self.played_player_in_round = played_player_in_round
+
+        for index, card in zip(reversed(removed_indexes), reversed(played_cards)):
+            self.remaining_cards.insert(index, card)
+        if flipped_suit is not None:
+            self.suit_avail[player_id][flipped_suit] = True
+            observers = OTHER_IDS[player_id]
+            self.belief_counts[observers, SELF_SLOTS] = np.where(RANK_SUIT == flipped_suit,
+                                                                 self.unknown_counts[observers],
+                                                                 self.belief_counts[observers, SELF_SLOTS])
+        self._add_played_counts(player_id, played_counts, 1)
+
+        self.current_player = players[player_id]
+        self.first_player = players[first_player_id]
+        self.greater_player = players[greater_player_id]
+        self.public['current_player_id'] = player_id
+        self.public['first_player_id'] = first_player_id
+        self.public['greater_player_id'] = greater_player_id
+        return player_id, played_cards
+
+    def _add_played_counts(self, player_id, counts, sign):
+        ''' Remove (sign -1) or restore (sign 1) the cards played by a player
+        from the remaining cards and from the beliefs of the other players
+
+        Args:
+            player_id (int): The id of the player who played the cards
+            counts (numpy.array): The card counts of the played cards
+            sign (int): -1 to remove the cards, 1 to restore them
+        '''
+        observers = OTHER_IDS[player_id]
+        avail = self.suit_avail[OTHER_IDS[observers]][..., RANK_SUIT]
+        if sign < 0:
+            self.remaining_counts -= counts
+            self.unknown_counts[observers] -= counts
+            self.belief_counts[observers] -= counts * avail
+        else:
+            self.remaining_counts += counts
+            self.unknown_counts[observers] += counts
+            self.belief_counts[observers] += counts * avail
+
     def calc_score_in_round(self):
         cards = functools.reduce(lambda z,y : z + y, self.current_round)
         return calc_score(cards, self.trump)
@@ -5,6 +5,7 @@ from tqdm import tqdm
 import functools
 
 from rlcard.core import Card
+from rlcard.utils.utils import encode_counts
 
 CARD_STR = [
             '2S', '3S', '4S', '5S', '6S', '7S', '8S', '9S', 'TS', 'JS', 'QS', 'KS', 'AS',
@@ -226,6 +227,8 @@ def sort_units(unit_1, unit_2, is_get_score, pair_first, suit_sequence, trump):
         current_hand: list of card string
         playable_cards: list of list of card string
         suit_sequence: list of int, always length 5
+    The players pick the cards with `action_table.get_pass_cards`, which
+    sorts with the same keys in a lexsort
 '''
 def get_pass_cards_sequence(hand, playable_cards, is_get_score, pair_first, suit_sequence, trump):
     units = []
@@ -252,23 +255,28 @@ def get_pass_cards_sequence(hand, playable_cards, is_get_score, pair_first, suit
     sorted_card_list = [item for sublist in units for item in sublist]
     return sorted_card_list
 
+def get_card_counts(cards_list):
+    ''' Count the cards of each list over `CARD_RANK_STR`
+
+    Args:
+        cards_list (list): list of list of string of cards, None is treated as no cards
+
+    Returns:
+        (numpy.array): A (len(cards_list), 72) array of card counts
+    '''
+    num_ranks = len(CARD_RANK_STR)
+    ranks = [CARD_RANK_DICT[card] + index * num_ranks
+             for index, cards in enumerate(cards_list) if cards for card in cards]
+    return np.bincount(ranks, minlength=len(cards_list) * num_ranks).reshape(len(cards_list), num_ranks)
+
 def encode_cards(plane, cards):
     ''' Encode cards and represerve it into plane.
 
     Args:
+        plane (numpy.array): 3*72 array, plane[k][rank] is set to 1 if there are k cards of the rank
         cards (string): list of string of cards
     '''
-    if not cards:
-        return None
-    
-    for card in cards:
-        rank = CARD_RANK_DICT[card]
-        if plane[0][rank] == 1:
-            plane[0][rank] = 0
-            plane[1][rank] = 1
-        elif plane[1][rank] == 1:
-            plane[1][rank] = 0
-            plane[2][rank] = 1
+    encode_counts(get_card_counts([cards])[0], 3, out=plane)
 
 
 def reorganize_with_payoff_trace(trajectories, payoffs_with_trace, payoffs):
@@ -329,6 +337,61 @@ def tournament_tractor(env, num):
         payoffs[i] /= num
     return payoffs
 
+def tournament_tractor_duplicate(env, num):
+    ''' Evaluate the performance of the agents with duplicate deals. Each deal
+        is played twice, the second time with the teams swapped, i.e., the
+        agent of seat i plays the cards of seat i+1, so that the luck of the
+        deal cancels out over the pair of games
+
+    Args:
+        env (Env class): The environment to be evaluated.
+        num (int): The number of deals. Each one is played twice.
+
+    Returns:
+        (dict): The statistics of the payoffs of the agent of each seat,
+            averaged over each pair of games, see `rlcard.utils.evaluation.aggregate`.
+            A team wins a deal if it scores more than the other team over the pair
+    '''
+    from rlcard.utils.evaluation import aggregate
+
+    agents = env.agents
+    swapped_agents = agents[-1:] + agents[:-1]
+    payoffs = np.zeros((num, env.player_num))
+
+    print()
+    for iter in range(num):
+        print('\rEvaluating {}/{} deals...'.format(iter, num), end='')
+        state, player_id = env.reset()
+        hands = [player.initial_hand for player in env.game.players]
+        trump = env.game.round.trump
+        _payoffs = play_tractor_game(env, state, player_id)
+
+        env.set_agents(swapped_agents)
+        try:
+            state = env.reset_predefine_state(hands, trump)
+            swapped_payoffs = play_tractor_game(env, state, env.get_player_id())
+        finally:
+            env.set_agents(agents)
+        # The agent of seat i is at seat i+1 in the swapped game
+        payoffs[iter] = (_payoffs + np.roll(swapped_payoffs, -1)) / 2
+    return aggregate(payoffs)
+
+def play_tractor_game(env, state, player_id):
+    ''' Play the rest of a game for evaluation
+
+    Args:
+        env (Env class): The environment
+        state (dict): The current state
+        player_id (int): The current player
+
+    Returns:
+        (numpy.array): The payoffs of the players
+    '''
+    while not env.is_over():
+        action, _ = env.agents[player_id].eval_step(state)
+        state, player_id = env.step(action, env.agents[player_id].use_raw)
+    return np.asarray(env.get_payoffs(), dtype=np.float64)
+
 class MovingAvg():
     def __init__(self, m_len):
         self.arr = []
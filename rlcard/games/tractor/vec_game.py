@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+''' Implement a vectorized Tractor Game class that plays a batch of games
+in lockstep. Hands, played cards and remaining cards are stored as count
+vectors over `CARD_RANK_STR`, so that legal actions, scores and
+observations are computed with NumPy operations across the whole batch.
+'''
+
+import numpy as np
+
+from rlcard.utils.utils import encode_counts
+from rlcard.games.tractor.utils import CARD_STR, CARD_RANK_DICT, TRUMP_CANDIDATE_STR, NUM_DICT
+from rlcard.games.tractor.action_table import NUM_RANKS, NUM_ACTIONS, NUM_CARD_ACTIONS, SCOR_ACTION_START
+from rlcard.games.tractor.action_table import RANK_SUIT, SCORE_TABLES, TRUMP_SCORE_TABLE_ID
+from rlcard.games.tractor.action_table import ACTION_LEN, ACTION_SUIT, ACTION_FIRST, ACTION_DELTA, playable_mask
+
+BANKER_CARD_NUM = 8
+HAND_NUM = (2 * len(CARD_STR) - BANKER_CARD_NUM) // 4
+MAX_TRICK_NUM = HAND_NUM
+
+def _trump_deck(trump):
+    ''' Rank indexes of the two decks of cards after applying the trump, the
+        same mapping as `TractorDealer`
+    '''
+    deck = []
+    for card in CARD_STR + CARD_STR:
+        if card[0] == trump[0]:
+            card = 'N' + card[1]
+        if card[1] == trump[1]:
+            card = card[0] + 'J'
+        deck.append(CARD_RANK_DICT[card])
+    return deck
+
+TRUMP_NUM = np.array([NUM_DICT[trump[0]] for trump in TRUMP_CANDIDATE_STR])
+TRUMP_DECK = np.array([_trump_deck(trump) for trump in TRUMP_CANDIDATE_STR])
+
+
+def legal_actions_mask(playable, is_first, target_len, target_suit):
+    ''' Get the legal actions from the playable card actions, following
+        `get_valid_cards`
+
+    Args:
+        playable (numpy.array): (..., 273) boolean mask of playable card actions
+        is_first (numpy.array): Whether the player is the first player of the round
+        target_len (numpy.array): The number of cards played by the first player
+        target_suit (numpy.array): The suit of the cards played by the first player
+
+    Returns:
+        (numpy.array): A (..., 283) boolean mask over all the actions
+    '''
+    is_first = np.asarray(is_first)[..., None]
+    target_len = np.asarray(target_len)[..., None]
+    target_suit = np.asarray(target_suit)[..., None]
+    card_len = ACTION_LEN[:NUM_CARD_ACTIONS]
+    card_suit = ACTION_SUIT[:NUM_CARD_ACTIONS]
+
+    same_suit = playable & (card_suit == target_suit)
+    matched = same_suit & (card_len == target_len)
+    has_matched = matched.any(axis=-1, keepdims=True)
+    # Trump cards can beat only if there are no cards of the target suit
+    can_trump = ~has_matched & ~same_suit.any(axis=-1, keepdims=True) & (target_suit != 4)
+    trump_matched = playable & (card_suit == 4) & (card_len == target_len)
+
+    legal_actions = np.zeros(playable.shape[:-1] + (NUM_ACTIONS,), dtype=bool)
+    legal_actions[..., :NUM_CARD_ACTIONS] = np.where(is_first, playable,
+        np.where(has_matched, matched, trump_matched & can_trump))
+    legal_actions[..., NUM_CARD_ACTIONS:] = ~is_first & ~has_matched
+    return legal_actions
+
+
+class TractorVecGame(object):
+    ''' Plays `num` Tractor games in lockstep. It follows the same rules as
+        `TractorGame`, but all the states are stored as arrays with the games
+        as the first dimension, e.g., the hands are held in a
+        (num, 4, 72) uint8 array of card counts.
+
+        Player 0 is always the banker as in `TractorDealer`.
+    '''
+
+    def __init__(self, num, np_random=None):
+        self.num = num
+        self.num_players = 4
+        self.np_random = np.random.RandomState() if np_random is None else np_random
+
+    def init_game(self, trumps=None, decks=None):
+        ''' Deal cards and start all the games
+
+        Args:
+            trumps (list): Optional index of each game's trump in `TRUMP_CANDIDATE_STR`
+            decks (numpy.array): Optional (num, 108) rank indexes of the dealt decks, already
+              mapped with the trump. The first 100 cards are dealt to the players and the last
+              8 are the banker cards. Random decks are dealt if not provided
+
+        Returns:
+            (numpy.array): The id of the current player of each game
+        '''
+        num = self.num
+        games = np.arange(num)
+        if trumps is None:
+            trumps = self.np_random.randint(len(TRUMP_CANDIDATE_STR), size=num)
+        self.trumps = np.asarray(trumps)
+        if decks is None:
+            order = np.argsort(self.np_random.rand(num, 2 * len(CARD_STR)), axis=1)
+            decks = np.take_along_axis(TRUMP_DECK[self.trumps], order, axis=1)
+        decks = np.asarray(decks)
+
+        self.hands = np.zeros((num, self.num_players, NUM_RANKS), dtype=np.uint8)
+        for player_id in range(self.num_players):
+            cards = decks[:, player_id*HAND_NUM:(player_id+1)*HAND_NUM]
+            np.add.at(self.hands, (games[:, None], player_id, cards), 1)
+        self.banker_cards = np.zeros((num, NUM_RANKS), dtype=np.uint8)
+        np.add.at(self.banker_cards, (games[:, None], decks[:, 4*HAND_NUM:]), 1)
+        self.remaining_cards = self.hands.sum(axis=1, dtype=np.uint8) + self.banker_cards
+        self.round_cards = np.zeros((num, self.num_players, NUM_RANKS), dtype=np.uint8)
+        self.suit_avail = np.ones((num, self.num_players, 5), dtype=bool)
+
+        self.score_tables = SCORE_TABLES[TRUMP_SCORE_TABLE_ID[self.trumps]]
+        self.banker_score = (self.banker_cards * self.score_tables).sum(axis=1)
+        # The winning line ignores the banker cards as in `TractorGame`
+        dealt_cards = self.remaining_cards - self.banker_cards
+        self.total_score = (dealt_cards * SCORE_TABLES[0]).sum(axis=1)
+
+        self.current_player = np.zeros(num, dtype=int)
+        self.greater_player = np.zeros(num, dtype=int)
+        self.greater_rank = np.zeros(num, dtype=int)
+        self.played_player_in_round = np.zeros(num, dtype=int)
+        self.target_len = np.zeros(num, dtype=int)
+        self.target_suit = np.zeros(num, dtype=int)
+
+        self.score = np.zeros((num, 2), dtype=int)
+        self.score_trace = np.zeros((num, MAX_TRICK_NUM, 2), dtype=int)
+        self.trick_num = np.zeros(num, dtype=int)
+        self.over = np.zeros(num, dtype=bool)
+
+        return self.current_player.copy()
+
+    def step(self, actions):
+        ''' Perform one action in each game that is not over
+
+        Args:
+            actions (numpy.array): The action id of the current player of each game.
+              The entries of the games that are over are ignored
+
+        Returns:
+            (numpy.array): The id of the next player of each game
+        '''
+        games = np.flatnonzero(~self.over)
+        actions = np.asarray(actions)[games]
+        players = self.current_player[games]
+        is_card = actions < NUM_CARD_ACTIONS
+
+        played = ACTION_DELTA[actions]
+        last_suit = ACTION_SUIT[actions]
+        if not is_card.all():
+            is_pass = ~is_card
+            played[is_pass], last_suit[is_pass] = self._pass_cards(games[is_pass], players[is_pass], actions[is_pass])
+        self.hands[games, players] -= played
+        self.round_cards[games, players] = played
+        self.remaining_cards[games] -= played
+
+        # The first player of the round sets the target hand
+        is_first = self.played_player_in_round[games] == 0
+        first_games = games[is_first]
+        self.target_len[first_games] = ACTION_LEN[actions[is_first]]
+        self.target_suit[first_games] = ACTION_SUIT[actions[is_first]]
+        self.greater_player[first_games] = players[is_first]
+        self.greater_rank[first_games] = ACTION_FIRST[actions[is_first]]
+
+        # Update missing suit info and the greater player
+        missing = ~is_first & (last_suit != self.target_suit[games])
+        self.suit_avail[games[missing], players[missing], self.target_suit[games[missing]]] = False
+        greater = ~is_first & is_card & (ACTION_FIRST[actions] > self.greater_rank[games])
+        self.greater_player[games[greater]] = players[greater]
+        self.greater_rank[games[greater]] = ACTION_FIRST[actions[greater]]
+
+        self.played_player_in_round[games] += 1
+        self.current_player[games] = (players + 1) % self.num_players
+
+        # End of the round
+        ended = self.played_player_in_round[games] == self.num_players
+        if ended.any():
+            self._end_round(games[ended], players[ended])
+
+        return self.current_player.copy()
+
+    def _end_round(self, games, last_players):
+        round_cards = self.round_cards[games].sum(axis=1, dtype=int)
+        score = (round_cards * self.score_tables[games]).sum(axis=1)
+
+        end_of_game = self.hands[games, last_players].sum(axis=1, dtype=int) == 0
+        score += end_of_game * self.banker_score[games] * (2 ** self.target_len[games])
+
+        team = self.greater_player[games] % 2
+        self.score[games, team] += score
+        self.score_trace[games, self.trick_num[games], team] = score
+        self.trick_num[games] += 1
+
+        self.round_cards[games] = 0
+        self.played_player_in_round[games] = 0
+        self.current_player[games] = self.greater_player[games]
+        self.over[games[end_of_game]] = True
+
+    def _suit_keys(self, size):
+        ''' Random sorting keys of the suits that are neither the target suit
+            nor the preferred second suit of 'pass_*' and 'scor_*' actions
+        '''
+        return self.np_random.rand(size, 5)
+
+    def _pass_cards(self, games, players, actions):
+        ''' Pick the cards of 'pass_*' and 'scor_*' actions. The units (pairs and
+            singles) in hand are ordered with the same keys as `sort_units` and the
+            first cards are played
+
+        Returns:
+            (numpy.array): The played card counts
+            (numpy.array): The suit of the last played card
+        '''
+        rows = np.arange(len(games))
+        counts = self.hands[games, players].astype(int)
+        target_len = self.target_len[games][:, None]
+        target_suit = self.target_suit[games]
+        is_get_score = (actions >= SCOR_ACTION_START)[:, None]
+
+        # Target suit first, then the preferred suit, then the others randomly
+        suit_keys = self._suit_keys(len(games))
+        suit_keys[rows, ACTION_SUIT[actions]] = -1
+        suit_keys[rows, target_suit] = -2
+        suit_pos = np.argsort(np.argsort(suit_keys, axis=1, kind='stable'), axis=1)
+
+        scores = self.score_tables[games]
+        in_target_suit = RANK_SUIT[None, :] == target_suit[:, None]
+        keys = (
+            np.broadcast_to(np.arange(NUM_RANKS), counts.shape),
+            np.where(is_get_score, -scores, scores),
+            counts,
+            (scores > 0) != is_get_score,
+            np.where((target_len >= 2) & in_target_suit, -counts, 0),
+            suit_pos[:, RANK_SUIT],
+            counts == 0,
+        )
+        order = np.lexsort(keys, axis=-1)
+
+        sorted_counts = np.take_along_axis(counts, order, axis=1)
+        before = np.cumsum(sorted_counts, axis=1) - sorted_counts
+        taken = np.clip(target_len - before, 0, sorted_counts)
+        played = np.zeros_like(counts)
+        np.put_along_axis(played, order, taken, axis=1)
+
+        last = NUM_RANKS - 1 - np.argmax(taken[:, ::-1] > 0, axis=1)
+        last_suit = RANK_SUIT[order[rows, last]]
+        return played.astype(np.uint8), last_suit
+
+    def get_legal_actions(self, games=None):
+        ''' Get the legal actions of the current players
+
+        Args:
+            games (numpy.array): The ids of the games, all the games by default
+
+        Returns:
+            (numpy.array): A (len(games), action_num) boolean mask of legal actions
+        '''
+        if games is None:
+            games = np.arange(self.num)
+        hands = self.hands[games, self.current_player[games]]
+        playable = playable_mask(hands, self.trumps[games])
+        legal_actions = legal_actions_mask(playable, self.played_player_in_round[games] == 0,
+                                           self.target_len[games], self.target_suit[games])
+        legal_actions[self.over[games]] = False
+        return legal_actions
+
+    def get_obs(self, games=None, players=None, dtype=int):
+        ''' Get the observations of the players, the same as `TractorEnv._extract_state`
+
+        Args:
+            games (numpy.array): The ids of the games, all the games by default
+            players (numpy.array): The id of the player in each game, the current players by default
+
+        Returns:
+            (numpy.array): A (len(games), 9, 3, 72) array of observations
+        '''
+        if games is None:
+            games = np.arange(self.num)
+        if players is None:
+            players = self.current_player[games]
+        hands = self.hands[games, players]
+        remaining_cards = self.remaining_cards[games]
+        is_banker = (players == 0)[:, None]
+        unknown_cards = remaining_cards - hands - is_banker * self.banker_cards[games]
+
+        counts = np.zeros((len(games), 8, NUM_RANKS), dtype=np.uint8)
+        counts[:, 0] = hands
+        for offset in range(1, self.num_players):
+            others = (players + offset) % self.num_players
+            # Other players can not hold cards of the suits they have missed
+            avail = self.suit_avail[games, others][:, RANK_SUIT]
+            counts[:, offset] = unknown_cards * avail
+            counts[:, offset+3] = self.round_cards[games, others]
+        counts[:, 7] = np.where(is_banker, self.banker_cards[games], remaining_cards - hands)
+
+        obs = np.zeros((len(games), 9, 3, NUM_RANKS), dtype=dtype)
+        encode_counts(counts, 3, out=obs[:, :8])
+        obs[np.arange(len(games)), 8, 0, TRUMP_NUM[self.trumps[games]]] = 1
+        return obs
+
+    def get_trumps(self, games=None):
+        ''' Return the trump string of each game
+        '''
+        if games is None:
+            games = np.arange(self.num)
+        return [TRUMP_CANDIDATE_STR[trump] for trump in self.trumps[games]]
+
+    def get_payoffs(self):
+        ''' Return the payoffs of the players of each game, i.e., the final score
+            of the player's team as in `TractorJudger.judge_payoffs`
+        '''
+        return self.score[:, [0, 1, 0, 1]]
+
+    def get_winners(self):
+        ''' Return whether each team wins each game as in `TractorGame`
+        '''
+        return self.score > (self.total_score // 2)[:, None]
+
+    def get_score_trace(self, game_id):
+        ''' Return the score delta of each round of a game
+        '''
+        return self.score_trace[game_id][:self.trick_num[game_id]].tolist()
+
+    def get_player_num(self):
+        ''' Retrun the number of players in the game
+        '''
+        return self.num_players
+
+    def get_action_num(self):
+        ''' Return the number of possible actions in the game
+        '''
+        return NUM_ACTIONS
+
+    def is_over(self):
+        ''' Return whether each game is over
+        '''
+        return self.over.copy()
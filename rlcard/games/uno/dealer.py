@@ -1,12 +1,15 @@
 
+from rlcard.core import Journal
 from rlcard.games.uno.utils import init_deck
 
 
 class UnoDealer(object):
     ''' Initialize a uno dealer class
     '''
-    def __init__(self, np_random):
+    def __init__(self, np_random, journal=None):
         self.np_random = np_random
+        # The journal of the mutations for step_back
+        self.journal = journal if journal is not None else Journal(enabled=False)
         self.deck = init_deck()
         self.shuffle()
 
@@ -23,7 +26,7 @@ class UnoDealer(object):
             num (int): The number of cards to be dealed
         '''
         for _ in range(num):
-            player.hand.append(self.deck.pop())
+            self.journal.append(player.hand, self.journal.pop(self.deck))
 
     def flip_top_card(self):
         ''' Flip top card when a new game starts
@@ -1,12 +1,12 @@
-from copy import deepcopy
 import numpy as np
 
+from rlcard.core import Game, Journal
 from rlcard.games.uno import Dealer
 from rlcard.games.uno import Player
 from rlcard.games.uno import Round
 
 
-class UnoGame(object):
+class UnoGame(Game):
 
     def __init__(self, allow_step_back=False):
         self.allow_step_back = allow_step_back
@@ -26,8 +26,11 @@ class UnoGame(object):
         # Initalize payoffs
         self.payoffs = [0 for _ in range(self.num_players)]
 
+        # Save the hisory for stepping back to the last state.
+        self.history = Journal(self.allow_step_back)
+
         # Initialize a dealer that can deal cards
-        self.dealer = Dealer(self.np_random)
+        self.dealer = Dealer(self.np_random, journal=self.history)
 
         # Initialize four players to play the game
         self.players = [Player(i, self.np_random) for i in range(self.num_players)]
@@ -37,14 +40,14 @@ class UnoGame(object):
             self.dealer.deal_cards(player, 7)
 
         # Initialize a Round
-        self.round = Round(self.dealer, self.num_players, self.np_random)
+        self.round = Round(self.dealer, self.num_players, self.np_random, journal=self.history)
 
         # flip and perfrom top card
         top_card = self.round.flip_top_card()
         self.round.perform_top_card(self.players, top_card)
 
-        # Save the hisory for stepping back to the last state.
-        self.history = []
+        # The initialization is not undone
+        self.history.clear()
 
         player_id = self.round.current_player
         state = self.get_state(player_id)
@@ -63,29 +66,14 @@ class UnoGame(object):
                 (int): next plater's id
         '''
 
-        if self.allow_step_back:
-            # First snapshot the current state
-            his_dealer = deepcopy(self.dealer)
-            his_round = deepcopy(self.round)
-            his_players = deepcopy(self.players)
-            self.history.append((his_dealer, his_players, his_round))
+        # First record the mutations of the step
+        self.history.checkpoint()
 
         self.round.proceed_round(self.players, action)
         player_id = self.round.current_player
         state = self.get_state(player_id)
         return state, player_id
 
-    def step_back(self):
-        ''' Return to the previous state of the game
-
-        Returns:
-            (bool): True if the game steps back successfully
-        '''
-        if not self.history:
-            return False
-        self.dealer, self.players, self.round = self.history.pop()
-        return True
-
     def get_state(self, player_id):
         ''' Return player's state
 
@@ -1,17 +1,20 @@
+from rlcard.core import Journal
 from rlcard.games.uno.card import UnoCard
 from rlcard.games.uno.utils import cards2list, WILD, WILD_DRAW_4
 
 
 class UnoRound(object):
 
-    def __init__(self, dealer, num_players, np_random):
+    def __init__(self, dealer, num_players, np_random, journal=None):
         ''' Initialize the round class
 
         Args:
             dealer (object): the object of UnoDealer
             num_players (int): the number of players in game
+            journal (Journal): The journal of the game, no records if None
         '''
         self.np_random = np_random
+        self.journal = journal if journal is not None else Journal(enabled=False)
         self.dealer = dealer
         self.target = None
         self.current_player = 0
@@ -61,6 +64,7 @@ class UnoRound(object):
         if action == 'draw':
             self._perform_draw_action(players)
             return None
+        journal = self.journal
         player = players[self.current_player]
         card_info = action.split('-')
         color = card_info[0]
@@ -77,16 +81,16 @@ class UnoRound(object):
                 if color == card.color and trait == card.trait:
                     remove_index = index
                     break
-        card = player.hand.pop(remove_index)
+        card = journal.pop(player.hand, remove_index)
         if not player.hand:
-            self.is_over = True
-            self.winner = [self.current_player]
-        self.played_cards.append(card)
+            journal.setattr(self, 'is_over', True)
+            journal.setattr(self, 'winner', [self.current_player])
+        journal.append(self.played_cards, card)
 
         # perform the number action
         if card.type == 'number':
-            self.current_player = (self.current_player + self.direction) % self.num_players
-            self.target = card
+            journal.setattr(self, 'current_player', (self.current_player + self.direction) % self.num_players)
+            journal.setattr(self, 'target', card)
 
         # perform non-number action
         else:
@@ -159,11 +163,13 @@ class UnoRound(object):
     def replace_deck(self):
         ''' Add cards have been played to deck
         '''
-        self.dealer.deck.extend(self.played_cards)
+        # The new deck is shuffled, the old lists are kept for step_back
+        self.journal.setattr(self.dealer, 'deck', self.dealer.deck + self.played_cards)
         self.dealer.shuffle()
-        self.played_cards = []
+        self.journal.setattr(self, 'played_cards', [])
 
     def _perform_draw_action(self, players):
+        journal = self.journal
         # replace deck if there is no card in draw pile
         if not self.dealer.deck:
             self.replace_deck()
@@ -171,29 +177,29 @@ class UnoRound(object):
             #self.winner = UnoJudger.judge_winner(players)
             #return None
 
-        card = self.dealer.deck.pop()
+        card = journal.pop(self.dealer.deck)
 
         # draw a wild card
         if card.type == 'wild':
-            card.color = self.np_random.choice(UnoCard.info['color'])
-            self.target = card
-            self.played_cards.append(card)
-            self.current_player = (self.current_player + self.direction) % self.num_players
+            journal.setattr(card, 'color', self.np_random.choice(UnoCard.info['color']))
+            journal.setattr(self, 'target', card)
+            journal.append(self.played_cards, card)
+            journal.setattr(self, 'current_player', (self.current_player + self.direction) % self.num_players)
 
         # draw a card with the same color of target
         elif card.color == self.target.color:
             if card.type == 'number':
-                self.target = card
-                self.played_cards.append(card)
-                self.current_player = (self.current_player + self.direction) % self.num_players
+                journal.setattr(self, 'target', card)
+                journal.append(self.played_cards, card)
+                journal.setattr(self, 'current_player', (self.current_player + self.direction) % self.num_players)
             else:
-                self.played_cards.append(card)
+                journal.append(self.played_cards, card)
                 self._preform_non_number_action(players, card)
 
         # draw a card with the diffrent color of target
         else:
-            players[self.current_player].hand.append(card)
-            self.current_player = (self.current_player + self.direction) % self.num_players
+            journal.append(players[self.current_player].hand, card)
+            journal.setattr(self, 'current_player', (self.current_player + self.direction) % self.num_players)
 
     def _preform_non_number_action(self, players, card):
         current = self.current_player
@@ -202,7 +208,7 @@ class UnoRound(object):
 
         # perform reverse card
         if card.trait == 'reverse':
-            self.direction = -1 * direction
+            self.journal.setattr(self, 'direction', -1 * direction)
 
         # perfrom skip card
         elif card.trait == 'skip':
@@ -227,5 +233,5 @@ class UnoRound(object):
                 #return None
             self.dealer.deal_cards(players[(current + direction) % num_players], 4)
             current = (current + direction) % num_players
-        self.current_player = (current + self.direction) % num_players
-        self.target = card
+        self.journal.setattr(self, 'current_player', (current + self.direction) % num_players)
+        self.journal.setattr(self, 'target', card)
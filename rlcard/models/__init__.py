@@ -2,23 +2,14 @@
 '''
 
 from rlcard.models.registration import register, load
-import subprocess
-import sys
-from distutils.version import LooseVersion
+from rlcard.utils.backends import is_tensorflow_available, is_torch_available
 
-reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
-
-if 'tensorflow-gpu' in installed_packages or 'tensorflow' in installed_packages:
-    import tensorflow as tf
-    if LooseVersion(tf.__version__) < LooseVersion('1.14.0') \
-            or LooseVersion(tf.__version__) >= LooseVersion('2.0.0'):
-        print('WAINING - RLCard supports Tensorflow >=1.14 and <2.0\nThe detected version is {} \nIf the models can not be loaded, please install Tensorflow via\n$ pip install rlcard[tensorflow]\n'.format(tf.__version__))
+if is_tensorflow_available():
     register(
         model_id = 'leduc-holdem-nfsp',
         entry_point='rlcard.models.pretrained_models:LeducHoldemNFSPModel')
 
-if 'torch' in installed_packages:
+if is_torch_available():
     register(
         model_id = 'leduc-holdem-nfsp-pytorch',
         entry_point='rlcard.models.pretrained_models:LeducHoldemNFSPPytorchModel')
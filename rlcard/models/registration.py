@@ -12,8 +12,10 @@ class ModelSpec(object):
             entry_point (string): a string that indicates the location of the model class
         '''
         self.model_id = model_id
-        mod_name, class_name = entry_point.split(':')
-        self._entry_point = getattr(importlib.import_module(mod_name), class_name)
+        # The module is imported at the first `load`, as the models may
+        # depend on Tensorflow or PyTorch
+        self._mod_name, self._class_name = entry_point.split(':')
+        self._entry_point = None
 
     def load(self):
         ''' Instantiates an instance of the model
@@ -21,6 +23,8 @@ class ModelSpec(object):
         Returns:
             Model (Model): an instance of the Model
         '''
+        if self._entry_point is None:
+            self._entry_point = getattr(importlib.import_module(self._mod_name), self._class_name)
         model = self._entry_point()
         return model
 
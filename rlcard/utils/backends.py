@@ -0,0 +1,45 @@
+''' Detect the deep learning backends without importing them
+'''
+
+import importlib.util
+from distutils.version import LooseVersion
+
+_available = {}
+
+def is_available(module_name):
+    ''' Check whether a module can be imported. The module is only searched
+        for, not imported, and the result is cached
+
+    Args:
+        module_name (str): The name of the top-level module
+
+    Returns:
+        (boolean): True if the module is installed
+    '''
+    if module_name not in _available:
+        _available[module_name] = importlib.util.find_spec(module_name) is not None
+    return _available[module_name]
+
+def is_tensorflow_available():
+    ''' Check whether Tensorflow (tensorflow or tensorflow-gpu) is installed
+    '''
+    return is_available('tensorflow')
+
+def is_torch_available():
+    ''' Check whether PyTorch is installed
+    '''
+    return is_available('torch')
+
+_checked_tensorflow_version = False
+
+def check_tensorflow_version():
+    ''' Import Tensorflow and warn once if its version is not supported
+    '''
+    global _checked_tensorflow_version
+    if _checked_tensorflow_version:
+        return
+    _checked_tensorflow_version = True
+    import tensorflow as tf
+    if LooseVersion(tf.__version__) < LooseVersion('1.14.0') \
+            or LooseVersion(tf.__version__) >= LooseVersion('2.0.0'):
+        print('WAINING - RLCard supports Tensorflow >=1.14 and <2.0\nThe detected version is {} \nIf the models can not be loaded, please install Tensorflow via\n$ pip install rlcard[tensorflow]\n'.format(tf.__version__))
@@ -0,0 +1,249 @@
+''' Actor/learner training on multiple processes
+
+The actors play games in their own processes with copies of the learning
+agent and push the transitions into a queue, while the learner (the calling
+process) feeds them to the agent, which trains on them as usual. The
+learner publishes the weights of the agent into a shared memory array every
+few episodes, and the actors reload them when the version changes. Only the
+networks that act are shared, i.e., not the target networks of DQN.
+
+The agent should implement `get_state_dict` and `load`, e.g., the PyTorch
+DQN and NFSP agents. For NFSP, the samples of the average policy, which are
+stored when the actions are taken, are sent back with the transitions.
+'''
+
+import queue
+import multiprocessing as mp
+import numpy as np
+
+from rlcard.utils.utils import set_global_seed
+
+
+class ActorLearner(object):
+    ''' Train an agent with games played by actor processes
+
+    Example:
+
+        trainer = ActorLearner('tractor', functools.partial(DQNAgentPytorch, ...), actor_num=8)
+        for episode, payoffs in trainer.train(episode_num):
+            ...
+    '''
+
+    def __init__(self, env_id, agent_fn, actor_num=2, config=None, agents_fn=None,
+                 update_every=10, queue_size=64):
+        ''' Initialize the learner. The actors are started by `train`
+
+        Args:
+            env_id (string): The id of the environment, e.g., 'tractor'
+            agent_fn (callable): Build the learning agent. It is called in every
+                process, so it should be picklable, e.g., a module level function
+                or a functools.partial of the agent class
+            actor_num (int): The number of actor processes
+            config (dict): The config of the environments. The seed of actor i,
+                if any, is increased by (i+1)*1000
+            agents_fn (callable): Build the agents of the seats from the learning
+                agent and the environment. The transitions of the seats of the
+                learning agent are trained on. The agent plays all the seats if None
+            update_every (int): Publish the weights every X episodes
+            queue_size (int): The maximum number of episodes waiting in the queue
+        '''
+        self.env_id = env_id
+        self.agent_fn = agent_fn
+        self.actor_num = actor_num
+        self.config = {} if config is None else dict(config)
+        self.agents_fn = agents_fn
+        self.update_every = update_every
+        self.queue_size = queue_size
+
+        self.agent = agent_fn()
+        self.timestep = 0
+        self.ctx = mp.get_context('spawn')
+        self.weights = SharedWeights(self.agent, self.ctx)
+
+    def train(self, episode_num):
+        ''' Train the agent for a number of episodes
+
+        Args:
+            episode_num (int): The number of episodes
+
+        Returns:
+            (generator): (episode, payoffs) after each episode is fed to the agent
+        '''
+        self.weights.publish(self.agent)
+        queue_ = self.ctx.Queue(self.queue_size)
+        stop = self.ctx.Event()
+        ps = [self.ctx.Process(target=actor_worker,
+                               args=(i, self.env_id, self.agent_fn, self.config, self.agents_fn,
+                                     self.weights, queue_, stop))
+              for i in range(self.actor_num)]
+        for p in ps:
+            p.daemon = True
+            p.start()
+
+        try:
+            for episode in range(episode_num):
+                transitions, policy_samples, payoffs = queue_.get()
+                for ts in transitions:
+                    self.agent.feed(ts)
+                self.timestep += len(transitions)
+                add_policy_samples(self.agent, policy_samples)
+                if episode % self.update_every == self.update_every - 1:
+                    self.weights.publish(self.agent)
+                yield episode, payoffs
+        finally:
+            stop.set()
+            # Empty the queue so that the actors blocked on it can exit
+            while any(p.is_alive() for p in ps):
+                try:
+                    queue_.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            for p in ps:
+                p.join()
+
+
+class SharedWeights(object):
+    ''' The weights of the acting networks of an agent, flattened into a
+        float32 shared memory array with a version number
+    '''
+
+    def __init__(self, agent, ctx):
+        ''' Allocate the array for the weights of the agent
+
+        Args:
+            agent (object): The agent
+            ctx (multiprocessing.context.BaseContext): The multiprocessing context
+        '''
+        size = sum(tensor.numel() for _, tensor in iter_state(acting_state(agent.get_state_dict())))
+        self.array = ctx.RawArray('f', size)
+        self.version = ctx.RawValue('q', 0)
+        self.total_t = ctx.RawValue('q', 0)
+        self.lock = ctx.Lock()
+
+    def publish(self, agent):
+        ''' Write the weights of the agent
+
+        Args:
+            agent (object): The learning agent
+        '''
+        flat = np.concatenate([tensor.detach().cpu().numpy().astype(np.float32).ravel()
+                               for _, tensor in iter_state(acting_state(agent.get_state_dict()))])
+        with self.lock:
+            np.frombuffer(self.array, dtype=np.float32)[:] = flat
+            self.total_t.value = agent.total_t
+            self.version.value += 1
+
+    def load(self, agent, version=0):
+        ''' Load the weights into a copy of the agent if they are newer
+
+        Args:
+            agent (object): The copy of the agent
+            version (int): The version of the weights of the copy
+
+        Returns:
+            (int): The version of the weights of the copy
+        '''
+        import torch
+
+        if self.version.value == version:
+            return version
+        with self.lock:
+            flat = np.frombuffer(self.array, dtype=np.float32).copy()
+            total_t = self.total_t.value
+            version = self.version.value
+        # The other networks of the copy are loaded back unchanged
+        state_dict = agent.get_state_dict()
+        offset = 0
+        for (key, name), tensor in iter_state(acting_state(state_dict)):
+            values = flat[offset:offset+tensor.numel()].reshape(tuple(tensor.shape))
+            state_dict[key][name] = torch.from_numpy(values).to(tensor.dtype)
+            offset += tensor.numel()
+        agent.load(state_dict)
+        # The exploration of the actors follows the schedule of the learner
+        agent.total_t = total_t
+        if hasattr(agent, '_rl_agent'):
+            agent._rl_agent.total_t = total_t
+        return version
+
+
+def acting_state(state_dict):
+    ''' Drop the target networks from the state dict of an agent
+
+    Args:
+        state_dict (dict): A dict of model states, as from `get_state_dict`
+
+    Returns:
+        (dict): The states of the networks that are used to act
+    '''
+    return {key: value for key, value in state_dict.items() if not key.endswith('_target_estimator')}
+
+def iter_state(state_dict):
+    ''' Iterate over the tensors of the state dict of an agent in a fixed order
+
+    Args:
+        state_dict (dict): A dict of model states, as from `get_state_dict`
+
+    Returns:
+        (generator): ((key, name), tensor) of each tensor
+    '''
+    for key in sorted(state_dict):
+        for name in sorted(state_dict[key]):
+            yield (key, name), state_dict[key][name]
+
+def pop_policy_samples(agent):
+    ''' Take the samples of the average policy stored by NFSP while acting
+
+    Args:
+        agent (object): The copy of the agent in an actor
+
+    Returns:
+        (list): The samples, empty if the agent is not NFSP
+    '''
+    buffer = getattr(agent, '_reservoir_buffer', None)
+    if buffer is None:
+        return []
+    samples = list(buffer)
+    buffer.clear()
+    return samples
+
+def add_policy_samples(agent, samples):
+    ''' Store the samples of the average policy from an actor
+
+    Args:
+        agent (object): The learning agent
+        samples (list): The samples from `pop_policy_samples`
+    '''
+    for sample in samples:
+        agent._reservoir_buffer.add(sample)
+
+def actor_worker(index, env_id, agent_fn, config, agents_fn, weights, queue_, stop):
+    ''' Play games with a copy of the agent and put the transitions into the queue
+    '''
+    import torch
+    from rlcard.envs.registration import make
+
+    # The actors run in parallel, so each one uses one thread
+    torch.set_num_threads(1)
+    config = dict(config)
+    if config.get('seed') is not None:
+        config['seed'] += (index + 1) * 1000
+        set_global_seed(config['seed'])
+
+    env = make(env_id, config)
+    agent = agent_fn()
+    env.set_agents([agent for _ in range(env.player_num)] if agents_fn is None else agents_fn(agent, env))
+    seats = [i for i in range(env.player_num) if env.agents[i] is agent]
+    version = 0
+    while not stop.is_set():
+        version = weights.load(agent, version)
+        if hasattr(agent, 'sample_episode_policy'):
+            agent.sample_episode_policy()
+        trajectories, payoffs = env.run(is_training=True)
+        transitions = [ts for i in seats for ts in trajectories[i]]
+        item = (transitions, pop_policy_samples(agent), payoffs)
+        while not stop.is_set():
+            try:
+                queue_.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                pass
@@ -0,0 +1,226 @@
+''' Tournaments on a pool of worker processes
+
+The games are split into shards over the workers. Each worker keeps its own
+environment and agents, and loads a frozen snapshot of the weights of the
+agents once for each evaluation. Game i is played with seed `seed + i`, so
+the results do not depend on the number of workers or the sharding.
+'''
+
+import os
+import pickle
+import tempfile
+import threading
+import multiprocessing as mp
+import numpy as np
+
+from rlcard.utils.utils import set_global_seed
+
+# The environment and the agents of a worker, and the snapshot they have loaded
+_worker = {}
+
+
+class ParallelTournament(object):
+    ''' Evaluate agents on a persistent pool of processes
+
+    Example:
+
+        evaluator = ParallelTournament('tractor', agents_fn, processes=4)
+        evaluation = evaluator.evaluate_async(env.agents, 1000)
+        ...  # Keep training
+        print(evaluation.get()['win_rate'])
+    '''
+
+    def __init__(self, env_id, agents_fn, processes=None, config=None, shard_size=None):
+        ''' Start the workers
+
+        Args:
+            env_id (string): The id of the environment, e.g., 'tractor'
+            agents_fn (callable): Build the agents of the seats in a worker. It
+                should be picklable, e.g., a module level function or a
+                functools.partial
+            processes (int): The number of workers, the number of CPUs if None
+            config (dict): The config of the environments
+            shard_size (int): The number of games of each task, by default
+                the games are split into four tasks for each worker
+        '''
+        self.processes = processes or mp.cpu_count()
+        self.shard_size = shard_size
+        config = {} if config is None else dict(config)
+        config['env_num'] = 1
+        ctx = mp.get_context('spawn')
+        self.pool = ctx.Pool(self.processes, initializer=init_worker, initargs=(env_id, config, agents_fn))
+        self.evaluation_num = 0
+        # The snapshot files of the evaluations that are not over. They are
+        # removed by the result handler thread of the pool
+        self.snapshot_paths = set()
+        self._snapshot_lock = threading.Lock()
+
+    def evaluate_async(self, agents, num, seed=0):
+        ''' Start the evaluation of a snapshot of the agents
+
+        Args:
+            agents (list): The agents of the seats, in the same order as
+                `agents_fn`. The weights of the agents that implement
+                `get_state_dict` are copied, the others are used as built
+                by `agents_fn`
+            num (int): The number of games to play
+            seed (int): The seed of the first game
+
+        Returns:
+            (Evaluation): The running evaluation
+        '''
+        fd, path = tempfile.mkstemp(prefix='rlcard_snapshot_', suffix='.pkl')
+        with os.fdopen(fd, 'wb') as file:
+            pickle.dump(snapshot(agents), file, pickle.HIGHEST_PROTOCOL)
+        # The files may be named again after they are removed, so the
+        # snapshots are told apart by the number of the evaluation
+        snapshot_id = (path, self.evaluation_num)
+        self.evaluation_num += 1
+        shard_size = self.shard_size or max(-(-num // (self.processes * 4)), 1)
+        tasks = [(snapshot_id, seed + start, min(shard_size, num - start)) for start in range(0, num, shard_size)]
+        with self._snapshot_lock:
+            self.snapshot_paths.add(path)
+        # The file is removed as soon as the games are over, even if the
+        # results are never collected
+        remove = lambda _: self._remove_snapshot(path)
+        return Evaluation(self.pool.starmap_async(play_games, tasks, callback=remove, error_callback=remove))
+
+    def evaluate(self, agents, num, seed=0):
+        ''' Evaluate a snapshot of the agents and wait for the results,
+            see `evaluate_async`
+        '''
+        return self.evaluate_async(agents, num, seed).get()
+
+    def close(self):
+        ''' Wait for the running evaluations, stop the workers and remove
+            the snapshot files that are left
+        '''
+        self.pool.close()
+        self.pool.join()
+        with self._snapshot_lock:
+            paths = list(self.snapshot_paths)
+        for path in paths:
+            self._remove_snapshot(path)
+
+    def _remove_snapshot(self, path):
+        # Only the thread that takes the path out of the set removes the file
+        with self._snapshot_lock:
+            if path not in self.snapshot_paths:
+                return
+            self.snapshot_paths.remove(path)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class Evaluation(object):
+    ''' A running evaluation
+    '''
+
+    def __init__(self, result):
+        self._result = result
+        self._stats = None
+
+    def ready(self):
+        ''' Whether all the games are over
+        '''
+        return self._result.ready()
+
+    def get(self, timeout=None):
+        ''' Wait for the games and aggregate the payoffs
+
+        Args:
+            timeout (float): The maximum time to wait in seconds, forever if None
+
+        Returns:
+            (dict): The statistics, see `aggregate`
+        '''
+        if self._stats is None:
+            self._stats = aggregate(np.concatenate(self._result.get(timeout)))
+        return self._stats
+
+
+def aggregate(payoffs):
+    ''' Aggregate the payoffs of the games
+
+    Args:
+        payoffs (numpy.array): The payoffs of each game, (num, player_num)
+
+    Returns:
+        (dict): A dict with
+            num: The number of games
+            mean (numpy.array): The average payoff of each player
+            stderr (numpy.array): The standard error of the means
+            win_rate (numpy.array): The rate of games where a player's payoff
+                is larger than the lowest payoff, i.e., where the player or
+                its team beats the others
+    '''
+    payoffs = np.asarray(payoffs, dtype=np.float64)
+    num = len(payoffs)
+    stderr = payoffs.std(axis=0, ddof=1) / np.sqrt(num) if num > 1 else np.zeros(payoffs.shape[1])
+    return {
+        'num': num,
+        'mean': payoffs.mean(axis=0),
+        'stderr': stderr,
+        'win_rate': (payoffs > payoffs.min(axis=1, keepdims=True)).mean(axis=0),
+    }
+
+def snapshot(agents):
+    ''' Copy the weights of the agents into numpy arrays
+
+    Args:
+        agents (list): The agents
+
+    Returns:
+        (list): The state dict of each agent, None if it has no weights
+    '''
+    states = []
+    for agent in agents:
+        if not hasattr(agent, 'get_state_dict'):
+            states.append(None)
+            continue
+        states.append({key: {name: tensor.detach().cpu().numpy().copy() for name, tensor in values.items()}
+                       for key, values in agent.get_state_dict().items()})
+    return states
+
+def init_worker(env_id, config, agents_fn):
+    from rlcard.envs.registration import make
+    from rlcard.utils.backends import is_torch_available
+
+    if is_torch_available():
+        import torch
+        # The workers run in parallel, so each one uses one thread
+        torch.set_num_threads(1)
+    _worker['env'] = make(env_id, config)
+    _worker['agents'] = agents_fn()
+    _worker['env'].set_agents(_worker['agents'])
+    _worker['snapshot_id'] = None
+
+def play_games(snapshot_id, seed, num):
+    ''' Play games with the snapshot of the agents in a worker
+
+    Args:
+        snapshot_id (tuple): The file of the snapshot and the number of the evaluation
+        seed (int): The seed of the first game
+        num (int): The number of games
+
+    Returns:
+        (numpy.array): The payoffs of each game, (num, player_num)
+    '''
+    env, agents = _worker['env'], _worker['agents']
+    if _worker['snapshot_id'] != snapshot_id:
+        with open(snapshot_id[0], 'rb') as file:
+            states = pickle.load(file)
+        for agent, state in zip(agents, states):
+            if state is not None:
+                import torch
+                agent.load({key: {name: torch.from_numpy(value) for name, value in values.items()}
+                            for key, values in state.items()})
+        _worker['snapshot_id'] = snapshot_id
+
+    payoffs = []
+    for game_seed in range(seed, seed + num):
+        env._seed(game_seed)
+        set_global_seed(game_seed)
+        _, _payoffs = env.run(is_training=False)
+        payoffs.append(_payoffs)
+    return np.array(payoffs, dtype=np.float64).reshape(num, env.player_num)
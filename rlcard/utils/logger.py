@@ -47,6 +47,17 @@ class Logger(object):
         self.log('  reward       |  ' + str(reward))
         self.log('----------------------------------------')
 
+    def log_profile(self, profiler):
+        ''' Log the wall time and the number of calls of the phases
+
+        Args:
+            profiler (Profiler): the profiler, e.g., from `env.get_profile()`
+        '''
+        print('')
+        self.log('----------------------------------------')
+        self.log(profiler.format())
+        self.log('----------------------------------------')
+
     def plot(self, algorithm):
         plot(self.csv_path, self.fig_path, algorithm)
 
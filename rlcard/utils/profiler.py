@@ -0,0 +1,209 @@
+''' Wall time and call counts of the phases of the games and the agents
+
+The profiler replaces methods of the environments and the agents with timed
+wrappers on the instances, so the methods are unchanged, and nothing is
+timed, when it is not enabled. The phases are:
+
+    reset: Env.reset
+    env_step: Env.step, which includes game_step and extract_state
+    game_step: Game.step
+    extract_state: Env._extract_state, which may include legal_actions
+    legal_actions: Env._get_legal_actions
+    inference: step, eval_step, batch_step and batch_eval_step of the agents
+    replay_insert: feed_memory of DQN and the samples of the average policy of NFSP
+    train: train of DQN and train_sl of NFSP
+
+The time of a phase includes the time of the phases called inside it. The
+copies of a profiled object made with `copy.deepcopy` are not profiled.
+'''
+
+import copy
+import time
+import functools
+from collections import OrderedDict, namedtuple
+
+PHASES = ['reset', 'env_step', 'game_step', 'extract_state', 'legal_actions',
+          'inference', 'replay_insert', 'train']
+
+# The methods of the environments and the agents timed in each phase
+ENV_METHODS = [('reset', 'reset'), ('step', 'env_step'), ('_extract_state', 'extract_state'),
+               ('_get_legal_actions', 'legal_actions')]
+GAME_METHODS = [('step', 'game_step')]
+INFERENCE_METHODS = [('step', 'inference'), ('eval_step', 'inference'),
+                     ('batch_step', 'inference'), ('batch_eval_step', 'inference'),
+                     ('batch_step_arrays', 'inference'), ('batch_eval_step_arrays', 'inference')]
+LEARNING_METHODS = [('feed_memory', 'replay_insert'), ('_add_transition', 'replay_insert'),
+                    ('train', 'train'), ('train_sl', 'train')]
+
+PhaseStats = namedtuple('PhaseStats', ['count', 'time', 'mean'])
+
+
+class Profiler(object):
+    ''' Record the wall time and the number of calls of each phase
+    '''
+
+    def __init__(self):
+        self.times = {}
+        self.counts = {}
+        self._wrapped = []
+
+    def record(self, phase, seconds, count=1):
+        ''' Add calls to a phase
+
+        Args:
+            phase (str): The name of the phase
+            seconds (float): The wall time of the calls
+            count (int): The number of calls
+        '''
+        self.times[phase] = self.times.get(phase, 0.0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + count
+
+    def phase(self, phase):
+        ''' Time a block of code as a phase
+
+        Example:
+
+            with profiler.phase('evaluate'):
+                tournament(env, 1000)
+
+        Args:
+            phase (str): The name of the phase
+        '''
+        return _Timer(self, phase)
+
+    def wrap(self, obj, name, phase):
+        ''' Time a method of an object as a phase. The method is replaced on
+            the instance only, and only once. The wrappers are left out of
+            the deep copies of the object, which would otherwise call and
+            time the methods of the original
+
+        Args:
+            obj (object): The object
+            name (str): The name of the method
+            phase (str): The name of the phase
+        '''
+        method = getattr(obj, name, None)
+        if method is None or getattr(method, '_profiled', False):
+            return
+        record = self.record
+        perf_counter = time.perf_counter
+
+        @functools.wraps(method)
+        def wrapped(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record(phase, perf_counter() - start)
+        wrapped._profiled = True
+        setattr(obj, name, wrapped)
+        self._wrapped.append((obj, name))
+
+        # copy.deepcopy looks up __deepcopy__ on the instance
+        if '__deepcopy__' not in vars(obj):
+            guard = functools.partial(_deepcopy_unprofiled, obj)
+            guard._profiled = True
+            setattr(obj, '__deepcopy__', guard)
+            self._wrapped.append((obj, '__deepcopy__'))
+
+    def attach_env(self, env):
+        ''' Time the phases of an environment and its game
+
+        Args:
+            env (Env): The environment
+        '''
+        for name, phase in ENV_METHODS:
+            self.wrap(env, name, phase)
+        for name, phase in GAME_METHODS:
+            self.wrap(env.game, name, phase)
+
+    def attach_agent(self, agent, inference=True):
+        ''' Time the phases of an agent
+
+        Args:
+            agent (object): The agent
+            inference (boolean): Whether to time the inference of the agent
+        '''
+        if inference:
+            for name, phase in INFERENCE_METHODS:
+                self.wrap(agent, name, phase)
+        for name, phase in LEARNING_METHODS:
+            self.wrap(agent, name, phase)
+        # The inner DQN of NFSP acts on behalf of NFSP, so only its learning is timed
+        if hasattr(agent, '_rl_agent'):
+            self.attach_agent(agent._rl_agent, inference=False)
+
+    def detach(self):
+        ''' Restore the methods of the objects
+        '''
+        for obj, name in self._wrapped:
+            if name in vars(obj):
+                delattr(obj, name)
+        self._wrapped = []
+
+    def merge(self, times, counts):
+        ''' Add the records of another profiler, e.g., of a worker process
+
+        Args:
+            times (dict): The wall time of each phase
+            counts (dict): The number of calls of each phase
+        '''
+        for phase in times:
+            self.record(phase, times[phase], counts[phase])
+
+    def reset(self):
+        ''' Clear the records
+        '''
+        self.times = {}
+        self.counts = {}
+
+    def stats(self):
+        ''' Get the statistics of the phases
+
+        Returns:
+            (OrderedDict): The PhaseStats(count, time, mean) of each recorded
+                phase, in the order of `PHASES` and then by name
+        '''
+        phases = [phase for phase in PHASES if phase in self.counts] \
+            + sorted(phase for phase in self.counts if phase not in PHASES)
+        return OrderedDict((phase, PhaseStats(self.counts[phase], self.times[phase],
+                                              self.times[phase] / max(self.counts[phase], 1)))
+                           for phase in phases)
+
+    def format(self):
+        ''' Format the statistics as a table
+
+        Returns:
+            (str): The table
+        '''
+        lines = ['  {:<15}|  {:>10}  {:>10}  {:>10}'.format('phase', 'calls', 'time (s)', 'mean (ms)')]
+        for phase, stats in self.stats().items():
+            lines.append('  {:<15}|  {:>10}  {:>10.3f}  {:>10.4f}'.format(phase, stats.count, stats.time, stats.mean * 1000))
+        return '\n'.join(lines)
+
+
+def _deepcopy_unprofiled(obj, memo):
+    ''' Deep copy an object without the timed wrappers of its methods
+    '''
+    profiled = {name: value for name, value in vars(obj).items() if getattr(value, '_profiled', False)}
+    for name in profiled:
+        delattr(obj, name)
+    try:
+        return copy.deepcopy(obj, memo)
+    finally:
+        for name, value in profiled.items():
+            setattr(obj, name, value)
+
+
+class _Timer(object):
+
+    def __init__(self, profiler, phase):
+        self.profiler = profiler
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.profiler.record(self.phase, time.perf_counter() - self.start)
@@ -325,15 +325,12 @@ def set_global_seed(seed):
     Note: If using other modules with randomness, they also need to be seeded
     '''
     if seed is not None:
-        import subprocess
-        import sys
+        from rlcard.utils.backends import is_tensorflow_available, is_torch_available
 
-        reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-        installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
-        if 'tensorflow-gpu' in installed_packages or 'tensorflow' in installed_packages:
+        if is_tensorflow_available():
             import tensorflow as tf
             tf.set_random_seed(seed)
-        if 'torch' in installed_packages:
+        if is_torch_available():
             import torch
             torch.backends.cudnn.deterministic = True
             torch.manual_seed(seed)
@@ -378,6 +375,23 @@ def remove_illegal_without_norm(action_probs, legal_actions):
 
     return probs
 
+def encode_counts(counts, plane_num, out=None, dtype=int):
+    ''' Encode card counts into one-hot planes with a single NumPy
+        operation. The entry of plane k is 1 if the count of the card is k.
+
+    Args:
+        counts (numpy.array): A (..., N) array of card counts
+        plane_num (int): The number of planes, i.e., the maximum count plus one
+        out (numpy.array): A preallocated (..., plane_num, N) array to write into
+        dtype (numpy.dtype): The dtype of the planes if `out` is not given
+
+    Returns:
+        (numpy.array): The (..., plane_num, N) planes
+    '''
+    counts = np.asarray(counts)[..., None, :]
+    if out is None:
+        out = np.empty(counts.shape[:-2] + (plane_num, counts.shape[-1]), dtype=dtype)
+    return np.equal(counts, np.arange(plane_num)[:, None], out=out)
 
 def assign_task(task_num, process_num):
     ''' Assign the number of tasks according to the number of processes
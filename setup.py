@@ -39,6 +39,7 @@ setuptools.setup(
                    'games/limitholdem/card2index.json',
                    'games/leducholdem/card2index.json',
                    'games/doudizhu/jsondata/*',
+                   'games/doudizhu/bindata/*',
                    'games/uno/jsondata/*',
                    'games/simpledoudizhu/jsondata/*',
                    'agents/gin_rummy_human_agent/gui_cards/*',
@@ -2,7 +2,7 @@ import unittest
 import torch
 import numpy as np
 
-from rlcard.agents.dqn_agent_pytorch import DQNAgent
+from rlcard.agents.dqn_agent_pytorch import DQNAgent, Estimator
 
 class TestDQN(unittest.TestCase):
 
@@ -55,3 +55,71 @@ class TestDQN(unittest.TestCase):
         predicted_action = agent.step({'obs': np.random.random_sample((2,)), 'legal_actions': [0, 1]})
         self.assertGreaterEqual(predicted_action, 0)
         self.assertLessEqual(predicted_action, 1)
+
+    def test_train_with_dedup_replay_memory(self):
+        agent = DQNAgent(scope='dqn',
+                         replay_memory_size=200,
+                         replay_memory_init_size=100,
+                         update_target_estimator_every=100,
+                         state_shape=[2],
+                         mlp_layers=[10,10],
+                         device=torch.device('cpu'),
+                         dedup_replay_memory=True)
+        for _ in range(50):
+            states = [{'obs': np.random.random_sample((2,)), 'legal_actions': [0, 1]} for _ in range(6)]
+            for i in range(5):
+                agent.feed([states[i], np.random.randint(2), 0, states[i+1], i == 4])
+        self.assertEqual(agent.train_t, 151)
+        self.assertEqual(len(agent.memory), 166)
+
+    def test_train_with_prioritized_replay(self):
+        agent = DQNAgent(scope='dqn',
+                         replay_memory_size=200,
+                         replay_memory_init_size=100,
+                         update_target_estimator_every=100,
+                         state_shape=[2],
+                         mlp_layers=[10,10],
+                         device=torch.device('cpu'),
+                         prioritized_replay=True)
+        for _ in range(150):
+            ts = [{'obs': np.random.random_sample((2,)), 'legal_actions': [0, 1]}, np.random.randint(2), 0, {'obs': np.random.random_sample((2,)), 'legal_actions': [0, 1]}, True]
+            agent.feed(ts)
+        self.assertEqual(agent.train_t, 51)
+        # The sampled transitions are given their TD errors as priorities
+        self.assertLess(np.count_nonzero(agent.memory.tree.get(np.arange(150)) == 1), 150)
+
+    def test_estimator_update(self):
+        estimator = Estimator(action_num=2, state_shape=[2], mlp_layers=[10,10], device=torch.device('cpu'))
+        s = np.random.random_sample((8, 2)).astype(np.float32)
+        a = np.random.randint(2, size=8)
+        y = np.random.random_sample(8).astype(np.float32)
+        loss, td_errors = estimator.update(s, a, y)
+        self.assertEqual(td_errors.shape, (8,))
+        self.assertAlmostEqual(loss, float(np.mean(td_errors ** 2)), places=5)
+
+    def test_batch_step(self):
+        agent = DQNAgent(scope='dqn',
+                         replay_memory_size=200,
+                         replay_memory_init_size=100,
+                         update_target_estimator_every=100,
+                         action_num=3,
+                         state_shape=[2],
+                         mlp_layers=[10,10],
+                         device=torch.device('cpu'))
+
+        states = [{'obs': np.random.random_sample((2,)), 'legal_actions': [i]} for i in range(3)]
+        actions = agent.batch_step(states)
+        self.assertEqual(actions, [0, 1, 2])
+        actions, probs = agent.batch_eval_step(states)
+        self.assertEqual(actions, [0, 1, 2])
+        self.assertEqual(len(probs), 3)
+
+        # The same on the stacked arrays
+        obs, legal_masks = np.array([state['obs'] for state in states]), np.eye(3, dtype=bool)
+        self.assertEqual(agent.batch_step_arrays(obs, legal_masks), [0, 1, 2])
+        self.assertEqual(agent.batch_eval_step_arrays(obs, legal_masks)[0], [0, 1, 2])
+
+        # A single-state batch predicts the same probabilities as `predict`
+        obs = np.random.random_sample((2,))
+        self.assertTrue(np.allclose(agent.batch_predict(np.expand_dims(obs, 0))[0], agent.predict(obs)))
+
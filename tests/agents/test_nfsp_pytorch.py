@@ -49,3 +49,25 @@ class TestNFSP(unittest.TestCase):
             agent.feed(ts)
         state_dict = agent.get_state_dict()
         self.assertIsInstance(state_dict, dict)
+
+    def test_batch_step(self):
+        agent = NFSPAgent(scope='nfsp',
+                         action_num=3,
+                         state_shape=[2],
+                         hidden_layers_sizes=[10,10],
+                         q_mlp_layers=[10,10],
+                         device=torch.device('cpu'))
+
+        states = [{'obs': np.random.random_sample((2,)), 'legal_actions': [i]} for i in range(3)]
+        for _ in range(10):
+            agent.sample_episode_policy()
+            self.assertEqual(agent.batch_step(states), [0, 1, 2])
+        actions, probs = agent.batch_eval_step(states)
+        self.assertEqual(actions, [0, 1, 2])
+        self.assertEqual(len(probs), 3)
+
+        # The same on the stacked arrays
+        obs, legal_masks = np.array([state['obs'] for state in states]), np.eye(3, dtype=bool)
+        self.assertEqual(agent.batch_step_arrays(obs, legal_masks), [0, 1, 2])
+        self.assertEqual(agent.batch_eval_step_arrays(obs, legal_masks)[0], [0, 1, 2])
+
@@ -0,0 +1,120 @@
+import unittest
+import numpy as np
+
+from rlcard.agents.replay_memory import Memory, FrameMemory, SumTree, PrioritizedMemory, PrioritizedFrameMemory
+
+class TestMemory(unittest.TestCase):
+
+    def test_save_and_sample(self):
+        memory = Memory(memory_size=5, batch_size=3)
+        for i in range(8):
+            memory.save(np.full((2, 2), i, dtype=np.uint8), i, float(i), np.full((2, 2), i+1, dtype=np.uint8), i == 7)
+        self.assertEqual(len(memory), 5)
+        self.assertEqual(memory.states.dtype, np.uint8)
+        self.assertEqual(sorted(memory.actions.tolist()), [3, 4, 5, 6, 7])
+
+        state_batch, action_batch, reward_batch, next_state_batch, done_batch = memory.sample()
+        self.assertEqual(state_batch.shape, (3, 2, 2))
+        self.assertEqual(len(set(action_batch.tolist())), 3)
+        for state, action, reward, next_state, done in zip(state_batch, action_batch, reward_batch, next_state_batch, done_batch):
+            self.assertTrue((state == action).all())
+            self.assertTrue((next_state == action + 1).all())
+            self.assertEqual(reward, action)
+            self.assertEqual(done, action == 7)
+
+    def test_next_legal_actions(self):
+        memory = Memory(memory_size=2, batch_size=2, action_num=4)
+        memory.save(np.zeros(3), 0, 0, np.ones(3), False, [1, 3])
+        memory.save(np.zeros(3), 1, 0, np.ones(3), True, [])
+        batch = memory.sample()
+        self.assertEqual(len(batch), 6)
+        masks = sorted(mask.tolist() for mask in batch[5])
+        self.assertEqual(masks, [[False, False, False, False], [False, True, False, True]])
+
+class TestFrameMemory(unittest.TestCase):
+
+    def _episode(self, memory, start, length):
+        states = [np.full(2, start + i) for i in range(length + 1)]
+        for i in range(length):
+            memory.save(states[i], start + i, 0, states[i+1], i == length - 1, [i])
+
+    def test_save_and_sample(self):
+        memory = FrameMemory(memory_size=12, batch_size=8, action_num=20)
+        self._episode(memory, 0, 4)
+        self._episode(memory, 10, 5)
+        # One frame per transition plus the final state of each episode
+        self.assertEqual(len(memory), 9)
+        self.assertEqual(memory.filled, 11)
+        self.assertIsNone(memory.next_states)
+
+        batch = memory.sample()
+        for state, action, _, next_state, done, mask in zip(*batch):
+            self.assertEqual(state[0], action)
+            self.assertEqual(next_state[0], action + 1)
+            self.assertEqual(done, action in [3, 14])
+            self.assertEqual(np.flatnonzero(mask).tolist(), [action % 10])
+
+    def test_overwrite(self):
+        memory = FrameMemory(memory_size=5, batch_size=3)
+        self._episode(memory, 0, 3)
+        self._episode(memory, 10, 3)
+        # The frames of the first episode are overwritten
+        self.assertEqual(len(memory), 3)
+        for state, action, _, next_state, _ in zip(*memory.sample()):
+            self.assertEqual(state[0], action)
+            self.assertEqual(next_state[0], action + 1)
+            self.assertGreaterEqual(action, 10)
+
+class TestSumTree(unittest.TestCase):
+
+    def test_update_and_find(self):
+        tree = SumTree(5)
+        tree.update([0, 1, 2, 3, 4], [1, 0, 2, 0, 3])
+        self.assertEqual(tree.total, 6)
+        self.assertEqual(tree.find([0, 0.5, 1, 2.9, 3, 5.99]).tolist(), [0, 0, 2, 2, 4, 4])
+        tree.update([4, 1], [0, 1])
+        self.assertEqual(tree.total, 4)
+        self.assertEqual(tree.get([1, 4]).tolist(), [1, 0])
+        # The leaves with zero priority are skipped even at the boundaries
+        self.assertEqual(tree.find([3.999, 4]).tolist(), [2, 2])
+
+class TestPrioritizedMemory(unittest.TestCase):
+
+    def test_sample_and_update_priorities(self):
+        memory = PrioritizedMemory(memory_size=4, batch_size=64, alpha=1, beta=1)
+        for i in range(4):
+            memory.save(np.full(2, i), i, 0, np.full(2, i+1), False)
+        states, actions, _, next_states, _, weights, indices = memory.sample()
+        self.assertTrue((actions == indices).all())
+        self.assertTrue((states[:, 0] == actions).all())
+        self.assertTrue(np.allclose(weights, 1))
+
+        memory.update_priorities(np.array([0, 1, 2, 3]), np.array([0, 0, 0, 3]))
+        self.assertAlmostEqual(memory.max_priority, 3 + memory.epsilon)
+        _, actions, _, _, _, weights, _ = memory.sample()
+        self.assertTrue((actions == 3).all())
+        self.assertTrue(np.allclose(weights, 1))
+
+        # A new transition gets the largest priority
+        memory.save(np.full(2, 4), 4, 0, np.full(2, 5), False)
+        self.assertAlmostEqual(memory.tree.get([0])[0], memory.max_priority)
+
+    def test_frame_memory(self):
+        memory = PrioritizedFrameMemory(memory_size=6, batch_size=32)
+        for start in [0, 10]:
+            states = [np.full(2, start + i) for i in range(3)]
+            for i in range(2):
+                memory.save(states[i], start + i, 0, states[i+1], i == 1)
+        # The pending frames are never sampled
+        self.assertEqual(np.count_nonzero(memory.tree.get(np.arange(6))), 4)
+        for state, action, _, next_state, _, _, _ in zip(*memory.sample()):
+            self.assertEqual(state[0], action)
+            self.assertEqual(next_state[0], action + 1)
+
+        # Overwriting a slot drops its priority
+        memory.save(np.full(2, 20), 20, 0, np.full(2, 21), True)
+        self.assertEqual(len(memory), 3)
+        self.assertEqual(np.count_nonzero(memory.tree.get(np.arange(6))), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import json
+import tempfile
+import unittest
+
+from rlcard.bench.agents import bench_agent
+from rlcard.bench.__main__ import main
+from rlcard.utils.backends import is_torch_available
+
+class TestBenchAgents(unittest.TestCase):
+
+    def test_bench_agent(self):
+        result = bench_agent('cfr', 'leduc-holdem', batch_sizes=[1, 4], num=10, max_seconds=10)
+        self.assertEqual(result['eval_step_ms']['num'], 10)
+        # CFR has no step for training and no batched inference
+        self.assertIsNone(result['step_ms'])
+        self.assertEqual([batch['batch_size'] for batch in result['batches']], [1, 4])
+        for batch in result['batches']:
+            self.assertFalse(batch['native'])
+            self.assertGreater(batch['states_per_sec'], 0)
+
+    @unittest.skipUnless(is_torch_available(), 'PyTorch is not installed')
+    def test_bench_torch_agent(self):
+        result = bench_agent('dqn-pytorch', 'tractor', batch_sizes=[2], mlp_layers=[16], num=5, max_seconds=10)
+        self.assertEqual(result['state_shape'], [9, 3, 72])
+        self.assertEqual(result['step_ms']['num'], 5)
+        self.assertTrue(result['batches'][0]['native'])
+        latency = result['batches'][0]['latency_ms']
+        self.assertLessEqual(latency['p50'], latency['p99'])
+
+    def test_cli(self):
+        path = os.path.join(tempfile.mkdtemp(), 'bench.json')
+        main(['agents', '--agents', 'cfr', '--games', 'blackjack', '--batch-sizes', '2', '--num', '3', '--output', path])
+        with open(path) as file:
+            output = json.load(file)
+        self.assertEqual(len(output['results']), 1)
+        self.assertEqual(output['results'][0]['agent'], 'cfr')
+        self.assertEqual(output['results'][0]['batches'][0]['latency_ms']['num'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
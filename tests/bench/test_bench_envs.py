@@ -0,0 +1,41 @@
+import os
+import json
+import tempfile
+import unittest
+
+from rlcard.bench.envs import bench_env, available_modes
+from rlcard.bench.__main__ import main
+
+class TestBenchEnvs(unittest.TestCase):
+
+    def test_bench_env(self):
+        for mode in ['single', 'vec']:
+            result = bench_env('leduc-holdem', mode, env_num=2, games=4, max_seconds=10)
+            self.assertEqual(result['games'], 4)
+            self.assertGreater(result['steps'], 0)
+            self.assertGreater(result['steps_per_sec'], 0)
+            latency = result['step_latency_ms']
+            self.assertLessEqual(latency['p50'], latency['p99'])
+
+        result = bench_env('tractor', 'batched', env_num=2, games=2)
+        self.assertEqual(result['games'], 2)
+        # One tick steps all the running games
+        self.assertGreater(result['step_latency_ms']['num'], 0)
+        self.assertLess(result['step_latency_ms']['num'], result['steps'])
+        self.assertIn('batched', available_modes('tractor'))
+        self.assertNotIn('batched', available_modes('leduc-holdem'))
+        with self.assertRaises(ValueError):
+            bench_env('leduc-holdem', 'batched')
+
+    def test_cli(self):
+        path = os.path.join(tempfile.mkdtemp(), 'bench.json')
+        main(['envs', '--envs', 'blackjack', '--modes', 'single', '--games', '3', '--output', path])
+        with open(path) as file:
+            output = json.load(file)
+        self.assertIn('cpu_count', output['system'])
+        self.assertEqual(len(output['results']), 1)
+        self.assertEqual(output['results'][0]['games'], 3)
+        self.assertIsNotNone(output['results'][0]['peak_rss_mb']['self'])
+
+if __name__ == '__main__':
+    unittest.main()
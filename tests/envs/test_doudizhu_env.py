@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 
 import rlcard
 from rlcard.utils.utils import get_downstream_player_id
@@ -16,6 +17,33 @@ class TestDoudizhuEnv(unittest.TestCase):
     def test_is_deterministic(self):
         self.assertTrue(is_deterministic('doudizhu'))
 
+    def test_obs_dtype(self):
+        state, _ = rlcard.make('doudizhu', config={'seed': 0, 'obs_dtype': np.uint8}).reset()
+        expected, _ = rlcard.make('doudizhu', config={'seed': 0}).reset()
+        self.assertEqual(state['obs'].dtype, np.uint8)
+        self.assertTrue((state['obs'] == expected['obs']).all())
+
+    def test_obs_buffers(self):
+        obs_buffers = np.zeros((2, 6, 5, 15), dtype=np.uint8)
+        env = rlcard.make('doudizhu', config={'obs_buffers': obs_buffers})
+        state, _ = env.reset()
+        self.assertIs(state['obs'].base, obs_buffers)
+        next_state, _ = env.step(state['legal_actions'][0])
+        self.assertTrue(np.shares_memory(next_state['obs'], obs_buffers[1]))
+        self.assertEqual(obs_buffers[0].sum(axis=(0, 1)).tolist(), [6] * 15)
+
+        # The observations of the trajectories are copied out of the ring
+        env.set_agents([RandomAgent(env.action_num) for _ in range(env.player_num)])
+        trajectories, _ = env.run(is_training=False)
+        for ts in trajectories[0]:
+            self.assertFalse(np.shares_memory(ts[0]['obs'], obs_buffers))
+            self.assertEqual(ts[0]['obs'].dtype, np.uint8)
+
+        with self.assertRaises(ValueError):
+            rlcard.make('doudizhu', config={'obs_buffers': obs_buffers, 'obs_dtype': bool})
+        with self.assertRaises(ValueError):
+            rlcard.make('doudizhu', config={'obs_buffers': np.zeros((2, 6, 15), dtype=np.uint8)}).reset()
+
     def test_get_legal_actions(self):
         env = rlcard.make('doudizhu')
         env.set_agents([RandomAgent(env.action_num) for _ in range(env.player_num)])
@@ -1,4 +1,6 @@
 import unittest
+import subprocess
+import sys
 
 import rlcard
 from rlcard.envs.registration import register, make
@@ -25,5 +27,16 @@ class TestRegistration(unittest.TestCase):
         with self.assertRaises(ValueError):
             make('test_env', config={'active_player':-1})
 
+    def test_lazy_entry_point(self):
+        # The entry point is only imported when the environment is made
+        register(env_id='test_lazy', entry_point='rlcard.envs.not_exist:NotExistEnv')
+        with self.assertRaises(ImportError):
+            make('test_lazy')
+
+    def test_import_without_games(self):
+        code = 'import sys, rlcard; print(any(m.startswith("rlcard.games.") for m in sys.modules))'
+        output = subprocess.check_output([sys.executable, '-c', code], env={'PYTHONPATH': ':'.join(sys.path)})
+        self.assertEqual(output.strip(), b'False')
+
 if __name__ == '__main__':
     unittest.main()
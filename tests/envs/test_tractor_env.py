@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents import RandomAgent
+from rlcard.games.tractor.utils import tournament_tractor_duplicate
+
+class TestTractorEnv(unittest.TestCase):
+
+    def test_reset_predefine_state(self):
+        env = rlcard.make('tractor', config={'seed': 0})
+        env.reset()
+        hands = [player.initial_hand for player in env.game.players]
+        trump = env.game.round.trump
+        banker_cards = sorted(env.game.round.public['banker_cards'])
+
+        # The same deal with the hands rotated by one seat
+        rotated = hands[-1:] + hands[:-1]
+        env.reset_predefine_state(rotated, trump)
+        self.assertEqual(env.game.round.trump, trump)
+        self.assertEqual([player.current_hand for player in env.game.players], rotated)
+        self.assertEqual(sorted(env.game.round.public['banker_cards']), banker_cards)
+        self.assertEqual(env.get_player_id(), 0)
+
+        with self.assertRaises(ValueError):
+            env.reset_predefine_state([hands[0]] * 4, trump)
+
+    def test_tournament_duplicate(self):
+        env = rlcard.make('tractor', config={'seed': 0})
+        env.set_agents([FirstAgent(), RandomAgent(env.action_num), FirstAgent(), RandomAgent(env.action_num)])
+        stats = tournament_tractor_duplicate(env, 3)
+        self.assertEqual(stats['num'], 3)
+        self.assertEqual(stats['mean'][0], stats['mean'][2])
+        self.assertEqual(stats['mean'][1], stats['mean'][3])
+
+        # The same deterministic agent on both teams breaks even on every deal
+        agent = FirstAgent()
+        env.set_agents([agent for _ in range(4)])
+        stats = tournament_tractor_duplicate(env, 3)
+        self.assertTrue(np.allclose(stats['mean'], stats['mean'][0]))
+        self.assertTrue(np.array_equal(stats['win_rate'], np.zeros(4)))
+
+class FirstAgent(object):
+    ''' An agent that always takes the first legal action
+    '''
+
+    use_raw = False
+
+    def eval_step(self, state):
+        return state['legal_actions'][0], None
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+import numpy as np
+
+from rlcard.agents import RandomAgent
+from rlcard.envs.tractor import TractorVecEnv
+
+class TestTractorVecEnv(unittest.TestCase):
+
+    def test_init(self):
+        env = TractorVecEnv({'env_num': 4, 'seed': 0})
+        self.assertEqual(env.player_num, 4)
+        self.assertEqual(env.action_num, 283)
+        self.assertEqual(env.state_shape, [9, 3, 72])
+
+    def test_run(self):
+        env = TractorVecEnv({'env_num': 4, 'seed': 0})
+        env.set_agents([RandomAgent(env.action_num) for _ in range(env.player_num)])
+        for is_training in [False, True]:
+            trajectories, payoffs = env.run(is_training=is_training)
+            self.assertEqual(len(payoffs), 4)
+            self.assertEqual(len(trajectories), 4)
+            for transition in trajectories[0]:
+                self.assertEqual(len(transition), 5)
+                self.assertEqual(transition[0]['obs'].shape, (9, 3, 72))
+                self.assertIn(transition[1], transition[0]['legal_actions'])
+            # Every game ends with a done transition for each player
+            self.assertEqual(sum([transition[4] for transition in trajectories[0]]), 4)
+
+if __name__ == '__main__':
+    unittest.main()
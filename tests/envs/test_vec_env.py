@@ -1,8 +1,10 @@
+import sys
 import unittest
 import numpy as np
 
 import rlcard
 from rlcard.agents import RandomAgent
+from rlcard.envs.vec_env import batch_actions
 from .determism_util import is_deterministic
 
 class TestVecEnv(unittest.TestCase):
@@ -14,5 +16,125 @@ class TestVecEnv(unittest.TestCase):
         self.assertEqual(len(payoffs), 4)
         trajectories, payoffs = env.run(is_training=True)
 
+    def test_batch_actions(self):
+        agent = BatchAgent(2)
+        states = [{'legal_actions': [0]}, {'legal_actions': [1]}, {'legal_actions': [1]}]
+        actions = batch_actions([agent, RandomAgent(2), agent], states, is_training=True)
+        self.assertEqual(actions, [0, 1, 1])
+        self.assertEqual(agent.batch_sizes, [2])
+        actions = batch_actions([agent, agent, agent], states, is_training=False)
+        self.assertEqual(actions, [0, 1, 1])
+        self.assertEqual(agent.batch_sizes, [2, 3])
+
+    def test_vec_env_batch_agent(self):
+        env = rlcard.make('leduc-holdem', config={'env_num': 4, 'seed': 0})
+        agent = BatchAgent(env.action_num)
+        env.set_agents([agent for _ in range(env.player_num)])
+        trajectories, payoffs = env.run(is_training=True)
+        self.assertEqual(len(payoffs), 4)
+        self.assertLessEqual(max(agent.batch_sizes), 4)
+
+    @unittest.skipIf(sys.version_info < (3, 8), 'shared_memory requires Python 3.8+')
+    def test_shm_vec_env(self):
+        results = []
+        for shared_memory, agent_class in [(False, BatchAgent), (True, BatchAgent), (True, ArrayAgent)]:
+            env = rlcard.make('leduc-holdem', config={'env_num': 4, 'seed': 0, 'shared_memory': shared_memory})
+            agents = [agent_class(env.action_num) for _ in range(env.player_num)]
+            env.set_agents(agents)
+            results.append(env.run(is_training=True))
+            if shared_memory:
+                self.assertEqual(env.obs.shape, (4,) + tuple(env.state_shape))
+                self.assertEqual(env.legal_masks.shape, (4, env.action_num))
+                env.close()
+        # The agents that take arrays are fed the shared arrays, not the states
+        self.assertEqual(agents[0].batch_sizes, [])
+        self.assertGreater(len(agents[0].array_sizes), 0)
+
+        # The same games as with the pipes
+        (trajectories, payoffs) = results[0]
+        for shm_trajectories, shm_payoffs in results[1:]:
+            self.assert_same_games(trajectories, payoffs, shm_trajectories, shm_payoffs)
+
+    def assert_same_games(self, trajectories, payoffs, shm_trajectories, shm_payoffs):
+        self.assertTrue(np.array_equal(payoffs, shm_payoffs))
+        for player_trajectories, shm_player_trajectories in zip(trajectories, shm_trajectories):
+            self.assertEqual(len(player_trajectories), len(shm_player_trajectories))
+            for ts, shm_ts in zip(player_trajectories, shm_player_trajectories):
+                self.assertTrue(np.array_equal(ts[0]['obs'], shm_ts[0]['obs']))
+                self.assertEqual(ts[0]['legal_actions'], shm_ts[0]['legal_actions'])
+                self.assertEqual(ts[1:3], shm_ts[1:3])
+                self.assertTrue(np.array_equal(ts[3]['obs'], shm_ts[3]['obs']))
+                self.assertEqual(ts[4], shm_ts[4])
+
+    def test_run_async(self):
+        backends = [False, True] if sys.version_info >= (3, 8) else [False]
+        results = []
+        for shared_memory in backends:
+            env = rlcard.make('leduc-holdem', config={'env_num': 3, 'seed': 0, 'shared_memory': shared_memory,
+                                                      'profile': True})
+            agents = [BatchAgent(env.action_num) for _ in range(env.player_num)]
+            env.set_agents(agents)
+            games = list(env.run_async(num_games=7, is_training=True))
+            self.assertEqual(len(games), 7)
+            # No game is dealt without being played
+            self.assertEqual(env.get_profile().stats()['reset'].count, 7)
+            for trajectories, payoffs in games:
+                self.assertEqual(len(trajectories), env.player_num)
+                self.assertEqual(len(payoffs), env.player_num)
+                for ts in trajectories[0]:
+                    self.assertEqual(len(ts), 5)
+            # Each action is queried once, in batches over the environments
+            self.assertEqual(sum(agents[0].batch_sizes + agents[1].batch_sizes), env.timestep)
+            self.assertEqual(env.timestep, sum(len(trajectories[0]) + len(trajectories[1]) for trajectories, _ in games))
+            results.append([payoffs for _, payoffs in games])
+            if shared_memory:
+                env.close()
+        if len(results) == 2:
+            self.assertTrue(np.array_equal(results[0], results[1]))
+
+    def test_vec_env_profile(self):
+        backends = [False, True] if sys.version_info >= (3, 8) else [False]
+        for shared_memory in backends:
+            env = rlcard.make('leduc-holdem', config={'env_num': 2, 'seed': 0, 'shared_memory': shared_memory,
+                                                      'profile': True})
+            env.set_agents([BatchAgent(env.action_num) for _ in range(env.player_num)])
+            env.run(is_training=True)
+            stats = env.get_profile().stats()
+            self.assertEqual(stats['reset'].count, 2)
+            self.assertEqual(stats['env_step'].count, env.timestep)
+            self.assertGreater(stats['inference'].count, 0)
+            if shared_memory:
+                env.close()
+
+class BatchAgent(RandomAgent):
+    ''' A random agent that records the size of each batch it is queried with
+    '''
+
+    def __init__(self, action_num):
+        super().__init__(action_num)
+        self.batch_sizes = []
+
+    def batch_step(self, states):
+        self.batch_sizes.append(len(states))
+        return [state['legal_actions'][0] for state in states]
+
+    def batch_eval_step(self, states):
+        return self.batch_step(states), [None for _ in states]
+
+class ArrayAgent(BatchAgent):
+    ''' A batch agent that also takes the stacked observations and legal masks
+    '''
+
+    def __init__(self, action_num):
+        super().__init__(action_num)
+        self.array_sizes = []
+
+    def batch_step_arrays(self, obs, legal_masks):
+        self.array_sizes.append(len(obs))
+        return [int(np.argmax(mask)) for mask in legal_masks]
+
+    def batch_eval_step_arrays(self, obs, legal_masks):
+        return self.batch_step_arrays(obs, legal_masks), [None for _ in obs]
+
 if __name__ == '__main__':
     unittest.main()
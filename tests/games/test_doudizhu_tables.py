@@ -0,0 +1,48 @@
+import os
+import json
+import unittest
+from collections import OrderedDict
+import numpy as np
+
+from rlcard.games.doudizhu.tables import compile_tables, load_tables, TABLE_NAMES, JSON_PATH
+from rlcard.games.doudizhu.utils import CARD_TYPE, SPECIFIC_MAP, TYPE_CARD
+
+def load_json(name):
+    with open(os.path.join(JSON_PATH, name), 'r') as file:
+        return json.load(file, object_pairs_hook=OrderedDict)
+
+class TestDoudizhuTables(unittest.TestCase):
+
+    def test_tables_up_to_date(self):
+        # The arrays in bindata must be rebuilt when the JSON tables change
+        tables = compile_tables()
+        loaded = load_tables()
+        for name in TABLE_NAMES:
+            self.assertTrue(np.array_equal(tables[name], getattr(loaded, name)), name)
+
+    def test_maps(self):
+        card_type = load_json('card_type.json')
+        self.assertEqual(len(CARD_TYPE[0]), len(card_type))
+        self.assertEqual(len(CARD_TYPE[1]), len(card_type))
+        self.assertEqual(set(CARD_TYPE[0]), set(card_type))
+        for cards, types in card_type.items():
+            self.assertEqual(CARD_TYPE[0][cards], types)
+        self.assertIn('3334', CARD_TYPE[2])
+        self.assertNotIn('pass', CARD_TYPE[0])
+        self.assertNotIn('3456', CARD_TYPE[0])
+        self.assertNotIn('5333', CARD_TYPE[0])
+
+        specific_map = load_json('specific_map.json')
+        self.assertEqual(len(SPECIFIC_MAP), len(specific_map))
+        for cards, actions in specific_map.items():
+            self.assertEqual(SPECIFIC_MAP[cards], actions)
+        with self.assertRaises(KeyError):
+            SPECIFIC_MAP['3456']
+
+        type_card = load_json('type_card.json')
+        self.assertEqual(list(TYPE_CARD), list(type_card))
+        for card_type, weights in type_card.items():
+            self.assertEqual(TYPE_CARD[card_type], weights)
+
+if __name__ == '__main__':
+    unittest.main()
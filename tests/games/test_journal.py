@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+from enum import Enum
+
+from rlcard.core import Journal
+from rlcard.games.limitholdem import Game as LimitholdemGame
+from rlcard.games.nolimitholdem import Game as NolimitholdemGame
+from rlcard.games.uno import Game as UnoGame
+from rlcard.games.blackjack import Game as BlackjackGame
+
+def snapshot(obj, skip=('np_random', 'journal', 'history')):
+    ''' Convert the objects of a game to plain data that can be compared
+    '''
+    if isinstance(obj, (list, tuple)):
+        return [snapshot(x) for x in obj]
+    if isinstance(obj, dict):
+        return {key: snapshot(value) for key, value in obj.items()}
+    if isinstance(obj, (Enum, str, int, float, bool, np.number)) or obj is None:
+        return obj
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return {key: snapshot(value) for key, value in vars(obj).items() if key not in skip}
+
+class TestJournal(unittest.TestCase):
+
+    def test_undo(self):
+        class Obj(object):
+            pass
+        obj = Obj()
+        obj.x = 1
+        seq = [1, 2, 3]
+        journal = Journal()
+        journal.checkpoint()
+        journal.setattr(obj, 'x', 2)
+        journal.append(seq, journal.pop(seq, 0))
+        journal.checkpoint()
+        journal.setitem(seq, 0, 5)
+        journal.setattr(obj, 'x', 3)
+        self.assertEqual(len(journal), 2)
+        self.assertEqual((obj.x, seq), (3, [5, 3, 1]))
+        self.assertTrue(journal.undo())
+        self.assertEqual((obj.x, seq), (2, [2, 3, 1]))
+        self.assertTrue(journal.undo())
+        self.assertEqual((obj.x, seq), (1, [1, 2, 3]))
+        self.assertFalse(journal.undo())
+
+        journal = Journal(enabled=False)
+        journal.checkpoint()
+        journal.setattr(obj, 'x', 4)
+        self.assertEqual(obj.x, 4)
+        self.assertEqual(len(journal), 0)
+        self.assertFalse(journal.undo())
+
+    def test_step_back(self):
+        np.random.seed(0)
+        blackjack = BlackjackGame(allow_step_back=True)
+        blackjack.configure({'game_player_num': 2})
+        nolimitholdem = NolimitholdemGame(allow_step_back=True)
+        nolimitholdem.configure({'game_player_num': 3, 'chips_for_each': [100] * 3, 'dealer_id': None})
+        for game in [LimitholdemGame(allow_step_back=True), nolimitholdem, UnoGame(allow_step_back=True), blackjack]:
+            # The games do not use the global random state
+            game.np_random = np.random.RandomState(0)
+            for _ in range(10):
+                game.init_game()
+                if isinstance(game, UnoGame):
+                    # Replace the deck during the game. The other cards are
+                    # moved to the played cards, so the deck can be refilled
+                    game.round.played_cards.extend(game.dealer.deck[5:])
+                    del game.dealer.deck[5:]
+                snapshots = []
+                while not game.is_over():
+                    snapshots.append(snapshot(game))
+                    legal_actions = game.get_legal_actions() if hasattr(game, 'get_legal_actions') else ['hit', 'stand']
+                    game.step(legal_actions[np.random.randint(len(legal_actions))])
+                self.assertEqual(len(game.history), len(snapshots))
+                for i in reversed(range(len(snapshots))):
+                    self.assertTrue(game.step_back())
+                    self.assertEqual(snapshot(game), snapshots[i])
+                self.assertFalse(game.step_back())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+
+from rlcard.games.tractor import Game
+from rlcard.games.tractor.action_table import NUM_ACTIONS, NUM_CARD_ACTIONS, ACTION_CARDS, ACTION_CARD_STRS
+from rlcard.games.tractor.action_table import ACTION_DELTA, ACTION_LEN, ACTION_SCORE, get_action_id, get_pass_cards
+from rlcard.games.tractor.action_table import ACTION_RANKS, ACTION_VALID, TRACTOR_NEXT
+from rlcard.games.tractor.utils import ACTION_LIST, CARD_RANK_STR, calc_score, get_pass_cards_sequence
+
+class TestTractorActionTable(unittest.TestCase):
+
+    def test_action_tables(self):
+        for action_id in range(NUM_ACTIONS):
+            cards = ACTION_LIST[action_id].split(',')
+            self.assertEqual(ACTION_CARD_STRS[action_id], cards)
+            self.assertEqual(get_action_id(cards), action_id)
+            if action_id < NUM_CARD_ACTIONS:
+                self.assertEqual([CARD_RANK_STR[rank] for rank in ACTION_CARDS[action_id]], cards)
+                self.assertEqual(ACTION_DELTA[action_id].sum(), ACTION_LEN[action_id])
+                for table_id, trump in enumerate(['2S', '5S', 'KS']):
+                    self.assertEqual(ACTION_SCORE[table_id][action_id], calc_score(cards, trump))
+            else:
+                self.assertEqual(ACTION_CARDS[action_id], ())
+                self.assertEqual(ACTION_DELTA[action_id].sum(), 0)
+
+    def test_tractor_next(self):
+        tractors = np.flatnonzero(ACTION_LEN[:NUM_CARD_ACTIONS] == 4)
+        first, last = ACTION_RANKS[tractors, 0], ACTION_RANKS[tractors, 1]
+        self.assertTrue((TRACTOR_NEXT[:, first, last] == ACTION_VALID[:, tractors]).all())
+
+    def test_step_with_raw_action(self):
+        game = Game()
+        state, _ = game.init_game()
+        action = state['actions'][0]
+        game.step(action)
+        self.assertEqual(game.players[0].played_cards, action)
+
+    def test_get_pass_cards(self):
+        np.random.seed(0)
+        for _ in range(100):
+            game = Game()
+            game.init_game()
+            player = game.players[np.random.randint(4)]
+            hand_counts = game.judger.hand_counts[player.player_id]
+            playable_cards = game.judger.get_playable_cards(player)
+            for num in [1, 2, 4]:
+                for is_get_score in [False, True]:
+                    suit_sequence = np.random.permutation(5).tolist()
+                    expected = get_pass_cards_sequence(player.current_hand, playable_cards, is_get_score,
+                                                       num >= 2, suit_sequence, game.round.trump)[:num]
+                    ranks = get_pass_cards(hand_counts, num, is_get_score, num >= 2, suit_sequence, game.judger.trump_id)
+                    self.assertEqual([CARD_RANK_STR[rank] for rank in ranks], expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.games.tractor import Game, Dealer
+from rlcard.games.tractor.utils import ACTION_SPACE, get_card_counts
+from rlcard.games.tractor.action_table import NUM_CARD_ACTIONS, get_trump_id
+from rlcard.games.tractor.factored_action import TractorFactoredAction, get_units, get_unit_size, is_trumping
+
+HAND = ['AH', 'KH', 'KH', 'QH', 'QH', 'JH', 'JH']
+
+def deal(hand):
+    ''' Hands of a game with the trump '2S' where player 0, the banker, holds
+        `hand` and no other hearts
+    '''
+    deck = Dealer('2S', np.random.RandomState(0)).deck
+    for card in hand:
+        deck.remove(card)
+    others = [card for card in deck if card[1] != 'H']
+    hearts = [card for card in deck if card[1] == 'H']
+    num = 25 - len(hand)
+    hand = hand + others[:num]
+    rest = hearts + others[num:]
+    return [hand] + [rest[i*25:(i+1)*25] for i in range(3)]
+
+class TestTractorFactoredAction(unittest.TestCase):
+
+    def test_types(self):
+        for cards, action_type in [(['AH'], 'single'),
+                                   (['AH', 'AH'], 'pair'),
+                                   (['QH', 'QH', 'KH', 'KH'], 'tractor'),
+                                   (['JH', 'JH', 'QH', 'QH', 'KH', 'KH'], 'tractor'),
+                                   (['AH', 'KH', 'KH'], 'throw'),
+                                   (['AH', 'KS'], None)]:
+            action = TractorFactoredAction.from_cards(cards, '2S')
+            self.assertEqual(action.type, action_type)
+            self.assertEqual(len(action), len(cards))
+        action = TractorFactoredAction.from_cards(['QH', 'QH', 'KH', 'KH'], '2S')
+        self.assertEqual(action.get_action_id(), ACTION_SPACE['QH,QH,KH,KH'])
+        self.assertEqual(TractorFactoredAction.from_cards(['AH', 'KH'], '2S').get_action_id(), None)
+
+    def test_units(self):
+        action = TractorFactoredAction.from_cards(['9H', 'JH', 'JH', 'QH', 'QH', 'KH', 'KH', 'AH'], '2S')
+        units = get_units(action.counts, get_trump_id('2S'))
+        self.assertEqual(sorted((width, length) for _, width, length in units), [(1, 1), (1, 1), (2, 3)])
+
+    def test_legal_lead(self):
+        game = Game()
+        game.init_game(deal(list(HAND)), '2S')
+        player = game.players[0]
+        for cards, legal in [(['AH', 'KH', 'KH'], True),
+                             (['AH', 'JH', 'JH', 'QH', 'QH'], True),
+                             (['JH', 'JH', 'QH', 'QH', 'KH', 'KH'], True),
+                             (['KH', 'QH'], False),
+                             (['AH', 'AH', 'KH'], False)]:
+            action = TractorFactoredAction.from_cards(cards, '2S')
+            self.assertEqual(game.judger.is_legal_lead(player, action), legal)
+        with self.assertRaises(ValueError):
+            game.step(['KH', 'QH'])
+
+    def test_throw(self):
+        game = Game(allow_step_back=True)
+        game.init_game(deal(list(HAND)), '2S')
+        mask = game.state['action_mask'].copy()
+
+        state, player_id = game.step(['AH', 'KH', 'KH'])
+        self.assertEqual(game.players[0].played_type, 'throw')
+        for _ in range(3):
+            self.assertFalse(state['action_mask'][:NUM_CARD_ACTIONS].any())
+            state, player_id = game.step(int(np.flatnonzero(state['action_mask'])[0]))
+            self.assertEqual(len(game.round.trace[-1][1]), 3)
+        # Nobody can beat the throw
+        self.assertEqual(player_id, 0)
+        self.assertEqual(game.round.first_player.player_id, 0)
+
+        for _ in range(4):
+            self.assertTrue(game.step_back())
+        self.assertEqual(game.players[0].current_hand, game.players[0].initial_hand)
+        self.assertEqual(game.players[0].played_type, None)
+        self.assertTrue((game.state['action_mask'] == mask).all())
+
+    def test_trumping(self):
+        hands = deal(list(HAND))
+        # Player 2 has no hearts but a pair and a single of trumps
+        hands[0][hands[0].index('3J')], hands[2][hands[2].index('3D')] = '3D', '3J'
+        game = Game(allow_step_back=True)
+        game.init_game(hands, '2S')
+        game.step(['AH', 'KH', 'KH'])
+        game.step(ACTION_SPACE['pass_H'])
+        game.step(ACTION_SPACE['pass_J'])
+        self.assertEqual(sorted(game.players[2].played_cards), ['3J', '3J', '4J'])
+        self.assertEqual(game.round.greater_player.player_id, 2)
+        # Player 3 has no pair of trumps
+        _, player_id = game.step(ACTION_SPACE['pass_J'])
+        self.assertEqual(player_id, 2)
+        for _ in range(2):
+            game.step_back()
+        self.assertEqual(game.round.greater_player.player_id, 0)
+
+        lead, greater, higher, lower = get_card_counts([['AH', 'KH', 'KH'], ['5J', '5J', '3J'],
+                                                        ['6J', '6J', '3J'], ['4J', '4J', 'AJ']])
+        self.assertTrue(is_trumping(greater, lead, lead, get_trump_id('2S')))
+        self.assertTrue(is_trumping(higher, lead, greater, get_trump_id('2S')))
+        self.assertFalse(is_trumping(lower, lead, greater, get_trump_id('2S')))
+        self.assertFalse(is_trumping(get_card_counts([['6J', '3J', '4J']])[0], lead, lead, get_trump_id('2S')))
+        self.assertEqual(get_unit_size(get_card_counts([HAND])[0], get_trump_id('2S')), 6)
+
+    def test_env_step(self):
+        env = rlcard.make('tractor', config={'seed': 0})
+        env.reset_predefine_state(deal(list(HAND)), '2S')
+        action = TractorFactoredAction.from_cards(['JH', 'JH', 'QH', 'QH', 'KH', 'KH'], '2S')
+        state, player_id = env.step(action)
+        self.assertEqual(player_id, 1)
+        self.assertEqual(env.game.players[0].played_type, 'tractor')
+        self.assertTrue(all(action >= NUM_CARD_ACTIONS for action in state['legal_actions']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import copy
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.games.tractor import Game
+from rlcard.games.tractor.utils import get_suit, get_card_counts
+
+def snapshot(game):
+    ''' The state of the game that step_back should restore
+    '''
+    r = game.round
+    return copy.deepcopy({
+        'hands': [player.current_hand for player in game.players],
+        'played_cards': [player.played_cards for player in game.players],
+        'current_round': r.current_round,
+        'played_player_in_round': r.played_player_in_round,
+        'score': r.score,
+        'score_trace': r.score_trace,
+        'suit_avail': r.suit_avail.tolist(),
+        'remaining_cards': r.remaining_cards,
+        'remaining_counts': r.remaining_counts.tolist(),
+        'unknown_counts': r.unknown_counts.tolist(),
+        'belief_counts': r.belief_counts.tolist(),
+        'trace': r.trace,
+        'players': [r.current_player.player_id, r.first_player.player_id, r.greater_player.player_id],
+        'public': {key: r.public[key] for key in ['current_player_id', 'first_player_id', 'greater_player_id']},
+        'hand_counts': game.judger.hand_counts.tolist(),
+        'playable_masks': game.judger.playable_masks.tolist(),
+        'action_mask': game.state['action_mask'].tolist(),
+        'winner_id': game.winner_id,
+    })
+
+class TestTractorGameMethods(unittest.TestCase):
+
+    def test_step_back(self):
+        np.random.seed(0)
+        game = Game(allow_step_back=True)
+        game.init_game()
+        self.assertFalse(game.step_back())
+
+        snapshots = []
+        while not game.is_over():
+            snapshots.append(snapshot(game))
+            game.step(np.random.choice(np.flatnonzero(game.state['action_mask'])))
+        self.assertEqual(len(game.round.undo_log), len(snapshots))
+
+        # Step back to the start, and replay a few steps in the middle
+        for i in reversed(range(len(snapshots))):
+            self.assertTrue(game.step_back())
+            self.assertEqual(snapshot(game), snapshots[i])
+            if i % 20 == 0 and i > 0:
+                game.step(np.random.choice(np.flatnonzero(game.state['action_mask'])))
+                game.step_back()
+                self.assertEqual(snapshot(game), snapshots[i])
+        self.assertFalse(game.step_back())
+
+    def test_beliefs(self):
+        np.random.seed(1)
+        game = Game()
+        game.init_game()
+        while not game.is_over():
+            r = game.round
+            player = game.players[game.get_player_id()]
+            # The guesses from the card lists
+            unknown = list(r.remaining_cards)
+            for card in player.current_hand:
+                unknown.remove(card)
+            banker_cards = r.dealer.deck[100:108]
+            if player.player_id == r.banker_id:
+                for card in banker_cards:
+                    unknown.remove(card)
+            others = [[card for card in unknown if r.suit_avail[(player.player_id + offset) % 4][get_suit(card)]]
+                      for offset in (1, 2, 3)]
+            banker = banker_cards if player.player_id == r.banker_id else unknown
+
+            self.assertEqual(game.state['guessed_others_counts'].tolist(), get_card_counts(others).tolist())
+            self.assertEqual(game.state['remaining_counts'].tolist(), get_card_counts([banker])[0].tolist())
+            self.assertEqual(r.remaining_counts.tolist(), get_card_counts([r.remaining_cards])[0].tolist())
+            game.step(np.random.choice(np.flatnonzero(game.state['action_mask'])))
+
+    def test_step_back_off(self):
+        game = Game()
+        game.init_game()
+        game.step(np.flatnonzero(game.state['action_mask'])[0])
+        self.assertEqual(game.round.undo_log, [])
+        self.assertFalse(game.step_back())
+
+    def test_env_step_back(self):
+        env = rlcard.make('tractor', config={'seed': 0, 'allow_step_back': True})
+        state, player_id = env.reset()
+        for action in state['legal_actions'][:3]:
+            env.step(action)
+            env.step_back()
+        self.assertEqual(env.get_state(player_id)['legal_actions'], state['legal_actions'])
+        self.assertTrue((env.get_state(player_id)['obs'] == state['obs']).all())
+        self.assertEqual(env.game.round.trace, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+import numpy as np
+
+from rlcard.games.tractor import Game
+from rlcard.games.tractor.judger import TractorJudger as Judger
+from rlcard.games.tractor.utils import ACTION_LIST
+
+class TestTractorJudgerMethods(unittest.TestCase):
+
+    def test_playable_cards(self):
+        game = Game()
+        game.init_game()
+        for player in game.players:
+            playable_cards = sorted(','.join(cards) for cards in game.judger.get_playable_cards(player))
+            expected = sorted(','.join(cards) for cards in Judger.playable_cards_from_hand(player.current_hand, game.round.trump))
+            self.assertEqual(playable_cards, expected)
+
+    def test_remove_cards(self):
+        np.random.seed(0)
+        game = Game()
+        game.init_game()
+        while not game.is_over():
+            action = np.random.choice(np.flatnonzero(game.state['action_mask']))
+            game.step(ACTION_LIST[action].split(','))
+            for player in game.players:
+                mask = game.judger.playable_masks[player.player_id].copy()
+                self.assertTrue((game.judger.calc_playable_cards(player) == mask).all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+import numpy as np
+
+import rlcard
+from rlcard.games.tractor.vec_game import TractorVecGame as VecGame
+from rlcard.games.tractor.vec_game import NUM_ACTIONS
+from rlcard.games.tractor.utils import CARD_RANK_DICT, TRUMP_CANDIDATE_STR
+
+class TestTractorVecGameMethods(unittest.TestCase):
+
+    def test_init_game(self):
+        game = VecGame(8, np.random.RandomState(0))
+        player_ids = game.init_game()
+        self.assertEqual(player_ids.tolist(), [0] * 8)
+        self.assertEqual(game.hands.shape, (8, 4, 72))
+        self.assertTrue((game.hands.sum(axis=2) == 25).all())
+        self.assertTrue((game.banker_cards.sum(axis=1) == 8).all())
+        self.assertTrue((game.remaining_cards.sum(axis=1) == 108).all())
+
+    def test_get_legal_actions(self):
+        game = VecGame(8, np.random.RandomState(0))
+        game.init_game()
+        legal_actions = game.get_legal_actions()
+        self.assertEqual(legal_actions.shape, (8, NUM_ACTIONS))
+        self.assertTrue(legal_actions.any(axis=1).all())
+
+    def test_run_games(self):
+        np_random = np.random.RandomState(0)
+        game = VecGame(16, np_random)
+        game.init_game()
+        while not game.is_over().all():
+            legal_actions = game.get_legal_actions()
+            actions = [np_random.choice(np.flatnonzero(legal)) if legal.any() else 0 for legal in legal_actions]
+            game.step(actions)
+        self.assertTrue((game.hands.sum(axis=(1, 2)) == 0).all())
+        self.assertTrue((game.remaining_cards.sum(axis=1) == 8).all())
+        self.assertEqual(game.get_payoffs().shape, (16, 4))
+
+    @mock.patch('random.shuffle', lambda x: None)
+    @mock.patch.object(VecGame, '_suit_keys', lambda self, size: np.zeros((size, 5)))
+    def test_same_as_tractor_game(self):
+        env = rlcard.make('tractor')
+        np_random = np.random.RandomState(1)
+        for _ in range(5):
+            state, player_id = env.reset()
+            deck = [CARD_RANK_DICT[card] for card in env.game.round.dealer.deck]
+            game = VecGame(1)
+            game.init_game(trumps=[TRUMP_CANDIDATE_STR.index(env.game.round.trump)], decks=[deck])
+            while not env.is_over():
+                legal_actions = np.flatnonzero(game.get_legal_actions()[0])
+                self.assertEqual(game.current_player[0], player_id)
+                self.assertEqual(sorted(state['legal_actions']), legal_actions.tolist())
+                self.assertTrue((game.get_obs()[0] == state['obs']).all())
+                action = np_random.choice(legal_actions)
+                state, player_id = env.step(action)
+                game.step([action])
+            self.assertTrue(game.is_over()[0])
+            for player_id in range(4):
+                obs = game.get_obs(np.array([0]), np.array([player_id]))[0]
+                self.assertTrue((obs == env.get_state(player_id)['obs']).all())
+            self.assertEqual(game.get_payoffs()[0].tolist(), env.get_payoffs().tolist())
+            self.assertEqual(game.get_score_trace(0), env.get_payoffs_trace())
+
+if __name__ == '__main__':
+    unittest.main()
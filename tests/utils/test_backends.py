@@ -0,0 +1,26 @@
+import unittest
+import subprocess
+import sys
+
+from rlcard.utils.backends import is_available, is_torch_available
+
+class TestBackends(unittest.TestCase):
+
+    def test_is_available(self):
+        self.assertTrue(is_available('numpy'))
+        self.assertFalse(is_available('rlcard_not_exist'))
+
+    def test_lazy_agents(self):
+        code = 'import sys, rlcard.agents; print("torch" in sys.modules or "tensorflow" in sys.modules)'
+        output = subprocess.check_output([sys.executable, '-c', code], env={'PYTHONPATH': ':'.join(sys.path)})
+        self.assertEqual(output.strip(), b'False')
+
+        import rlcard.agents
+        if is_torch_available():
+            from rlcard.agents.dqn_agent_pytorch import DQNAgent
+            self.assertIs(rlcard.agents.DQNAgentPytorch, DQNAgent)
+        with self.assertRaises(AttributeError):
+            rlcard.agents.NotExistAgent
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import functools
+import multiprocessing as mp
+import numpy as np
+import torch
+
+from rlcard.agents.dqn_agent_pytorch import DQNAgent
+from rlcard.agents.nfsp_agent_pytorch import NFSPAgent
+from rlcard.utils.distributed import ActorLearner, SharedWeights
+
+DQN_FN = functools.partial(DQNAgent, scope='dqn', action_num=4, state_shape=[36], mlp_layers=[16],
+                           replay_memory_init_size=20, batch_size=8, train_every=4,
+                           device=torch.device('cpu'))
+
+NFSP_FN = functools.partial(NFSPAgent, scope='nfsp', action_num=4, state_shape=[36], hidden_layers_sizes=[16],
+                            anticipatory_param=0.5, batch_size=8, min_buffer_size_to_learn=20,
+                            q_replay_memory_init_size=20, q_batch_size=8, q_mlp_layers=[16],
+                            device=torch.device('cpu'))
+
+class TestDistributed(unittest.TestCase):
+
+    def test_shared_weights(self):
+        agent, copy = DQN_FN(), DQN_FN()
+        agent.total_t = 7
+        weights = SharedWeights(agent, mp.get_context('spawn'))
+        self.assertEqual(weights.load(copy, 0), 0)
+        weights.publish(agent)
+        self.assertEqual(weights.load(copy, 0), 1)
+        self.assertEqual(copy.total_t, 7)
+        for name, tensor in agent.q_estimator.qnet.state_dict().items():
+            self.assertTrue(torch.equal(tensor, copy.q_estimator.qnet.state_dict()[name]))
+        # The target network is not shared
+        self.assertEqual(len(weights.array), sum(t.numel() for t in agent.q_estimator.qnet.state_dict().values()))
+
+    def test_shared_weights_nfsp(self):
+        agent, copy = NFSP_FN(), NFSP_FN()
+        weights = SharedWeights(agent, mp.get_context('spawn'))
+        weights.publish(agent)
+        weights.load(copy, 0)
+        for learner, actor in [(agent.policy_network, copy.policy_network),
+                               (agent._rl_agent.q_estimator.qnet, copy._rl_agent.q_estimator.qnet)]:
+            for name, tensor in learner.state_dict().items():
+                self.assertTrue(torch.equal(tensor, actor.state_dict()[name]))
+
+    def test_train_dqn(self):
+        trainer = ActorLearner('leduc-holdem', DQN_FN, actor_num=2, config={'seed': 0}, update_every=5)
+        episodes = [episode for episode, payoffs in trainer.train(30)]
+        self.assertEqual(episodes, list(range(30)))
+        self.assertEqual(trainer.agent.total_t, trainer.timestep)
+        self.assertGreater(trainer.agent.train_t, 0)
+        self.assertEqual(trainer.weights.version.value, 7)
+
+    def test_train_nfsp(self):
+        trainer = ActorLearner('leduc-holdem', NFSP_FN, actor_num=2, config={'seed': 0})
+        for _, payoffs in trainer.train(20):
+            self.assertEqual(np.sum(payoffs), 0)
+        # The samples of the average policy come from the actors
+        self.assertGreater(len(trainer.agent._reservoir_buffer), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import glob
+import os
+import copy
+import tempfile
+import numpy as np
+import torch
+
+from rlcard.agents import RandomAgent
+from rlcard.agents.dqn_agent_pytorch import DQNAgent
+from rlcard.utils.evaluation import ParallelTournament, aggregate
+
+def random_agents():
+    return [RandomAgent(4), RandomAgent(4)]
+
+def dqn_agents():
+    return [DQNAgent(scope='dqn', action_num=4, state_shape=[36], mlp_layers=[16], device=torch.device('cpu')),
+            RandomAgent(4)]
+
+class TestEvaluation(unittest.TestCase):
+
+    def test_aggregate(self):
+        stats = aggregate([[1, -1], [-1, 1], [2, -2], [0, 0]])
+        self.assertEqual(stats['num'], 4)
+        self.assertTrue(np.allclose(stats['mean'], [0.5, -0.5]))
+        self.assertTrue(np.allclose(stats['stderr'], np.std([1, -1, 2, 0], ddof=1) / 2))
+        self.assertTrue(np.allclose(stats['win_rate'], [0.5, 0.25]))
+
+    def test_deterministic_sharding(self):
+        results = []
+        for processes, shard_size in [(1, None), (2, 3)]:
+            evaluator = ParallelTournament('leduc-holdem', random_agents, processes=processes, shard_size=shard_size)
+            results.append(evaluator.evaluate(random_agents(), 20, seed=5))
+            evaluator.close()
+        self.assertEqual(results[0]['num'], 20)
+        for key in ['mean', 'stderr', 'win_rate']:
+            self.assertTrue(np.array_equal(results[0][key], results[1][key]))
+
+    def test_evaluate_async(self):
+        agents = dqn_agents()
+        evaluator = ParallelTournament('leduc-holdem', dqn_agents, processes=2)
+        evaluations = [evaluator.evaluate_async(agents, 10)]
+        # The evaluations play with the snapshots taken when they are started
+        original = [copy.deepcopy(agents[0]), agents[1]]
+        for param in agents[0].q_estimator.qnet.parameters():
+            param.data.fill_(0.1)
+        evaluations.append(evaluator.evaluate_async(agents, 10))
+        stats = [evaluation.get() for evaluation in evaluations]
+        self.assertTrue(all(evaluation.ready() for evaluation in evaluations))
+        for agents, _stats in zip([original, agents], stats):
+            self.assertTrue(np.array_equal(evaluator.evaluate(agents, 10)['mean'], _stats['mean']))
+        evaluator.close()
+
+    def test_snapshot_files(self):
+        pattern = os.path.join(tempfile.gettempdir(), 'rlcard_snapshot_*.pkl')
+        files = set(glob.glob(pattern))
+        evaluator = ParallelTournament('leduc-holdem', dqn_agents, processes=1)
+        evaluator.evaluate_async(dqn_agents(), 5).get()
+        self.assertEqual(set(glob.glob(pattern)), files)
+        # The evaluations that are never collected do not leave files
+        evaluator.evaluate_async(dqn_agents(), 5)
+        evaluator.close()
+        self.assertEqual(evaluator.snapshot_paths, set())
+        self.assertEqual(set(glob.glob(pattern)), files)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import copy
+import torch
+
+import rlcard
+from rlcard.agents import RandomAgent
+from rlcard.agents.dqn_agent_pytorch import DQNAgent
+from rlcard.utils.profiler import Profiler
+
+class TestProfiler(unittest.TestCase):
+
+    def test_env_profile(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'profile': True})
+        agent = DQNAgent(scope='dqn', action_num=env.action_num, state_shape=env.state_shape,
+                         mlp_layers=[16], replay_memory_init_size=10, batch_size=4, device=torch.device('cpu'))
+        env.set_agents([agent, RandomAgent(env.action_num)])
+        steps, games = 0, 0
+        # Player 0 may not act in a game, so play until the agent has trained
+        while agent.total_t <= agent.replay_memory_init_size:
+            trajectories, _ = env.run(is_training=True)
+            for ts in trajectories[0]:
+                agent.feed(ts)
+            steps += len(trajectories[0]) + len(trajectories[1])
+            games += 1
+
+        stats = env.get_profile().stats()
+        self.assertEqual(stats['reset'].count, games)
+        self.assertEqual(stats['env_step'].count, steps)
+        self.assertEqual(stats['game_step'].count, steps)
+        self.assertEqual(stats['inference'].count, env.timestep)
+        self.assertEqual(stats['replay_insert'].count, agent.total_t)
+        self.assertGreater(stats['train'].count, 0)
+        self.assertIn('inference', env.get_profile().format())
+
+    def test_disabled(self):
+        env = rlcard.make('leduc-holdem')
+        agent = RandomAgent(env.action_num)
+        env.set_agents([agent, agent])
+        self.assertIsNone(env.get_profile())
+        self.assertNotIn('step', vars(env))
+        self.assertNotIn('step', vars(agent))
+
+    def test_wrap(self):
+        profiler = Profiler()
+        agent = RandomAgent(2)
+        profiler.attach_agent(agent)
+        profiler.attach_agent(agent)
+        agent.step({'legal_actions': [0, 1]})
+        with profiler.phase('evaluate'):
+            pass
+        self.assertEqual(profiler.counts, {'inference': 1, 'evaluate': 1})
+        self.assertEqual(list(profiler.stats()), ['inference', 'evaluate'])
+        profiler.detach()
+        self.assertNotIn('step', vars(agent))
+        self.assertNotIn('__deepcopy__', vars(agent))
+
+    def test_deepcopy(self):
+        profiler = Profiler()
+        agent = RandomAgent(2)
+        profiler.attach_agent(agent)
+        # The copies are not profiled, and act on their own
+        agents = copy.deepcopy([agent, agent])
+        self.assertIs(agents[0], agents[1])
+        self.assertNotIn('step', vars(agents[0]))
+        self.assertNotIn('__deepcopy__', vars(agents[0]))
+        agents[0].step({'legal_actions': [0, 1]})
+        self.assertEqual(profiler.counts, {})
+        agent.step({'legal_actions': [0, 1]})
+        self.assertEqual(profiler.counts, {'inference': 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from rlcard.utils.utils import get_random_cards, init_54_deck, init_standard_deck, is_in_cards, is_pair, is_single, rank2int, take_out_cards, print_card, elegent_form, init_players, get_upstream_player_id, get_downstream_player_id, reorganize, set_global_seed, get_cards_from_ranks,tournament
+from rlcard.utils.utils import get_random_cards, init_54_deck, init_standard_deck, is_in_cards, is_pair, is_single, rank2int, take_out_cards, print_card, elegent_form, init_players, get_upstream_player_id, get_downstream_player_id, reorganize, set_global_seed, get_cards_from_ranks,tournament, encode_counts
 import rlcard
 from rlcard.agents.random_agent import RandomAgent
 
@@ -115,6 +115,16 @@ class TestUtils(unittest.TestCase):
         payoffs = tournament(env,1000)
         self.assertEqual(len(payoffs), 2)
 
+    def test_encode_counts(self):
+        counts = np.array([[0, 1, 2], [2, 0, 0]])
+        planes = encode_counts(counts, 3)
+        self.assertEqual(planes.shape, (2, 3, 3))
+        self.assertTrue((planes[0] == np.eye(3, dtype=int)).all())
+        self.assertEqual(planes[1, 2, 0], 1)
+        out = np.ones((2, 3, 3), dtype=np.int8)
+        encode_counts(counts, 3, out=out)
+        self.assertTrue((out == planes).all())
+
 
 
 if __name__ == '__main__':